@@ -20,6 +20,16 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'email_verified', 'date_joined']
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Display fields of a user embedded in list responses"""
+    full_name = serializers.CharField(read_only=True)
+    
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'full_name']
+        read_only_fields = fields
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
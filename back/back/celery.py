@@ -0,0 +1,11 @@
+# back/celery.py
+# Worker entrypoint: celery -A back worker (web processes load it on first enqueue)
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'back.settings')
+
+app = Celery('back')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
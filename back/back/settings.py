@@ -211,9 +211,43 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Cache: local memory in development, a shared Redis cache when CACHE_URL is set
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'booking',
+        }
+    }
+
 # Celery Configuration
-CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379')
-CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379')
+# The broker defaults to empty (previously redis://localhost:6379): without
+# REDIS_URL, analytics refreshes run in an in-process thread pool, not Celery
+CELERY_BROKER_URL = config('REDIS_URL', default='')
+CELERY_RESULT_BACKEND = config('REDIS_URL', default='')
+
+# Analytics snapshots recomputed in process when no Celery broker is configured
+ANALYTICS_REFRESH_WORKERS = config('ANALYTICS_REFRESH_WORKERS', default=2, cast=int)
+
+# Set to True to estimate distinct customers from HyperLogLog sketches (~1.6% error)
+APPROXIMATE_CUSTOMER_COUNTS = config('APPROXIMATE_CUSTOMER_COUNTS', default=False, cast=bool)
+
+# Dashboard sections evaluated concurrently, each on its own connection (1 = sequential)
+DASHBOARD_SECTION_WORKERS = config('DASHBOARD_SECTION_WORKERS', default=4, cast=int)
+
+# Slot holds
+SLOT_HOLD_TTL_SECONDS = config('SLOT_HOLD_TTL_SECONDS', default=300, cast=int)
+
+# Availability engine: 'auto' (NumPy for long ranges), 'numpy' or 'python'
+AVAILABILITY_BACKEND = config('AVAILABILITY_BACKEND', default='auto')
 
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -0,0 +1,840 @@
+# base/analytics.py
+"""
+Owner analytics payloads with stale-while-revalidate caching.
+
+Each analytics endpoint has a builder registered in ``ANALYTICS_BUILDERS``
+that computes its payload from a business and the request's query
+parameters. Computed payloads are cached as snapshots carrying the
+business' data version and the time they were computed. A snapshot whose
+data changed since is still served immediately while a single background
+refresh recomputes it, in a Celery worker when a broker is configured or
+in a small in-process thread pool otherwise.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .cache import (
+    analytics_cache_key,
+    analytics_data_version,
+    claim_analytics_refresh,
+    get_cached_analytics,
+    release_analytics_refresh,
+    set_cached_analytics
+)
+from .charts import CHART_SPECS, plotly_available, render_chart_html
+from .cohorts import add_months, cohort_matrix, month_start, retention_curve
+from .heatmap import booking_heatmap
+from .leaderboard import top_customers
+from .metrics import booked_between, booking_metrics, created_between, percent_change
+from .models import Booking, Business, Review, Service
+from .ratings import business_rating_stats
+from .serializers import BookingSerializer, DashboardSerializer, ReviewSerializer
+from .sketches import approximate_customers
+from .stats import STATUS_FIELDS
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_REFRESH_WORKERS = getattr(settings, 'ANALYTICS_REFRESH_WORKERS', 2)
+
+DASHBOARD_SECTION_WORKERS = getattr(settings, 'DASHBOARD_SECTION_WORKERS', 4)
+
+MAX_COHORT_MONTHS = 36
+
+APPROXIMATE_CUSTOMER_COUNTS = getattr(settings, 'APPROXIMATE_CUSTOMER_COUNTS', False)
+
+# Analytics name -> function(business, params, timings) returning the payload;
+# builders may record named durations (ms) in ``timings``
+ANALYTICS_BUILDERS = {}
+
+_refresh_executor = None
+_section_executor = None
+
+
+class AnalyticsError(Exception):
+    """A request for analytics that can't be computed"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def analytics_builder(name):
+    """Register a payload builder under ``name``"""
+    def register(builder):
+        ANALYTICS_BUILDERS[name] = builder
+        return builder
+    return register
+
+
+def compute_analytics(business, name, params):
+    """Build a payload now and cache it as the latest snapshot"""
+    version = analytics_data_version(business.id)
+    timings = {}
+    payload = _run_timed(ANALYTICS_BUILDERS[name], (business, params, timings), timings, 'total')
+    snapshot = {
+        'payload': payload,
+        'computed_at': timezone.now(),
+        'version': version,
+        'timings': timings,
+    }
+    set_cached_analytics(analytics_cache_key(business.id, name, params), snapshot)
+    return snapshot
+
+
+def is_fresh(snapshot, version):
+    """Whether a snapshot reflects the current data and today's windows"""
+    return (
+        snapshot['version'] == version
+        and timezone.localdate(snapshot['computed_at']) == timezone.localdate()
+    )
+
+
+def get_analytics(business, name, params):
+    """
+    Return ``(snapshot, state)`` for one analytics payload of a business.
+
+    ``state`` is ``'fresh'`` for an up-to-date snapshot, ``'stale'`` for an
+    outdated one served while a background refresh runs, and ``'miss'`` when
+    nothing was cached and the payload was computed in the request.
+    """
+    snapshot = get_cached_analytics(analytics_cache_key(business.id, name, params))
+    if snapshot is None:
+        return compute_analytics(business, name, params), 'miss'
+
+    if is_fresh(snapshot, analytics_data_version(business.id)):
+        return snapshot, 'fresh'
+
+    schedule_refresh(business.id, name, params)
+    return snapshot, 'stale'
+
+
+def refresh_analytics(business_id, name, params):
+    """Recompute one snapshot and release its refresh claim"""
+    try:
+        business = Business.objects.filter(id=business_id).first()
+        if business is not None:
+            compute_analytics(business, name, params)
+    finally:
+        release_analytics_refresh(analytics_cache_key(business_id, name, params))
+
+
+def _refresh_in_thread(business_id, name, params):
+    try:
+        refresh_analytics(business_id, name, params)
+    except Exception:
+        logger.exception('Refreshing %s analytics of business %s failed', name, business_id)
+    finally:
+        # Worker threads open their own connections
+        connections.close_all()
+
+
+def get_refresh_executor():
+    """Thread pool refreshing snapshots when no Celery broker is configured"""
+    global _refresh_executor
+    if _refresh_executor is None:
+        _refresh_executor = ThreadPoolExecutor(
+            max_workers=ANALYTICS_REFRESH_WORKERS,
+            thread_name_prefix='analytics-refresh'
+        )
+    return _refresh_executor
+
+
+def schedule_refresh(business_id, name, params):
+    """
+    Recompute a snapshot in the background unless a refresh is already running.
+
+    Returns False when another request already claimed the refresh.
+    """
+    if not claim_analytics_refresh(analytics_cache_key(business_id, name, params)):
+        return False
+
+    if settings.CELERY_BROKER_URL:
+        from .tasks import refresh_analytics_snapshot
+        try:
+            refresh_analytics_snapshot.delay(str(business_id), name, params)
+            return True
+        except Exception:
+            logger.warning('Celery broker unavailable, refreshing analytics in process', exc_info=True)
+
+    get_refresh_executor().submit(_refresh_in_thread, business_id, name, params)
+    return True
+
+
+def approximate_counts(params):
+    """
+    Whether distinct customers are estimated from sketches.
+
+    ``?approximate=`` overrides the APPROXIMATE_CUSTOMER_COUNTS setting.
+    """
+    value = params.get('approximate')
+    if value is None:
+        return APPROXIMATE_CUSTOMER_COUNTS
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _period_start(period, now, periods=None):
+    """Start of a named reporting period ending at ``now``"""
+    periods = periods or {'week': 7, 'month': 30, 'quarter': 90, 'year': 365}
+    return now - timedelta(days=periods.get(period, 30))
+
+
+def _since(daily, start):
+    return [row for row in daily if row.date >= start]
+
+
+def _dashboard_daily(business, today, params):
+    """Rollup rows from the first of the 12 charted months, read in one range scan"""
+    return list(business.daily_stats.filter(date__gte=_month_starts(today)[0]))
+
+
+def _dashboard_customer_metrics(business, today, params):
+    """Customer counts of several windows in one query (or from sketches)"""
+    new_customers = Q(customer__created_at__gte=timezone.now() - timedelta(days=30))
+    if approximate_counts(params):
+        metrics = booking_metrics(business, {'new': (new_customers, ['customers'])})
+        metrics['last_30_days'] = {'customers': approximate_customers(business.id, today - timedelta(days=30))}
+        metrics['all_time'] = {'customers': approximate_customers(business.id)}
+        return metrics
+
+    return booking_metrics(business, {
+        'last_30_days': (booked_between(today - timedelta(days=30)), ['customers']),
+        'all_time': (Q(), ['customers']),
+        'new': (new_customers, ['customers']),
+    })
+
+
+def _overview_section(business, today, inputs):
+    daily_30 = _since(inputs['daily'], today - timedelta(days=30))
+    return {
+        'total_bookings': sum(row.total_bookings for row in daily_30),
+        'total_revenue': float(sum(row.paid_revenue for row in daily_30)),
+        'total_customers': inputs['customer_metrics']['last_30_days']['customers'],
+        'average_rating': float(business_rating_stats(business).average_rating),
+    }
+
+
+def _trends_section(business, today, inputs):
+    heatmap = booking_heatmap(business.id, today - timedelta(days=90))
+    return {
+        'bookings_by_date': _get_bookings_by_date(_since(inputs['daily'], today - timedelta(days=30))),
+        'revenue_by_month': _get_revenue_by_month(inputs['daily']),
+        'bookings_by_hour': _get_bookings_by_hour(heatmap),
+        'bookings_by_weekday': _get_bookings_by_weekday(heatmap),
+    }
+
+
+def _recent_bookings_section(business, today, inputs):
+    bookings = BookingSerializer.eager_load(Booking.objects.filter(
+        business=business,
+        booking_date__gte=today - timedelta(days=30)
+    )).order_by('-created_at')[:10]
+    return {'recent_bookings': BookingSerializer(bookings, many=True).data}
+
+
+# Inputs shared by several dashboard sections, read before the sections run
+DASHBOARD_INPUTS = {
+    'daily': _dashboard_daily,
+    'customer_metrics': _dashboard_customer_metrics,
+}
+
+# Section -> (fields, inputs, function(business, today, inputs) returning the fields)
+DASHBOARD_SECTIONS = {
+    'overview': (
+        ('total_bookings', 'total_revenue', 'total_customers', 'average_rating'),
+        ('daily', 'customer_metrics'),
+        _overview_section
+    ),
+    'growth': (
+        ('bookings_growth', 'revenue_growth'),
+        ('daily',),
+        lambda business, today, inputs: {
+            'bookings_growth': _calculate_growth(inputs['daily'], 'bookings'),
+            'revenue_growth': _calculate_growth(inputs['daily'], 'revenue'),
+        }
+    ),
+    'trends': (
+        ('bookings_by_date', 'revenue_by_month', 'bookings_by_hour', 'bookings_by_weekday'),
+        ('daily',),
+        _trends_section
+    ),
+    'popular_services': (
+        ('popular_services',),
+        (),
+        lambda business, today, inputs: {
+            'popular_services': _get_popular_services(business, today - timedelta(days=30))
+        }
+    ),
+    'service_revenue': (
+        ('service_revenue',),
+        (),
+        lambda business, today, inputs: {
+            'service_revenue': _get_service_revenue(business, today - timedelta(days=30))
+        }
+    ),
+    'customer_demographics': (
+        ('customer_demographics',),
+        ('customer_metrics',),
+        lambda business, today, inputs: {
+            'customer_demographics': _get_customer_demographics(business, inputs['customer_metrics'])
+        }
+    ),
+    'top_customers': (
+        ('top_customers',),
+        (),
+        lambda business, today, inputs: {
+            'top_customers': top_customers(business.id, today - timedelta(days=90))
+        }
+    ),
+    'customer_retention': (
+        ('customer_retention',),
+        (),
+        lambda business, today, inputs: {'customer_retention': _calculate_retention_rate(business)}
+    ),
+    'recent_bookings': (('recent_bookings',), (), _recent_bookings_section),
+    'recent_reviews': (
+        ('recent_reviews',),
+        (),
+        lambda business, today, inputs: {
+            'recent_reviews': ReviewSerializer(
+                ReviewSerializer.eager_load(business.reviews.order_by('-created_at'))[:5], many=True
+            ).data
+        }
+    ),
+    'booking_status_breakdown': (
+        ('booking_status_breakdown',),
+        ('daily',),
+        lambda business, today, inputs: {
+            'booking_status_breakdown': _get_booking_status_breakdown(
+                _since(inputs['daily'], today - timedelta(days=30))
+            )
+        }
+    ),
+    'next_week_bookings': (
+        ('next_week_bookings',),
+        ('daily',),
+        lambda business, today, inputs: {'next_week_bookings': _get_upcoming_bookings(inputs['daily'])}
+    ),
+}
+
+FIELD_SECTIONS = {
+    field: section
+    for section, (fields, _, _) in DASHBOARD_SECTIONS.items()
+    for field in fields
+}
+
+# Fields returned without ``?fields=``
+DEFAULT_DASHBOARD_FIELDS = (
+    'total_bookings', 'total_revenue', 'total_customers', 'average_rating',
+    'bookings_by_date', 'revenue_by_month', 'popular_services', 'customer_demographics'
+)
+
+
+def dashboard_fields(selector):
+    """
+    Resolve a ``?fields=`` value to dashboard fields.
+
+    The value is a comma-separated list of section and field names; a
+    section stands for all of its fields.
+    """
+    names = [name.strip() for name in (selector or '').split(',') if name.strip()]
+    if not names:
+        return DEFAULT_DASHBOARD_FIELDS
+
+    unknown = [name for name in names if name not in DASHBOARD_SECTIONS and name not in FIELD_SECTIONS]
+    if unknown:
+        raise AnalyticsError(
+            f"Unknown dashboard fields: {', '.join(unknown)}. "
+            f"Choose from: {', '.join([*DASHBOARD_SECTIONS, *FIELD_SECTIONS])}"
+        )
+
+    fields = []
+    for name in names:
+        fields.extend(DASHBOARD_SECTIONS[name][0] if name in DASHBOARD_SECTIONS else [name])
+    return tuple(dict.fromkeys(fields))
+
+
+def _run_timed(function, args, timings, name):
+    start = perf_counter()
+    try:
+        return function(*args)
+    finally:
+        timings[name] = round((perf_counter() - start) * 1000, 1)
+
+
+def _run_section_in_thread(function, args, timings, name):
+    try:
+        return _run_timed(function, args, timings, name)
+    finally:
+        # Each section runs on its own connection, closed once it's done
+        connections.close_all()
+
+
+def get_section_executor():
+    """Bounded thread pool evaluating dashboard sections concurrently"""
+    global _section_executor
+    if _section_executor is None:
+        _section_executor = ThreadPoolExecutor(
+            max_workers=DASHBOARD_SECTION_WORKERS,
+            thread_name_prefix='dashboard-section'
+        )
+    return _section_executor
+
+
+def run_sections(tasks, timings):
+    """
+    Run ``{name: (function, args)}`` and return ``{name: result}``.
+
+    Tasks run concurrently in the section pool unless the caller is inside
+    a transaction, whose uncommitted rows other connections can't see.
+    Each task's duration in milliseconds is recorded in ``timings``.
+    """
+    if len(tasks) < 2 or DASHBOARD_SECTION_WORKERS < 2 or connection.in_atomic_block:
+        return {
+            name: _run_timed(function, args, timings, name)
+            for name, (function, args) in tasks.items()
+        }
+
+    executor = get_section_executor()
+    futures = {
+        name: executor.submit(_run_section_in_thread, function, args, timings, name)
+        for name, (function, args) in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+@analytics_builder('dashboard')
+def build_dashboard(business, params, timings):
+    """
+    Dashboard fields selected by ``?fields=``.
+
+    Only the sections computing the selected fields run: first the shared
+    inputs they read, then the sections themselves.
+    """
+    fields = dashboard_fields(params.get('fields'))
+    sections = dict.fromkeys(FIELD_SECTIONS[field] for field in fields)
+    today = timezone.now().date()
+
+    inputs = run_sections({
+        name: (DASHBOARD_INPUTS[name], (business, today, params))
+        for name in dict.fromkeys(name for section in sections for name in DASHBOARD_SECTIONS[section][1])
+    }, timings)
+    results = run_sections({
+        section: (DASHBOARD_SECTIONS[section][2], (business, today, inputs))
+        for section in sections
+    }, timings)
+
+    data = {}
+    for values in results.values():
+        data.update(values)
+    return DashboardSerializer({field: data[field] for field in fields}, fields=fields).data
+
+
+@analytics_builder('stats')
+def build_stats(business, params, timings):
+    """Headline statistics with changes from the previous period"""
+    now = timezone.now()
+    start_date = _period_start(params.get('period', 'month'), now)
+
+    # Current and previous period in one query
+    prev_start = start_date - (now - start_date)
+    approximate = approximate_counts(params)
+    windows = {
+        'current': (created_between(start_date), ['revenue', 'bookings', 'confirmed_bookings']),
+        'previous': (created_between(prev_start, start_date), ['revenue', 'bookings', 'customers']),
+        'all_time': (Q(), ['customers']),
+    }
+    if approximate:
+        # Sketches count customers by booking date rather than creation
+        windows['previous'][1].remove('customers')
+        del windows['all_time']
+    metrics = booking_metrics(business, windows)
+    current, previous = metrics['current'], metrics['previous']
+
+    if approximate:
+        previous['customers'] = approximate_customers(
+            business.id, prev_start.date(), start_date.date() - timedelta(days=1)
+        )
+        customers = approximate_customers(business.id)
+    else:
+        customers = metrics['all_time']['customers']
+    avg_rating = business_rating_stats(business).average_rating
+
+    return {
+        'revenue': float(current['revenue']),
+        'bookings': current['bookings'],
+        'confirmed_bookings': current['confirmed_bookings'],
+        'customers': customers,
+        'rating': round(avg_rating, 1),
+        'revenueChange': round(percent_change(current['revenue'], previous['revenue']), 1),
+        'bookingsChange': round(percent_change(current['bookings'], previous['bookings']), 1),
+        'customersChange': round(percent_change(customers, previous['customers']), 1),
+        'ratingChange': 0  # Would need historical rating data
+    }
+
+
+@analytics_builder('service_stats')
+def build_service_stats(business, params, timings):
+    """Bookings and revenue per service"""
+    services_data = Service.objects.filter(business=business).annotate(
+        booking_count=Count('bookings'),
+        total_revenue=Sum('bookings__total_price', filter=Q(bookings__status__in=['confirmed', 'completed'], bookings__is_paid=True))
+    ).values('name', 'booking_count', 'total_revenue', 'price')
+
+    return list(services_data)
+
+
+@analytics_builder('recent_activity')
+def build_recent_activity(business, params, timings):
+    """Latest bookings and reviews, newest first"""
+    # Get recent bookings
+    recent_bookings = Booking.objects.filter(
+        business=business
+    ).select_related('service', 'customer__user').order_by('-created_at')[:10]
+    activities = []
+
+    for booking in recent_bookings:
+        activities.append({
+            'type': 'booking',
+            'title': f'New booking for {booking.service.name}',
+            'description': f'Customer: {booking.customer.user.full_name}',
+            'date': booking.created_at.isoformat(),
+            'status': booking.status
+        })
+
+    # Get recent reviews
+    recent_reviews = Review.objects.filter(
+        business=business
+    ).select_related('customer__user').order_by('-created_at')[:5]
+
+    for review in recent_reviews:
+        customer_name = f"{review.customer.user.first_name} {review.customer.user.last_name}".strip()
+        if not customer_name:
+            customer_name = review.customer.user.email or "Unknown Customer"
+
+        activities.append({
+            'id': str(review.id),
+            'type': 'review',
+            'title': f'New {review.rating}-star review',
+            'description': f'{customer_name} left a review',
+            'date': review.created_at.isoformat(),
+            'rating': review.rating
+        })
+
+    # Sort by date
+    activities.sort(key=lambda x: x['date'], reverse=True)
+
+    return activities[:15]
+
+
+@analytics_builder('revenue_report')
+def build_revenue_report(business, params, timings):
+    """Detailed revenue report of a period"""
+    period = params.get('period', 'month')
+    start_date = _period_start(period, timezone.now()).date()
+
+    bookings = Booking.objects.filter(
+        business=business,
+        booking_date__gte=start_date,
+        is_paid=True
+    )
+    totals = booking_metrics(business, {
+        'period': (booked_between(start_date), ['paid_revenue', 'paid_bookings', 'average_paid_value'])
+    })['period']
+
+    return {
+        'period': period,
+        'start_date': start_date,
+        'end_date': timezone.now().date(),
+        'total_revenue': float(totals['paid_revenue']),
+        'total_bookings': totals['paid_bookings'],
+        'average_booking_value': float(totals['average_paid_value']),
+        'revenue_by_service': _get_service_revenue(business, start_date),
+        'revenue_by_day': _get_revenue_by_day(bookings),
+        'payment_methods': _get_payment_method_breakdown(bookings),
+        'top_revenue_customers': top_customers(business.id, start_date, limit=5)
+    }
+
+
+@analytics_builder('analytics_chart')
+def build_analytics_chart(business, params, timings):
+    """
+    One analytics chart.
+
+    ``?output=spec`` returns the chart's Plotly figure JSON (traces and
+    layout) for the frontend to render; the default ``html`` output renders
+    it on the server with Plotly.
+    """
+    chart_type = params.get('type', 'bookings')
+    period = params.get('period', '30')
+    output = params.get('output', 'html')
+
+    try:
+        period_days = int(period)
+    except ValueError:
+        period_days = 30
+
+    if chart_type not in CHART_SPECS:
+        raise AnalyticsError('Invalid chart type')
+    if output not in ('html', 'spec'):
+        raise AnalyticsError('output must be one of: html, spec')
+    if output == 'html' and not plotly_available():
+        raise AnalyticsError('Plotly is not installed. Please install plotly to use charts.', status_code=501)
+
+    end_date = timezone.now().date()
+    start_date = end_date - timedelta(days=period_days)
+    spec = CHART_SPECS[chart_type](business, start_date, end_date)
+
+    if output == 'spec':
+        return {'type': chart_type, 'period': period_days, 'spec': spec}
+    return {'chart': render_chart_html(business.id, chart_type, period_days, spec)}
+
+
+@analytics_builder('cohorts')
+def build_cohorts(business, params, timings):
+    """Monthly cohort retention matrix of the last ``months`` months"""
+    try:
+        months = int(params.get('months', 12))
+    except ValueError:
+        raise AnalyticsError('months must be a number')
+    if not 1 <= months <= MAX_COHORT_MONTHS:
+        raise AnalyticsError(f'months must be between 1 and {MAX_COHORT_MONTHS}')
+
+    this_month = month_start(timezone.now().date())
+    matrix = cohort_matrix(business.id, add_months(this_month, 1 - months), this_month)
+
+    return {
+        'cohorts': [
+            {
+                'cohort': row['cohort'].strftime('%Y-%m'),
+                'customers': row['customers'],
+                'active': row['active'],
+                'retention': [
+                    round(active / row['customers'] * 100, 2) if row['customers'] else 0
+                    for active in row['active']
+                ]
+            }
+            for row in matrix
+        ],
+        'retention_curve': retention_curve(matrix)
+    }
+
+
+def _calculate_growth(daily, metric_type):
+    """Calculate growth percentage compared to previous period"""
+    today = timezone.now().date()
+    current_start = today - timedelta(days=30)
+    current_end = today
+    previous_start = today - timedelta(days=60)
+    previous_end = today - timedelta(days=30)
+
+    field = 'total_bookings' if metric_type == 'bookings' else 'paid_revenue'
+    current = sum(
+        getattr(row, field) for row in daily
+        if current_start <= row.date <= current_end
+    )
+    previous = sum(
+        getattr(row, field) for row in daily
+        if previous_start <= row.date <= previous_end
+    )
+
+    if previous == 0:
+        return 100 if current > 0 else 0
+    return round(float((current - previous) / previous) * 100, 2)
+
+
+def _get_bookings_by_date(daily):
+    """Get bookings grouped by date"""
+    return [
+        {
+            'date': row.date.isoformat(),
+            'bookings': row.total_bookings,
+            'revenue': float(row.confirmed_revenue)
+        }
+        for row in daily
+        if row.total_bookings
+    ]
+
+
+def _month_starts(today):
+    """First days of the last 12 months, oldest first"""
+    months = [today.replace(day=1)]
+    for _ in range(11):
+        months.append((months[-1] - timedelta(days=1)).replace(day=1))
+    return list(reversed(months))
+
+
+def _get_revenue_by_month(daily):
+    """Get revenue for last 12 months"""
+    today = timezone.now().date()
+    revenue = {month: 0 for month in _month_starts(today)}
+
+    for row in daily:
+        month = row.date.replace(day=1)
+        if month in revenue and row.date <= today:
+            revenue[month] += row.confirmed_revenue
+
+    return [
+        {'month': month.strftime('%B %Y'), 'revenue': float(total)}
+        for month, total in revenue.items()
+    ]
+
+
+def _get_bookings_by_hour(heatmap):
+    """Analyze booking patterns by hour of day"""
+    return [
+        {'hour': hour, 'count': count}
+        for hour, count in enumerate(map(sum, zip(*heatmap)))
+        if count
+    ]
+
+
+def _get_bookings_by_weekday(heatmap):
+    """Analyze booking patterns by day of week"""
+    weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                    'Friday', 'Saturday', 'Sunday']
+    return [
+        {'weekday': weekday_names[day], 'count': sum(hours)}
+        for day, hours in enumerate(heatmap)
+    ]
+
+
+def _get_popular_services(business, start_date):
+    """Get most popular services by booking count"""
+    services = Service.objects.filter(business=business).annotate(
+        booking_count=Count(
+            'bookings',
+            filter=Q(bookings__booking_date__gte=start_date)
+        ),
+        total_revenue=Sum(
+            'bookings__total_price',
+            filter=Q(
+                bookings__booking_date__gte=start_date,
+                bookings__is_paid=True
+            )
+        )
+    ).order_by('-booking_count')[:5]
+
+    return [
+        {
+            'id': str(service.id),
+            'name': service.name,
+            'bookings': service.booking_count,
+            'revenue': float(service.total_revenue or 0),
+            'average_price': float(service.price)
+        }
+        for service in services
+    ]
+
+
+def _get_service_revenue(business, start_date):
+    """Get revenue breakdown by service"""
+    services = Service.objects.filter(business=business).annotate(
+        revenue=Sum(
+            'bookings__total_price',
+            filter=Q(
+                bookings__booking_date__gte=start_date,
+                bookings__is_paid=True
+            )
+        )
+    ).exclude(revenue=None).order_by('-revenue')
+
+    return [
+        {
+            'service': service.name,
+            'revenue': float(service.revenue),
+            'percentage': 0  # Calculate after getting total
+        }
+        for service in services
+    ]
+
+
+def _get_customer_demographics(business, customer_metrics):
+    """Analyze customer demographics"""
+    total = customer_metrics['all_time']['customers']
+
+    # Customers with more than one booking, from their cohort memberships
+    returning_customers = business.customer_cohorts.filter(total_bookings__gt=1).count()
+
+    return {
+        'total': total,
+        'new_this_month': customer_metrics['new']['customers'],
+        'returning': returning_customers,
+        'retention_rate': round(
+            (returning_customers / total * 100) if total > 0 else 0,
+            2
+        )
+    }
+
+
+def _calculate_retention_rate(business):
+    """Share of the customers acquired two months ago who book again this month"""
+    this_month = month_start(timezone.now().date())
+    cohort_month = add_months(this_month, -2)
+
+    active = dict(business.cohort_activity.filter(
+        cohort_month=cohort_month,
+        month__in=[cohort_month, this_month]
+    ).values_list('month', 'active_customers'))
+    total = active.get(cohort_month, 0)
+    retained = active.get(this_month, 0)
+
+    return {
+        'rate': round((retained / total * 100) if total > 0 else 0, 2),
+        'retained': retained,
+        'total': total
+    }
+
+
+def _get_booking_status_breakdown(daily):
+    """Get breakdown of bookings by status"""
+    status_data = {}
+    for row in daily:
+        for booking_status, field in STATUS_FIELDS.items():
+            status_data[booking_status] = status_data.get(booking_status, 0) + getattr(row, field)
+
+    return [
+        {
+            'status': booking_status,
+            'count': count
+        }
+        for booking_status, count in sorted(status_data.items())
+        if count
+    ]
+
+
+def _get_upcoming_bookings(daily):
+    """Get upcoming bookings for next 7 days"""
+    today = timezone.now().date()
+    next_week = today + timedelta(days=7)
+
+    return sum(
+        row.confirmed_bookings + row.pending_bookings
+        for row in daily
+        if today <= row.date <= next_week
+    )
+
+
+def _get_revenue_by_day(bookings):
+    """Get daily revenue breakdown"""
+    return list(
+        bookings.values('booking_date').annotate(
+            revenue=Sum('total_price')
+        ).order_by('booking_date').values('booking_date', 'revenue')
+    )
+
+
+def _get_payment_method_breakdown(bookings):
+    """Get payment method breakdown"""
+    return list(
+        bookings.values('payment_method').annotate(
+            count=Count('id'),
+            total=Sum('total_price')
+        ).order_by('-total')
+    )
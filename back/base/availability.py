@@ -0,0 +1,299 @@
+# base/availability.py
+"""
+Availability engine.
+
+Times are handled as minutes since midnight. For a given (business, service,
+date) the existing bookings are sorted once and swept against the candidate
+slot grid in a single pass, instead of rescanning every booking per slot.
+"""
+import heapq
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .cache import get_cached_availability, set_cached_availability
+from .models import BusinessHours, SlotCapacity, SlotHold
+
+# Booking statuses that occupy a slot
+BLOCKING_STATUSES = ('pending', 'confirmed')
+
+# Same-day bookings must start at least this far in the future
+MIN_LEAD_TIME = timedelta(hours=1)
+
+# Longest window accepted for range availability
+MAX_DAYS_AHEAD = 365
+
+# Limits of the batch availability endpoint
+MAX_BATCH_SERVICES = 50
+MAX_BATCH_DAYS = 31
+
+# Windows of at least this many days use the NumPy backend when installed
+VECTORIZE_MIN_DAYS = 60
+
+
+def time_to_minutes(value, round_up=False):
+    """Convert a time to minutes since midnight"""
+    minutes = value.hour * 60 + value.minute
+    if round_up and (value.second or value.microsecond):
+        minutes += 1
+    return minutes
+
+
+def minutes_to_time(minutes):
+    """Convert minutes since midnight back to a time"""
+    return time(minutes // 60, minutes % 60)
+
+
+def build_slot_grid(opening_time, closing_time, duration_minutes, buffer_minutes=0):
+    """Return the candidate (start, end) slots of a day, in minutes"""
+    start = time_to_minutes(opening_time)
+    closing = time_to_minutes(closing_time)
+    increment = duration_minutes + buffer_minutes
+
+    slots = []
+    while start + duration_minutes <= closing:
+        slots.append((start, start + duration_minutes))
+        start += increment
+    return slots
+
+
+def to_intervals(time_ranges):
+    """
+    Turn (start_time, end_time[, weight]) tuples into sorted minute intervals.
+
+    The weight is the number of bookings sharing the interval and defaults
+    to one.
+    """
+    return sorted(
+        (time_to_minutes(start), time_to_minutes(end, round_up=True), weight[0] if weight else 1)
+        for start, end, *weight in time_ranges
+    )
+
+
+def sweep_overlaps(slots, intervals):
+    """
+    Count how many bookings overlap each slot.
+
+    Both ``slots`` and ``intervals`` must be sorted by start. Intervals are
+    pushed once when they begin before a slot ends and popped once when they
+    end before a slot starts, so the whole day is a single pass.
+    """
+    counts = []
+    active = []
+    load = 0
+    index = 0
+
+    for slot_start, slot_end in slots:
+        while index < len(intervals) and intervals[index][0] < slot_end:
+            _, end, weight = intervals[index]
+            heapq.heappush(active, (end, weight))
+            load += weight
+            index += 1
+        while active and active[0][0] <= slot_start:
+            load -= heapq.heappop(active)[1]
+        counts.append(load)
+
+    return counts
+
+
+def earliest_start_minutes(day, now):
+    """Minutes since midnight of ``day`` before which slots can't be booked"""
+    if day != now.date():
+        return 0
+    midnight = timezone.make_aware(datetime.combine(day, time.min))
+    return (now + MIN_LEAD_TIME - midnight).total_seconds() / 60
+
+
+def open_slots(hours, service, intervals):
+    """
+    Compute the slots of one service on one day that still have capacity.
+
+    ``hours`` is the BusinessHours row for the weekday (or None) and
+    ``intervals`` the sorted booked intervals from ``to_intervals``. The
+    result does not depend on the current time, so it can be cached.
+    """
+    if hours is None or hours.is_closed:
+        return []
+
+    grid = build_slot_grid(
+        hours.opening_time,
+        hours.closing_time,
+        service.duration_minutes,
+        service.buffer_time_minutes
+    )
+    capacity = service.max_bookings_per_slot
+
+    return [
+        {
+            'start_time': minutes_to_time(slot_start).strftime('%H:%M'),
+            'end_time': minutes_to_time(slot_end).strftime('%H:%M'),
+            'available_spots': capacity - booked
+        }
+        for (slot_start, slot_end), booked in zip(grid, sweep_overlaps(grid, intervals))
+        if booked < capacity
+    ]
+
+
+def use_vectorized(day_count):
+    """
+    Whether to compute ``day_count`` days with the NumPy backend.
+
+    ``AVAILABILITY_BACKEND`` is ``'auto'`` (NumPy for long windows),
+    ``'numpy'`` (always, when installed) or ``'python'`` (never).
+    """
+    backend = getattr(settings, 'AVAILABILITY_BACKEND', 'auto')
+    if backend == 'python' or (backend == 'auto' and day_count < VECTORIZE_MIN_DAYS):
+        return False
+
+    from .vectorized import NUMPY_AVAILABLE
+    return NUMPY_AVAILABLE
+
+
+def open_slots_by_day(weekly_hours, service, days, intervals):
+    """
+    Compute ``open_slots`` for each day of ``days``.
+
+    ``weekly_hours`` maps weekday -> BusinessHours and ``intervals`` maps
+    day -> sorted booked intervals. Returns ``{day: slots}``.
+    """
+    if use_vectorized(len(days)):
+        from .vectorized import open_slots_range
+        return open_slots_range(weekly_hours, service, days, intervals)
+
+    return {
+        day: open_slots(weekly_hours.get(day.weekday()), service, intervals.get(day, []))
+        for day in days
+    }
+
+
+def drop_elapsed_slots(slots, day, now):
+    """Remove slots that are in the past or inside the same-day lead time"""
+    if day < now.date():
+        return []
+
+    earliest = earliest_start_minutes(day, now)
+    if not earliest:
+        return slots
+
+    return [
+        slot for slot in slots
+        if time_to_minutes(time.fromisoformat(slot['start_time'])) >= earliest
+    ]
+
+
+def compute_day_slots(hours, service, day, intervals, now=None):
+    """Compute the bookable slots of one service on one day"""
+    now = now or timezone.now()
+    if day < now.date():
+        return []
+    return drop_elapsed_slots(open_slots(hours, service, intervals), day, now)
+
+
+def get_day_availability(business, service, day, now=None):
+    """Compute the bookable slots of one service on one day"""
+    return get_range_availability([service], day, day, now=now)[service.id].get(day, [])
+
+
+def load_business_hours(business_ids):
+    """Map business id -> weekday -> BusinessHours in a single query"""
+    hours = {}
+    for row in BusinessHours.objects.filter(business_id__in=business_ids):
+        hours.setdefault(row.business_id, {})[row.weekday] = row
+    return hours
+
+
+def load_booked_intervals(service_ids, start_date, end_date, now=None):
+    """
+    Map (service id, date) -> sorted occupied intervals in two queries.
+
+    Booked capacity is read from the per-slot counters rather than by
+    counting bookings, and active slot holds occupy one place each. Also
+    returns (service id, date) -> earliest hold expiry, after which the
+    computed slots of that day become stale.
+    """
+    now = now or timezone.now()
+    ranges = {}
+    expiries = {}
+
+    counters = SlotCapacity.objects.filter(
+        service_id__in=service_ids,
+        booking_date__range=[start_date, end_date],
+        booked__gt=0
+    ).values_list('service_id', 'booking_date', 'start_time', 'end_time', 'booked')
+
+    for service_id, booking_date, start_time, end_time, booked in counters.iterator():
+        ranges.setdefault((service_id, booking_date), []).append((start_time, end_time, booked))
+
+    holds = SlotHold.objects.filter(
+        service_id__in=service_ids,
+        booking_date__range=[start_date, end_date],
+        expires_at__gt=now
+    ).values_list('service_id', 'booking_date', 'start_time', 'end_time', 'expires_at')
+
+    for service_id, booking_date, start_time, end_time, expires_at in holds:
+        key = (service_id, booking_date)
+        ranges.setdefault(key, []).append((start_time, end_time))
+        expiries[key] = min(expires_at, expiries.get(key, expires_at))
+
+    return {key: to_intervals(value) for key, value in ranges.items()}, expiries
+
+
+def get_range_availability(services, start_date, end_date, now=None):
+    """
+    Compute bookable slots for several services over a date range.
+
+    Days are served from the availability cache where possible. Hours,
+    slot counters and holds for the missing days are loaded with one query each,
+    so the query count does not grow with the number of days. Returns
+    ``{service_id: {date: slots}}``.
+    """
+    now = now or timezone.now()
+    services = list(services)
+    start_date = max(start_date, now.date())
+
+    days = []
+    day = start_date
+    while day <= end_date:
+        days.append(day)
+        day += timedelta(days=1)
+
+    slots = {}
+    missing = []
+    for service in services:
+        cached, keys = get_cached_availability(service, days)
+        slots[service.id] = cached
+        missing_days = [day for day in days if day not in cached]
+        if missing_days:
+            missing.append((service, keys, missing_days))
+
+    if missing:
+        hours = load_business_hours({service.business_id for service, _, _ in missing})
+        intervals, expiries = load_booked_intervals(
+            [service.id for service, _, _ in missing],
+            min(missing_days[0] for _, _, missing_days in missing),
+            max(missing_days[-1] for _, _, missing_days in missing),
+            now=now
+        )
+
+        for service, keys, missing_days in missing:
+            computed = open_slots_by_day(
+                hours.get(service.business_id, {}),
+                service,
+                missing_days,
+                {day: intervals[(service.id, day)] for day in missing_days if (service.id, day) in intervals}
+            )
+            set_cached_availability(keys, computed, expiries={
+                day: expiries[(service.id, day)]
+                for day in missing_days
+                if (service.id, day) in expiries
+            })
+            slots[service.id].update(computed)
+
+    return {
+        service.id: {
+            day: drop_elapsed_slots(slots[service.id][day], day, now)
+            for day in days
+        }
+        for service in services
+    }
@@ -0,0 +1,200 @@
+# base/cache.py
+"""
+Cache helpers for availability lookups and owner analytics.
+
+Slot grids are cached per (service, date). Keys embed a business version and
+a service version so that changes to business hours or service settings
+invalidate every cached date of the affected services at once, while booking
+writes only drop the single (service, date) entry they touch.
+
+Analytics snapshots are cached per business together with the data version
+they were computed from. The version is bumped on every booking, review or
+service write of the business, which marks its snapshots as outdated
+without dropping them.
+"""
+import hashlib
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+AVAILABILITY_CACHE_TIMEOUT = getattr(settings, 'AVAILABILITY_CACHE_TIMEOUT', 60 * 60 * 24)
+
+ANALYTICS_CACHE_TIMEOUT = getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+# Longest a background recompute may hold its claim
+ANALYTICS_REFRESH_TIMEOUT = getattr(settings, 'ANALYTICS_REFRESH_TIMEOUT', 60 * 5)
+
+CHART_HTML_CACHE_TIMEOUT = getattr(settings, 'CHART_HTML_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+AVAILABILITY_HITS_KEY = 'availability:hits'
+AVAILABILITY_MISSES_KEY = 'availability:misses'
+
+
+def _version_key(kind, object_id):
+    return f'cache:version:{kind}:{object_id}'
+
+
+def _initial_version():
+    # Seeded from the clock so an evicted version never reuses an old number
+    return int(time.time() * 1000)
+
+
+def _get_versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def _increment(key, delta):
+    if not delta:
+        return
+    if cache.add(key, delta, None):
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, None)
+
+
+def availability_keys(business_id, service_id, days):
+    """Return the cache key of every (service, day) pair"""
+    business_key = _version_key('business', business_id)
+    service_key = _version_key('service', service_id)
+    versions = _get_versions([business_key, service_key])
+    prefix = f'availability:{service_id}:{versions[business_key]}:{versions[service_key]}'
+    return {day: f'{prefix}:{day.isoformat()}' for day in days}
+
+
+def get_cached_availability(service, days):
+    """Return ``({day: slots}, keys)`` for the days present in the cache"""
+    keys = availability_keys(service.business_id, service.id, days)
+    cached = cache.get_many(list(keys.values()))
+    found = {day: cached[key] for day, key in keys.items() if key in cached}
+
+    _increment(AVAILABILITY_HITS_KEY, len(found))
+    _increment(AVAILABILITY_MISSES_KEY, len(keys) - len(found))
+    return found, keys
+
+
+def set_cached_availability(keys, slots_by_day, expiries=None):
+    """
+    Store freshly computed slot grids under the keys from ``get_cached_availability``.
+
+    ``expiries`` maps days to the moment their grid goes stale on its own
+    (the earliest slot hold expiry); those entries are cached only until then.
+    """
+    expiries = expiries or {}
+    cache.set_many(
+        {keys[day]: slots for day, slots in slots_by_day.items() if day not in expiries},
+        AVAILABILITY_CACHE_TIMEOUT
+    )
+    for day, expires_at in expiries.items():
+        timeout = math.ceil((expires_at - timezone.now()).total_seconds())
+        if timeout > 0:
+            cache.set(keys[day], slots_by_day[day], min(timeout, AVAILABILITY_CACHE_TIMEOUT))
+
+
+def invalidate_availability(business_id, service_id, day):
+    """Drop the cached slots of one service on one day"""
+    cache.delete_many(list(availability_keys(business_id, service_id, [day]).values()))
+
+
+def invalidate_service_availability(service_id):
+    """Drop every cached date of a service"""
+    _bump_version(_version_key('service', service_id))
+
+
+def invalidate_business_availability(business_id):
+    """Drop every cached date of every service of a business"""
+    _bump_version(_version_key('business', business_id))
+
+
+def availability_cache_stats():
+    """Return hit/miss counters of the availability cache"""
+    hits = cache.get(AVAILABILITY_HITS_KEY, 0)
+    misses = cache.get(AVAILABILITY_MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups * 100, 2) if lookups else 0
+    }
+
+
+def reset_availability_cache_stats():
+    cache.delete_many([AVAILABILITY_HITS_KEY, AVAILABILITY_MISSES_KEY])
+
+
+def analytics_data_version(business_id):
+    """Current data version of a business' analytics"""
+    version_key = _version_key('analytics', business_id)
+    return _get_versions([version_key])[version_key]
+
+
+def analytics_cache_key(business_id, name, params=None):
+    """
+    Return the cache key of one analytics snapshot of a business.
+
+    The key does not change with the data; snapshots carry the data version
+    they were computed from so outdated ones can still be served while they
+    are recomputed.
+    """
+    query = '&'.join(f'{key}={value}' for key, value in sorted((params or {}).items()))
+    digest = hashlib.md5(query.encode()).hexdigest()
+    return f'analytics:{business_id}:{name}:{digest}'
+
+
+def get_cached_analytics(key):
+    """Return the cached analytics snapshot under ``key`` or None"""
+    return cache.get(key)
+
+
+def set_cached_analytics(key, snapshot):
+    cache.set(key, snapshot, ANALYTICS_CACHE_TIMEOUT)
+
+
+def claim_analytics_refresh(key):
+    """
+    Claim the recompute of the snapshot under ``key``.
+
+    Only the first caller gets True until the claim is released or times
+    out, so concurrent stale reads schedule a single recompute.
+    """
+    return cache.add(f'{key}:refreshing', True, ANALYTICS_REFRESH_TIMEOUT)
+
+
+def release_analytics_refresh(key):
+    cache.delete(f'{key}:refreshing')
+
+
+def chart_html_cache_key(business_id, chart_type, period, spec):
+    """Cache key of a rendered chart, digesting the chart's data"""
+    digest = hashlib.md5(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+    return f'chart:{business_id}:{chart_type}:{period}:{digest}'
+
+
+def get_cached_chart_html(key):
+    return cache.get(key)
+
+
+def set_cached_chart_html(key, html):
+    cache.set(key, html, CHART_HTML_CACHE_TIMEOUT)
+
+
+def invalidate_business_analytics(business_id):
+    """Mark every cached analytics snapshot of a business as outdated"""
+    _bump_version(_version_key('analytics', business_id))
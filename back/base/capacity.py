@@ -0,0 +1,97 @@
+# base/capacity.py
+"""
+Per-slot capacity counters.
+
+``SlotCapacity`` holds the number of pending/confirmed bookings of a service
+starting at a given date and time. Counters are adjusted atomically with
+F-expressions whenever a booking enters or leaves a blocking status, so
+capacity checks read one row per slot instead of counting bookings.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Greatest
+
+from .availability import BLOCKING_STATUSES
+from .models import Booking, SlotCapacity
+
+
+def adjust_slot_capacity(service_id, booking_date, start_time, end_time, delta):
+    """Atomically add ``delta`` to the counter of one slot"""
+    slot = SlotCapacity.objects.filter(
+        service_id=service_id,
+        booking_date=booking_date,
+        start_time=start_time
+    )
+    if slot.update(booked=F('booked') + delta, end_time=Greatest(F('end_time'), end_time)):
+        return
+    if delta < 0:
+        return
+
+    try:
+        with transaction.atomic():
+            SlotCapacity.objects.create(
+                service_id=service_id,
+                booking_date=booking_date,
+                start_time=start_time,
+                end_time=end_time,
+                booked=delta
+            )
+    except IntegrityError:
+        # Created concurrently - fall back to the atomic increment
+        slot.update(booked=F('booked') + delta, end_time=Greatest(F('end_time'), end_time))
+
+
+def _occupied_slot(state):
+    if not state or state['status'] not in BLOCKING_STATUSES:
+        return None
+    return (state['service_id'], state['booking_date'], state['start_time'], state['end_time'])
+
+
+def sync_slot_capacity(previous, current):
+    """
+    Move a booking's place between slot counters.
+
+    ``previous`` and ``current`` are booking field snapshots (``None`` for a
+    booking that did not exist before or no longer exists).
+    """
+    before = _occupied_slot(previous)
+    after = _occupied_slot(current)
+    if before == after:
+        return
+
+    if before:
+        adjust_slot_capacity(*before, -1)
+    if after:
+        adjust_slot_capacity(*after, 1)
+
+
+def rebuild_slot_capacity(service_ids=None, start_date=None, end_date=None):
+    """
+    Rebuild slot counters from the bookings table in bulk.
+
+    Counters matching the filters are deleted with one query and recreated
+    from one grouped booking query. Returns the number of counters written.
+    """
+    filters = {}
+    if service_ids:
+        filters['service_id__in'] = service_ids
+    if start_date:
+        filters['booking_date__gte'] = start_date
+    if end_date:
+        filters['booking_date__lte'] = end_date
+
+    totals = (
+        Booking.objects.filter(status__in=BLOCKING_STATUSES, **filters)
+        .order_by()
+        .values('service_id', 'booking_date', 'start_time')
+        .annotate(booked=Count('id'), end_time=Max('end_time'))
+    )
+
+    with transaction.atomic():
+        SlotCapacity.objects.filter(**filters).delete()
+        counters = SlotCapacity.objects.bulk_create(
+            [SlotCapacity(**row) for row in totals.iterator()],
+            batch_size=1000
+        )
+
+    return len(counters)
@@ -0,0 +1,183 @@
+# base/charts.py
+"""
+Analytics charts as Plotly figure specs.
+
+Specs are plain dicts built from the database and need no charting library.
+Plotly is only imported the first time a chart is rendered to HTML, so
+workers that never render one don't load it.
+"""
+from importlib.util import find_spec
+
+from django.db.models import Count, Q, Sum
+
+from .cache import chart_html_cache_key, get_cached_chart_html, set_cached_chart_html
+from .heatmap import booking_heatmap
+from .models import Booking, Customer, Service
+
+
+def plotly_available():
+    """Whether plotly is installed, without importing it"""
+    return find_spec('plotly') is not None
+
+
+def _bookings_chart_spec(business, start_date, end_date):
+    """Bookings over time"""
+    rows = list(Booking.objects.filter(
+        business=business,
+        booking_date__range=[start_date, end_date]
+    ).values('booking_date').annotate(
+        count=Count('id')
+    ).order_by('booking_date'))
+    if not rows:
+        rows = [{'booking_date': start_date, 'count': 0}]
+
+    return {
+        'data': [{
+            'type': 'scatter',
+            'x': [row['booking_date'].isoformat() for row in rows],
+            'y': [row['count'] for row in rows],
+            'mode': 'lines+markers',
+            'name': 'Bookings',
+            'line': {'color': '#4CAF50', 'width': 2},
+            'marker': {'size': 8}
+        }],
+        'layout': {
+            'title': {'text': 'Bookings Over Time'},
+            'xaxis': {'title': {'text': 'Date'}},
+            'yaxis': {'title': {'text': 'Number of Bookings'}},
+            'hovermode': 'x unified',
+            'showlegend': False
+        }
+    }
+
+
+def _revenue_chart_spec(business, start_date, end_date):
+    """Paid revenue over time"""
+    rows = list(Booking.objects.filter(
+        business=business,
+        booking_date__range=[start_date, end_date],
+        is_paid=True
+    ).values('booking_date').annotate(
+        revenue=Sum('total_price')
+    ).order_by('booking_date'))
+    if not rows:
+        rows = [{'booking_date': start_date, 'revenue': 0}]
+
+    return {
+        'data': [{
+            'type': 'bar',
+            'x': [row['booking_date'].isoformat() for row in rows],
+            'y': [float(row['revenue']) for row in rows],
+            'name': 'Revenue',
+            'marker': {'color': '#2196F3'}
+        }],
+        'layout': {
+            'title': {'text': 'Revenue Over Time'},
+            'xaxis': {'title': {'text': 'Date'}},
+            'yaxis': {'title': {'text': 'Revenue ($)'}},
+            'hovermode': 'x unified',
+            'showlegend': False
+        }
+    }
+
+
+def _services_chart_spec(business, start_date, end_date):
+    """Service popularity pie"""
+    services = Service.objects.filter(business=business).annotate(
+        booking_count=Count(
+            'bookings',
+            filter=Q(
+                bookings__booking_date__range=[start_date, end_date]
+            )
+        )
+    ).exclude(booking_count=0).values_list('name', 'booking_count')
+
+    return {
+        'data': [{
+            'type': 'pie',
+            'labels': [name for name, _ in services],
+            'values': [count for _, count in services],
+            'hole': 0.3
+        }],
+        'layout': {'title': {'text': 'Service Distribution'}}
+    }
+
+
+def _customers_chart_spec(business, start_date, end_date):
+    """New vs returning customers"""
+    customers = Customer.objects.filter(
+        bookings__business=business,
+        bookings__booking_date__range=[start_date, end_date]
+    ).distinct()
+
+    new_customers = customers.filter(
+        created_at__gte=start_date
+    ).count()
+
+    returning_customers = customers.filter(
+        created_at__lt=start_date
+    ).count()
+
+    return {
+        'data': [
+            {'type': 'bar', 'name': 'New', 'x': ['Customers'], 'y': [new_customers]},
+            {'type': 'bar', 'name': 'Returning', 'x': ['Customers'], 'y': [returning_customers]}
+        ],
+        'layout': {
+            'title': {'text': 'New vs Returning Customers'},
+            'barmode': 'stack'
+        }
+    }
+
+
+def _heatmap_chart_spec(business, start_date, end_date):
+    """Bookings by day of week and hour"""
+    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    hours = list(range(24))
+
+    return {
+        'data': [{
+            'type': 'heatmap',
+            'z': booking_heatmap(business.id, start_date, end_date),
+            'x': [f"{h:02d}:00" for h in hours],
+            'y': days,
+            'colorscale': 'Viridis'
+        }],
+        'layout': {
+            'title': {'text': 'Booking Heatmap'},
+            'xaxis': {'title': {'text': 'Hour of Day'}},
+            'yaxis': {'title': {'text': 'Day of Week'}}
+        }
+    }
+
+
+# Chart type -> function(business, start_date, end_date) returning a Plotly figure spec
+CHART_SPECS = {
+    'bookings': _bookings_chart_spec,
+    'revenue': _revenue_chart_spec,
+    'services': _services_chart_spec,
+    'customers': _customers_chart_spec,
+    'heatmap': _heatmap_chart_spec,
+}
+
+
+def render_chart_html(business_id, chart_type, period_days, spec):
+    """
+    Plotly HTML of a chart spec, cached per chart until its data changes.
+
+    The key digests the spec, so writes that don't change a chart's data
+    (a review for the bookings chart, say) don't render it again.
+    """
+    key = chart_html_cache_key(business_id, chart_type, period_days, spec)
+    html = get_cached_chart_html(key)
+    if html is None:
+        # Plotly takes a while to import and stays resident, so only the
+        # workers that render charts pay for it
+        import plotly.graph_objs as go
+        import plotly.io as pio
+
+        figure = go.Figure(spec)
+        figure.update_layout(template='plotly_white')
+        html = pio.to_html(figure, include_plotlyjs='cdn', div_id=f'{chart_type}-chart')
+        set_cached_chart_html(key, html)
+    return html
@@ -0,0 +1,242 @@
+# base/cohorts.py
+"""
+Monthly customer cohorts.
+
+Every customer of a business belongs to the cohort of the month of their
+first booking with it. ``CustomerCohort`` keeps each customer's bookings per
+month and ``CohortActivity`` holds the cohort x month matrix of active
+customers. Booking writes move a booking between months (and a customer
+between cohorts) under row locks, so retention of any cohort over any months
+is read from the matrix instead of joining customers with their bookings.
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from .models import CohortActivity, CustomerCohort
+from .rollups import has_additions, locked_row
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    """First day of the month ``count`` months after ``month``"""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _cells(cohort_month, bookings_by_month):
+    """Matrix cells of one customer as ``{(cohort month, month): bookings}``"""
+    return {
+        (cohort_month, date.fromisoformat(month)): count
+        for month, count in bookings_by_month.items()
+    }
+
+
+def _apply_activity(business_id, cohort_month, month, active_delta, bookings_delta):
+    cell = locked_row(
+        CohortActivity,
+        {'business_id': business_id, 'cohort_month': cohort_month, 'month': month},
+        create=active_delta > 0 or bookings_delta > 0
+    )
+    if cell is None:
+        return
+
+    cell.active_customers += active_delta
+    cell.bookings += bookings_delta
+    if cell.active_customers or cell.bookings:
+        cell.save()
+    else:
+        cell.delete()
+
+
+def apply_cohort_changes(business_id, customer_id, month_deltas):
+    """Add booking count deltas per month to one customer's activity with a business"""
+    with transaction.atomic():
+        membership = locked_row(
+            CustomerCohort,
+            {'business_id': business_id, 'customer_id': customer_id},
+            create=has_additions(month_deltas),
+            defaults={'cohort_month': min(month_deltas)}
+        )
+        if membership is None:
+            return
+
+        old_months = dict(membership.bookings_by_month)
+
+        new_months = dict(old_months)
+        for month, delta in month_deltas.items():
+            count = new_months.get(month.isoformat(), 0) + delta
+            if count:
+                new_months[month.isoformat()] = count
+            else:
+                new_months.pop(month.isoformat(), None)
+
+        # ISO dates sort chronologically
+        new_cohort = date.fromisoformat(min(new_months)) if new_months else None
+        old_cells = _cells(membership.cohort_month, old_months)
+        new_cells = _cells(new_cohort, new_months)
+
+        # Lock cells in a fixed order so concurrent writers can't deadlock
+        for cell in sorted(old_cells.keys() | new_cells.keys()):
+            active_delta = (cell in new_cells) - (cell in old_cells)
+            bookings_delta = new_cells.get(cell, 0) - old_cells.get(cell, 0)
+            if active_delta or bookings_delta:
+                _apply_activity(business_id, *cell, active_delta, bookings_delta)
+
+        if not new_months:
+            membership.delete()
+            return
+
+        membership.cohort_month = new_cohort
+        membership.bookings_by_month = new_months
+        membership.total_bookings = sum(new_months.values())
+        membership.save()
+
+
+def remove_customer_cohorts(customer_id):
+    """
+    Take a customer being deleted out of the cohort matrices.
+
+    Runs before the delete cascades, which removes the customer's
+    memberships ahead of their bookings and so would leave the bookings
+    nothing to take their matrix cells from.
+    """
+    memberships = CustomerCohort.objects.filter(customer_id=customer_id).values_list(
+        'business_id', 'bookings_by_month'
+    )
+    for business_id, bookings_by_month in list(memberships):
+        apply_cohort_changes(business_id, customer_id, {
+            date.fromisoformat(month): -count for month, count in bookings_by_month.items()
+        })
+
+
+def sync_cohorts(previous, current):
+    """
+    Move a booking between customer months.
+
+    ``previous`` and ``current`` are booking field snapshots (``None`` for a
+    booking that did not exist before or no longer exists).
+    """
+    changes = defaultdict(lambda: defaultdict(int))
+    if previous:
+        changes[(previous['business_id'], previous['customer_id'])][month_start(previous['booking_date'])] -= 1
+    if current:
+        changes[(current['business_id'], current['customer_id'])][month_start(current['booking_date'])] += 1
+
+    for (business_id, customer_id), deltas in changes.items():
+        deltas = {month: delta for month, delta in deltas.items() if delta}
+        if deltas:
+            apply_cohort_changes(business_id, customer_id, deltas)
+
+
+def rebuild_cohorts(business_ids=None, apps=global_apps):
+    """
+    Rebuild cohort memberships and activity from the bookings table in bulk.
+
+    Returns the number of memberships written. Migrations pass their
+    ``apps`` to backfill with historical models.
+    """
+    cohort_model = apps.get_model('base', 'CustomerCohort')
+    activity_model = apps.get_model('base', 'CohortActivity')
+    bookings = apps.get_model('base', 'Booking').objects.order_by()
+    if business_ids:
+        bookings = bookings.filter(business_id__in=business_ids)
+
+    months_by_customer = defaultdict(dict)
+    rows = bookings.values(
+        'business_id', 'customer_id', month=TruncMonth('booking_date')
+    ).annotate(count=Count('id'))
+    for row in rows.iterator():
+        months_by_customer[(row['business_id'], row['customer_id'])][row['month'].isoformat()] = row['count']
+
+    memberships = []
+    matrix = defaultdict(lambda: [0, 0])
+    for (business_id, customer_id), months in months_by_customer.items():
+        cohort_month = date.fromisoformat(min(months))
+        memberships.append(cohort_model(
+            business_id=business_id,
+            customer_id=customer_id,
+            cohort_month=cohort_month,
+            total_bookings=sum(months.values()),
+            bookings_by_month=months
+        ))
+        for (cohort, month), count in _cells(cohort_month, months).items():
+            cell = matrix[(business_id, cohort, month)]
+            cell[0] += 1
+            cell[1] += count
+
+    with transaction.atomic():
+        filters = {'business_id__in': business_ids} if business_ids else {}
+        cohort_model.objects.filter(**filters).delete()
+        activity_model.objects.filter(**filters).delete()
+        cohort_model.objects.bulk_create(memberships, batch_size=1000)
+        activity_model.objects.bulk_create([
+            activity_model(
+                business_id=business_id,
+                cohort_month=cohort_month,
+                month=month,
+                active_customers=active,
+                bookings=count
+            )
+            for (business_id, cohort_month, month), (active, count) in matrix.items()
+        ], batch_size=1000)
+
+    return len(memberships)
+
+
+def cohort_matrix(business_id, first_cohort, last_month):
+    """
+    Activity of the cohorts from ``first_cohort`` up to ``last_month``.
+
+    Returns one ``{'cohort', 'customers', 'active'}`` dict per cohort month,
+    where ``active[i]`` is the number of its customers who booked ``i``
+    months after their first month. Every customer books in their own
+    cohort month, so ``active[0]`` is the cohort's size.
+    """
+    active = defaultdict(dict)
+    cells = CohortActivity.objects.filter(
+        business_id=business_id,
+        cohort_month__gte=first_cohort,
+        month__lte=last_month
+    ).values_list('cohort_month', 'month', 'active_customers')
+    for cohort_month, month, customers in cells:
+        active[cohort_month][month] = customers
+
+    matrix = []
+    cohort_month = first_cohort
+    while cohort_month <= last_month:
+        months = []
+        month = cohort_month
+        while month <= last_month:
+            months.append(active[cohort_month].get(month, 0))
+            month = add_months(month, 1)
+        matrix.append({
+            'cohort': cohort_month,
+            'customers': months[0],
+            'active': months
+        })
+        cohort_month = add_months(cohort_month, 1)
+    return matrix
+
+
+def retention_curve(matrix):
+    """
+    Share of customers (%) still booking ``i`` months after their first month.
+
+    Averaged over the cohorts of ``matrix`` old enough to have reached month ``i``,
+    weighted by cohort size.
+    """
+    curve = []
+    for offset in range(max((len(row['active']) for row in matrix), default=0)):
+        cohorts = [row for row in matrix if len(row['active']) > offset]
+        customers = sum(row['customers'] for row in cohorts)
+        active = sum(row['active'][offset] for row in cohorts)
+        curve.append(round(active / customers * 100, 2) if customers else 0)
+    return curve
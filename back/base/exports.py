@@ -0,0 +1,67 @@
+# base/exports.py
+"""
+Streaming booking exports.
+
+Rows are read as tuples with ``.iterator()`` (a server-side cursor where
+the database supports one) and written out one line at a time, so an export
+holds a single chunk of bookings in memory however many it covers.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Column -> booking lookup
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'booking_date': 'booking_date',
+    'start_time': 'start_time',
+    'end_time': 'end_time',
+    'status': 'status',
+    'business': 'business__name',
+    'service': 'service__name',
+    'customer_email': 'customer__user__email',
+    'customer_first_name': 'customer__user__first_name',
+    'customer_last_name': 'customer__user__last_name',
+    'total_price': 'total_price',
+    'is_paid': 'is_paid',
+    'payment_method': 'payment_method',
+    'created_at': 'created_at',
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_rows(bookings, chunk_size=EXPORT_CHUNK_SIZE):
+    """Export column values of ``bookings``, in its ordering, one tuple at a time"""
+    return bookings.values_list(*EXPORT_COLUMNS.values()).iterator(chunk_size=chunk_size)
+
+
+class _Line:
+    """File-like object handing back what the csv writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(EXPORT_COLUMNS, row))) + '\n'
+
+
+def export_lines(bookings, output):
+    """Lines of the ``output`` (``csv`` or ``ndjson``) export of ``bookings``"""
+    lines = csv_lines if output == 'csv' else ndjson_lines
+    return lines(export_rows(bookings))
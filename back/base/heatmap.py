@@ -0,0 +1,155 @@
+# base/heatmap.py
+"""
+Weekday x hour booking heatmaps.
+
+``BookingHeatmap`` keeps a 7x24 matrix of booking counts (weekday, Monday
+first, by start hour) per business and month, moved on booking writes under
+a row lock. The heatmap of a date range adds up the matrices of the whole
+months inside it, and counts the days at its edges in the database.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay, TruncMonth
+
+from .cohorts import add_months, month_start
+from .models import Booking, BookingHeatmap
+from .rollups import has_additions, locked_row
+
+WEEKDAYS = 7
+HOURS = 24
+
+
+def empty_heatmap():
+    return [[0] * HOURS for _ in range(WEEKDAYS)]
+
+
+def _add(matrix, counts):
+    for weekday, row in enumerate(counts):
+        for hour, count in enumerate(row):
+            matrix[weekday][hour] += count
+
+
+def _count_cells(bookings, *fields, **expressions):
+    """
+    Booking counts per ISO weekday and start hour (and any extra grouping),
+    counted in the database.
+    """
+    return bookings.order_by().values(
+        *fields,
+        **expressions,
+        weekday=ExtractIsoWeekDay('booking_date'),
+        hour=ExtractHour('start_time')
+    ).annotate(count=Count('id'))
+
+
+def apply_heatmap(business_id, month, cell_deltas):
+    """Add ``{(weekday, hour): delta}`` to the heatmap of one business month"""
+    with transaction.atomic():
+        heatmap = locked_row(
+            BookingHeatmap,
+            {'business_id': business_id, 'month': month},
+            create=has_additions(cell_deltas),
+            defaults={'counts': empty_heatmap()}
+        )
+        if heatmap is None:
+            return
+
+        for (weekday, hour), delta in cell_deltas.items():
+            heatmap.counts[weekday][hour] += delta
+
+        if any(map(any, heatmap.counts)):
+            heatmap.save()
+        else:
+            heatmap.delete()
+
+
+def sync_heatmap(previous, current):
+    """
+    Move a booking between heatmap cells.
+
+    ``previous`` and ``current`` are booking field snapshots (``None`` for a
+    booking that did not exist before or no longer exists).
+    """
+    changes = defaultdict(lambda: defaultdict(int))
+    for state, sign in ((previous, -1), (current, 1)):
+        if state:
+            cell = (state['booking_date'].weekday(), state['start_time'].hour)
+            changes[(state['business_id'], month_start(state['booking_date']))][cell] += sign
+
+    for key, deltas in sorted(changes.items(), key=lambda item: str(item[0])):
+        deltas = {cell: delta for cell, delta in deltas.items() if delta}
+        if deltas:
+            apply_heatmap(*key, deltas)
+
+
+def rebuild_heatmaps(business_ids=None, apps=global_apps):
+    """
+    Rebuild monthly heatmaps from the bookings table in bulk.
+
+    Returns the number of heatmaps written. Migrations pass their ``apps``
+    to backfill with historical models.
+    """
+    heatmap_model = apps.get_model('base', 'BookingHeatmap')
+    bookings = apps.get_model('base', 'Booking').objects.order_by()
+    if business_ids:
+        bookings = bookings.filter(business_id__in=business_ids)
+
+    matrices = defaultdict(empty_heatmap)
+    rows = _count_cells(bookings, 'business_id', month=TruncMonth('booking_date'))
+    for row in rows.iterator():
+        matrices[(row['business_id'], row['month'])][row['weekday'] - 1][row['hour']] += row['count']
+
+    with transaction.atomic():
+        heatmap_model.objects.filter(
+            **({'business_id__in': business_ids} if business_ids else {})
+        ).delete()
+        heatmap_model.objects.bulk_create([
+            heatmap_model(business_id=business_id, month=month, counts=counts)
+            for (business_id, month), counts in matrices.items()
+        ], batch_size=500)
+
+    return len(matrices)
+
+
+def count_heatmap(bookings):
+    """Heatmap of a bookings queryset, aggregated in the database"""
+    matrix = empty_heatmap()
+    for row in _count_cells(bookings):
+        matrix[row['weekday'] - 1][row['hour']] += row['count']
+    return matrix
+
+
+def booking_heatmap(business_id, start, end=None):
+    """
+    Heatmap of a business' bookings from ``start`` to ``end`` inclusive.
+
+    Whole months are read from their stored heatmaps; the days before the
+    first and after the last whole month are counted from the bookings. An
+    open ``end`` reaches the last booking.
+    """
+    first_month = add_months(month_start(start - timedelta(days=1)), 1)
+    end_month = month_start(end + timedelta(days=1)) if end else None
+    bookings = Booking.objects.filter(business_id=business_id)
+
+    if end_month and first_month >= end_month:
+        return count_heatmap(bookings.filter(booking_date__range=(start, end)))
+
+    matrix = empty_heatmap()
+    stored = BookingHeatmap.objects.filter(business_id=business_id, month__gte=first_month)
+    if end_month:
+        stored = stored.filter(month__lt=end_month)
+    for counts in stored.values_list('counts', flat=True):
+        _add(matrix, counts)
+
+    edges = Q()
+    if start < first_month:
+        edges |= Q(booking_date__gte=start, booking_date__lt=first_month)
+    if end_month and end_month <= end:
+        edges |= Q(booking_date__gte=end_month, booking_date__lte=end)
+    if edges:
+        _add(matrix, count_heatmap(bookings.filter(edges)))
+    return matrix
@@ -0,0 +1,74 @@
+# base/hll.py
+"""
+HyperLogLog distinct counter.
+
+A sketch keeps ``2 ** PRECISION`` one-byte registers holding the longest run
+of leading zero bits seen among the 64-bit hashes routed to each register.
+Sketches of any number of sets merge by taking the register-wise maximum,
+and the estimate of the union has a relative standard error of
+``1.04 / sqrt(2 ** PRECISION)`` (about 1.6% with the default precision).
+"""
+import hashlib
+import math
+
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+
+# Relative standard error of an estimate
+STANDARD_ERROR = 1.04 / math.sqrt(REGISTERS)
+
+_HASH_BITS = 64
+_RANK_BITS = _HASH_BITS - PRECISION
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTERS)
+
+
+def _hash(value):
+    digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class HyperLogLog:
+    """Approximate distinct count of the values added to it"""
+
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers if registers is not None else REGISTERS)
+        if len(self.registers) != REGISTERS:
+            raise ValueError(f'A sketch has {REGISTERS} registers, got {len(self.registers)}')
+
+    @classmethod
+    def union(cls, sketches):
+        """Merge ``sketches`` (HyperLogLog objects or register bytes) into a new sketch"""
+        merged = cls()
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def add(self, value):
+        """Add a value (hashed by its string form); returns True if the sketch changed"""
+        hashed = _hash(value)
+        index = hashed >> _RANK_BITS
+        remainder = hashed & ((1 << _RANK_BITS) - 1)
+        rank = _RANK_BITS - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other):
+        """Fold another sketch (or its register bytes) into this one"""
+        registers = other.registers if isinstance(other, HyperLogLog) else other
+        self.registers = bytearray(map(max, self.registers, registers))
+
+    def count(self):
+        """Estimated number of distinct values added"""
+        total = sum(2.0 ** -register for register in self.registers)
+        estimate = _ALPHA * REGISTERS * REGISTERS / total
+
+        # Linear counting is more accurate while many registers are empty
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * REGISTERS and empty:
+            estimate = REGISTERS * math.log(REGISTERS / empty)
+        return round(estimate)
+
+    def to_bytes(self):
+        return bytes(self.registers)
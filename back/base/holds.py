@@ -0,0 +1,55 @@
+# base/holds.py
+"""
+Short-lived slot holds.
+
+A hold reserves capacity on a (service, date, start_time) slot for
+``SLOT_HOLD_TTL_SECONDS`` while the customer completes the booking. Holds
+count against capacity until they expire; expired rows are ignored by every
+reader and removed in bulk by ``reap_expired_holds``.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_availability
+from .models import Business, SlotHold
+
+HOLD_TTL = timedelta(seconds=getattr(settings, 'SLOT_HOLD_TTL_SECONDS', 300))
+
+
+def active_holds(now=None):
+    """Holds that have not expired yet"""
+    return SlotHold.objects.filter(expires_at__gt=now or timezone.now())
+
+
+def lock_business(business_id):
+    """
+    Serialize slot writes of one business until the transaction ends.
+
+    Only writers of the same business wait on each other; bookings of
+    other businesses proceed concurrently.
+    """
+    list(Business.objects.select_for_update().filter(pk=business_id).values_list('pk', flat=True))
+
+
+def lock_business_of_service(service_id):
+    """Take the business lock of the business owning ``service_id``"""
+    list(
+        Business.objects.select_for_update(of=('self',))
+        .filter(services__id=service_id)
+        .values_list('pk', flat=True)
+    )
+
+
+def reap_expired_holds(now=None):
+    """Delete every expired hold with a single query and return the count"""
+    return SlotHold.objects.filter(expires_at__lte=now or timezone.now()).delete()[0]
+
+
+def invalidate_hold_availability(hold):
+    """Refresh cached availability of the held slot once the transaction commits"""
+    transaction.on_commit(lambda: invalidate_availability(
+        hold.business_id, hold.service_id, hold.booking_date
+    ))
@@ -0,0 +1,159 @@
+# base/leaderboard.py
+"""
+Per-business top customers leaderboard.
+
+``LeaderboardEntry`` keeps every customer's booking count and paid booking
+value per month, moved on booking writes under a row lock. Top customers of
+a window are read from these monthly buckets plus the bookings of the
+window's first, partial month.
+
+The ranking is exact. The first month can only lift the customers booked in
+it, so the candidates are the leaders of the whole months plus the customers
+of the partial month.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .cohorts import add_months, month_start
+from .models import Booking, Customer, LeaderboardEntry
+from .rollups import locked_row
+
+
+def _contribution(state):
+    price = Decimal(str(state['total_price'] or 0))
+    return 1, price if state['is_paid'] else Decimal('0')
+
+
+def apply_leaderboard(business_id, customer_id, month, bookings_delta, value_delta):
+    """Add deltas to one customer month of a business"""
+    with transaction.atomic():
+        entry = locked_row(
+            LeaderboardEntry,
+            {'business_id': business_id, 'customer_id': customer_id, 'month': month},
+            create=bookings_delta > 0 or value_delta > 0
+        )
+        if entry is None:
+            return
+
+        entry.bookings += bookings_delta
+        entry.paid_value += value_delta
+        if entry.bookings:
+            entry.save()
+        else:
+            entry.delete()
+
+
+def sync_leaderboard(previous, current):
+    """
+    Move a booking's count and paid value between customer months.
+
+    ``previous`` and ``current`` are booking field snapshots (``None`` for a
+    booking that did not exist before or no longer exists).
+    """
+    changes = defaultdict(lambda: [0, Decimal('0')])
+    for state, sign in ((previous, -1), (current, 1)):
+        if state:
+            bookings, value = _contribution(state)
+            change = changes[(state['business_id'], state['customer_id'], month_start(state['booking_date']))]
+            change[0] += sign * bookings
+            change[1] += sign * value
+
+    for key, (bookings, value) in sorted(changes.items(), key=lambda item: str(item[0])):
+        if bookings or value:
+            apply_leaderboard(*key, bookings, value)
+
+
+def rebuild_leaderboard(business_ids=None, apps=global_apps):
+    """
+    Rebuild leaderboard entries from the bookings table in bulk.
+
+    Returns the number of entries written. Migrations pass their ``apps``
+    to backfill with historical models.
+    """
+    entry_model = apps.get_model('base', 'LeaderboardEntry')
+    bookings = apps.get_model('base', 'Booking').objects.order_by()
+    if business_ids:
+        bookings = bookings.filter(business_id__in=business_ids)
+
+    rows = bookings.values(
+        'business_id', 'customer_id', month=TruncMonth('booking_date')
+    ).annotate(
+        bookings=Count('id'),
+        paid_value=Sum('total_price', filter=Q(is_paid=True), default=0)
+    )
+    entries = [entry_model(**row) for row in rows.iterator()]
+
+    with transaction.atomic():
+        entry_model.objects.filter(
+            **({'business_id__in': business_ids} if business_ids else {})
+        ).delete()
+        entry_model.objects.bulk_create(entries, batch_size=1000)
+
+    return len(entries)
+
+
+def top_customers(business_id, start_date, limit=10):
+    """
+    Customers with the highest paid booking value booked from ``start_date`` on.
+
+    Returns ``{'id', 'name', 'email', 'bookings', 'total_spent'}`` dicts.
+    """
+    first_month = add_months(month_start(start_date - timedelta(days=1)), 1)
+
+    partial = {}
+    if start_date < first_month:
+        partial = {
+            row['customer_id']: (row['bookings'], row['paid_value'])
+            for row in Booking.objects.filter(
+                business_id=business_id,
+                booking_date__gte=start_date,
+                booking_date__lt=first_month
+            ).order_by().values('customer_id').annotate(
+                bookings=Count('id'),
+                paid_value=Sum('total_price', filter=Q(is_paid=True), default=0)
+            )
+        }
+
+    months = LeaderboardEntry.objects.filter(
+        business_id=business_id,
+        month__gte=first_month
+    ).order_by().values('customer_id').annotate(
+        total_bookings=Sum('bookings'),
+        total_value=Sum('paid_value')
+    )
+    totals = {
+        row['customer_id']: [row['total_bookings'], row['total_value']]
+        for row in months.order_by('-total_value', '-total_bookings', 'customer_id')[:limit]
+    }
+    missing = partial.keys() - totals.keys()
+    if missing:
+        for row in months.filter(customer_id__in=missing):
+            totals[row['customer_id']] = [row['total_bookings'], row['total_value']]
+
+    for customer_id, (bookings, value) in partial.items():
+        total = totals.setdefault(customer_id, [0, Decimal('0')])
+        total[0] += bookings
+        total[1] += value
+
+    ranked = sorted(
+        totals.items(),
+        key=lambda item: (-item[1][1], -item[1][0], str(item[0]))
+    )[:limit]
+    customers = Customer.objects.select_related('user').in_bulk([customer_id for customer_id, _ in ranked])
+
+    return [
+        {
+            'id': str(customer_id),
+            'name': customers[customer_id].user.full_name,
+            'email': customers[customer_id].user.email,
+            'bookings': bookings,
+            'total_spent': float(value or 0)
+        }
+        for customer_id, (bookings, value) in ranked
+    ]
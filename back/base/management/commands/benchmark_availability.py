@@ -0,0 +1,80 @@
+"""
+Management command to compare the scalar and NumPy availability engines
+"""
+import random
+import time as timer
+from datetime import time, timedelta
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from base.availability import open_slots, to_intervals
+from base.vectorized import NUMPY_AVAILABLE, open_slots_range
+
+
+class Command(BaseCommand):
+    help = 'Benchmark slot computation over a synthetic schedule with both availability engines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365, help='Days in the range')
+        parser.add_argument('--bookings', type=int, default=20, help='Bookings per day')
+        parser.add_argument('--duration', type=int, default=30, help='Service duration in minutes')
+        parser.add_argument('--capacity', type=int, default=1, help='Bookings per slot')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per engine (best is reported)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not NUMPY_AVAILABLE:
+            raise CommandError('numpy is not installed')
+
+        rng = random.Random(options['seed'])
+        start = timezone.now().date()
+        days = [start + timedelta(days=offset) for offset in range(options['days'])]
+        weekly_hours = {
+            weekday: SimpleNamespace(opening_time=time(8, 0), closing_time=time(20, 0), is_closed=False)
+            for weekday in range(6)
+        }
+        service = SimpleNamespace(
+            duration_minutes=options['duration'],
+            buffer_time_minutes=0,
+            max_bookings_per_slot=options['capacity']
+        )
+
+        intervals = {}
+        for day in days:
+            ranges = []
+            for _ in range(options['bookings']):
+                minute = rng.randrange(8 * 60, 20 * 60 - options['duration'])
+                end = minute + options['duration']
+                ranges.append((time(minute // 60, minute % 60), time(end // 60, end % 60)))
+            intervals[day] = to_intervals(ranges)
+
+        def scalar():
+            return {
+                day: open_slots(weekly_hours.get(day.weekday()), service, intervals.get(day, []))
+                for day in days
+            }
+
+        def vectorized():
+            return open_slots_range(weekly_hours, service, days, intervals)
+
+        timings = {}
+        results = {}
+        for name, engine in (('python', scalar), ('numpy', vectorized)):
+            best = None
+            for _ in range(options['repeat']):
+                started = timer.perf_counter()
+                results[name] = engine()
+                elapsed = timer.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+            self.stdout.write(f'{name:>7}: {best * 1000:.1f} ms')
+
+        if results['python'] != results['numpy']:
+            raise CommandError('Engines returned different slots')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"NumPy engine is {timings['python'] / timings['numpy']:.1f}x faster "
+            f"over {len(days)} days"
+        ))
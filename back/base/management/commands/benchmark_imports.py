@@ -0,0 +1,88 @@
+"""
+Management command to measure the import cost of starting the base app
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker imports before serving its first request
+STARTUP_CODE = 'import django; django.setup(); import base.urls'
+
+# Packages only some requests need; they must be imported on first use
+LAZY_PACKAGES = ('pandas', 'plotly', 'celery')
+
+
+def parse_importtime(output):
+    """
+    Cumulative import time (us) per module from ``python -X importtime`` output.
+
+    Top-level imports are listed with no indentation; their cumulative times
+    add up to the total.
+    """
+    modules = {}
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+    return modules, total
+
+
+def measure_startup():
+    """Import the base app in a fresh interpreter and parse its import times"""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode:
+        raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+    return parse_importtime(result.stderr)
+
+
+class Command(BaseCommand):
+    help = 'Measure Django startup import time of the base app with python -X importtime'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help='Startups to measure (best is reported)')
+        parser.add_argument('--top', type=int, default=10, help='Packages to list by cumulative time')
+        parser.add_argument('--budget', type=float, help='Fail if startup imports take longer (ms)')
+        parser.add_argument('--lazy', action='append', dest='lazy',
+                            help=f'Package that must not load at startup (repeatable, default: {", ".join(LAZY_PACKAGES)})')
+
+    def handle(self, *args, **options):
+        best = None
+        for _ in range(options['repeat']):
+            modules, total = measure_startup()
+            if best is None or total < best[1]:
+                best = (modules, total)
+        modules, total = best
+
+        packages = defaultdict(int)
+        for name, cumulative in modules.items():
+            if '.' not in name:
+                packages[name] = max(packages[name], cumulative)
+
+        for name, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'{name:>24}: {cumulative / 1000:.1f} ms')
+        self.stdout.write(f"{'base.urls':>24}: {modules.get('base.urls', 0) / 1000:.1f} ms")
+
+        loaded = [name for name in options['lazy'] or LAZY_PACKAGES if name in modules]
+        if loaded:
+            raise CommandError(f'Imported at startup: {", ".join(loaded)}')
+        if options['budget'] is not None and total / 1000 > options['budget']:
+            raise CommandError(f"Startup imports took {total / 1000:.1f} ms (budget {options['budget']:.0f} ms)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Startup imports took {total / 1000:.1f} ms over {len(modules)} modules'
+        ))
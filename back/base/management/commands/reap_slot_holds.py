@@ -0,0 +1,14 @@
+"""
+Management command to delete expired slot holds
+"""
+from django.core.management.base import BaseCommand
+
+from base.holds import reap_expired_holds
+
+
+class Command(BaseCommand):
+    help = 'Delete expired slot holds in bulk'
+    
+    def handle(self, *args, **options):
+        deleted = reap_expired_holds()
+        self.stdout.write(self.style.SUCCESS(f'Reaped {deleted} expired slot holds'))
@@ -0,0 +1,19 @@
+"""
+Management command to backfill or rebuild the weekday x hour booking heatmaps
+"""
+from django.core.management.base import BaseCommand
+
+from base.heatmap import rebuild_heatmaps
+
+
+class Command(BaseCommand):
+    help = 'Rebuild monthly weekday x hour booking heatmaps from the bookings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', dest='businesses',
+                            help='Business UUID (repeatable, default: all businesses)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_heatmaps(business_ids=options['businesses'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} booking heatmaps'))
@@ -0,0 +1,19 @@
+"""
+Management command to backfill or rebuild the monthly customer cohorts
+"""
+from django.core.management.base import BaseCommand
+
+from base.cohorts import rebuild_cohorts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild customer cohorts and the cohort activity matrix from the bookings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', dest='businesses',
+                            help='Business UUID (repeatable, default: all businesses)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_cohorts(business_ids=options['businesses'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} customer cohort memberships'))
@@ -0,0 +1,19 @@
+"""
+Management command to backfill or rebuild the customer HyperLogLog sketches
+"""
+from django.core.management.base import BaseCommand
+
+from base.sketches import rebuild_customer_sketches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild day and month customer sketches from the bookings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', dest='businesses',
+                            help='Business UUID (repeatable, default: all businesses)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_customer_sketches(business_ids=options['businesses'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} customer sketches'))
@@ -0,0 +1,25 @@
+"""
+Management command to backfill or rebuild the daily business rollups
+"""
+from django.core.management.base import BaseCommand
+
+from base.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily business stats from the bookings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', dest='businesses',
+                            help='Business UUID (repeatable, default: all businesses)')
+        parser.add_argument('--start', help='First booking date (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last booking date (YYYY-MM-DD)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_daily_stats(
+            business_ids=options['businesses'],
+            start_date=options['start'],
+            end_date=options['end']
+        )
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} daily stats rows'))
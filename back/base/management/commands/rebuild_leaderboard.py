@@ -0,0 +1,19 @@
+"""
+Management command to backfill or rebuild the top customers leaderboard
+"""
+from django.core.management.base import BaseCommand
+
+from base.leaderboard import rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild monthly customer leaderboard entries from the bookings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', dest='businesses',
+                            help='Business UUID (repeatable, default: all businesses)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_leaderboard(business_ids=options['businesses'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} leaderboard entries'))
@@ -0,0 +1,19 @@
+"""
+Management command to backfill or rebuild the business rating totals
+"""
+from django.core.management.base import BaseCommand
+
+from base.ratings import rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-business review rating totals from the reviews table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--business', action='append', dest='businesses',
+                            help='Business UUID (repeatable, default: all businesses)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_rating_stats(business_ids=options['businesses'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating totals of {count} businesses'))
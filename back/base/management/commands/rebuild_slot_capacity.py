@@ -0,0 +1,31 @@
+"""
+Management command to rebuild per-slot capacity counters from bookings
+"""
+from django.core.management.base import BaseCommand
+
+from base.cache import invalidate_service_availability
+from base.capacity import rebuild_slot_capacity
+from base.models import Service
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-slot capacity counters from the bookings table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--service', action='append', dest='services',
+                            help='Service UUID (repeatable, default: all services)')
+        parser.add_argument('--start', help='First booking date (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last booking date (YYYY-MM-DD)')
+    
+    def handle(self, *args, **options):
+        count = rebuild_slot_capacity(
+            service_ids=options['services'],
+            start_date=options['start'],
+            end_date=options['end']
+        )
+        
+        service_ids = options['services'] or Service.objects.values_list('id', flat=True)
+        for service_id in service_ids:
+            invalidate_service_availability(service_id)
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} slot capacity counters'))
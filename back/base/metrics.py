@@ -0,0 +1,82 @@
+# base/metrics.py
+"""
+Booking metrics query layer.
+
+Analytics endpoints ask for several metrics over several time windows
+(current period, previous period, all time, ...). Every (window, metric)
+pair becomes a filtered ``Count``/``Sum``/``Avg`` expression, and all of them
+are computed together in a single ``aggregate()`` over the business' bookings.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Avg, Count, Q, Sum
+
+from .models import Booking
+from .stats import REVENUE_STATUSES
+
+PAID = Q(is_paid=True)
+REALIZED = Q(status__in=REVENUE_STATUSES)
+
+# Metric name -> aggregate factory taking the window's filter
+BOOKING_METRICS = {
+    'bookings': lambda window: Count('id', filter=window),
+    'confirmed_bookings': lambda window: Count('id', filter=window & REALIZED),
+    'paid_bookings': lambda window: Count('id', filter=window & PAID),
+    'revenue': lambda window: Sum('total_price', filter=window & PAID & REALIZED, default=0),
+    'paid_revenue': lambda window: Sum('total_price', filter=window & PAID, default=0),
+    'average_paid_value': lambda window: Avg('total_price', filter=window & PAID, default=0),
+    'customers': lambda window: Count('customer', filter=window, distinct=True),
+}
+
+
+def created_between(start, end=None):
+    """Window of bookings created in [start, end)"""
+    window = Q(created_at__gte=start)
+    if end is not None:
+        window &= Q(created_at__lt=end)
+    return window
+
+
+def booked_between(start, end=None):
+    """Window of bookings taking place from ``start`` to ``end`` inclusive"""
+    window = Q(booking_date__gte=start)
+    if end is not None:
+        window &= Q(booking_date__lte=end)
+    return window
+
+
+def booking_metrics(business, windows):
+    """
+    Compute booking metrics of a business over several windows in one query.
+
+    ``windows`` maps a window name to ``(filter, metric names)``, where the
+    filter is a ``Q`` on Booking (``Q()`` for all bookings) and the names are
+    keys of ``BOOKING_METRICS``. Returns ``{window: {metric: value}}``.
+    """
+    aggregates = {}
+    aliases = {}
+    for window, (condition, metrics) in windows.items():
+        for metric in metrics:
+            alias = f'{window}_{metric}'
+            aggregates[alias] = BOOKING_METRICS[metric](condition)
+            aliases[alias] = (window, metric)
+
+    bookings = Booking.objects.filter(business=business)
+    conditions = [condition for condition, _ in windows.values()]
+    if all(conditions):
+        # Only scan bookings that fall in at least one window
+        bookings = bookings.filter(reduce(or_, conditions))
+
+    results = {window: {} for window in windows}
+    for alias, value in bookings.aggregate(**aggregates).items():
+        window, metric = aliases[alias]
+        results[window][metric] = value
+    return results
+
+
+def percent_change(current, previous):
+    """Percentage change from ``previous`` to ``current`` (0 without a baseline)"""
+    if not previous:
+        return 0
+    return (float(current) - float(previous)) / max(float(previous), 1) * 100
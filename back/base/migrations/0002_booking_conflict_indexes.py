@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['business', 'booking_date', 'start_time'], name='booking_business_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['service', 'booking_date'], name='booking_service_day_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_slot_capacity(apps, schema_editor):
+    Booking = apps.get_model('base', 'Booking')
+    SlotCapacity = apps.get_model('base', 'SlotCapacity')
+
+    totals = (
+        Booking.objects.filter(status__in=['pending', 'confirmed'])
+        .order_by()
+        .values('service_id', 'booking_date', 'start_time')
+        .annotate(booked=Count('id'), end_time=Max('end_time'))
+    )
+    SlotCapacity.objects.bulk_create(
+        [SlotCapacity(**row) for row in totals.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_slot_holds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotCapacity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('booked', models.IntegerField(default=0)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_capacities', to='base.service')),
+            ],
+            options={
+                'db_table': 'slot_capacities',
+                'ordering': ['booking_date', 'start_time'],
+                'unique_together': {('service', 'booking_date', 'start_time')},
+            },
+        ),
+        migrations.RunPython(backfill_slot_capacity, migrations.RunPython.noop),
+    ]
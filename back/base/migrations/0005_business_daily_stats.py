@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from base.stats import rebuild_daily_stats
+
+
+def backfill_daily_stats(apps, schema_editor):
+    rebuild_daily_stats(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0004_slot_capacity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_bookings', models.IntegerField(default=0)),
+                ('pending_bookings', models.IntegerField(default=0)),
+                ('confirmed_bookings', models.IntegerField(default=0)),
+                ('completed_bookings', models.IntegerField(default=0)),
+                ('cancelled_bookings', models.IntegerField(default=0)),
+                ('no_show_bookings', models.IntegerField(default=0)),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('confirmed_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('new_customers', models.IntegerField(default=0)),
+                ('returning_customers', models.IntegerField(default=0)),
+                ('bookings_by_hour', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='base.business')),
+            ],
+            options={
+                'verbose_name_plural': 'Business daily stats',
+                'db_table': 'business_daily_stats',
+                'ordering': ['date'],
+                'unique_together': {('business', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from base.cohorts import rebuild_cohorts
+
+
+def backfill_cohorts(apps, schema_editor):
+    rebuild_cohorts(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0005_business_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cohort_month', models.DateField()),
+                ('month', models.DateField()),
+                ('active_customers', models.IntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cohort_activity', to='base.business')),
+            ],
+            options={
+                'verbose_name_plural': 'Cohort activity',
+                'db_table': 'cohort_activity',
+                'ordering': ['cohort_month', 'month'],
+                'unique_together': {('business', 'cohort_month', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomerCohort',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cohort_month', models.DateField()),
+                ('total_bookings', models.IntegerField(default=0)),
+                ('bookings_by_month', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='customer_cohorts', to='base.business')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='business_cohorts', to='base.customer')),
+            ],
+            options={
+                'db_table': 'customer_cohorts',
+                'indexes': [models.Index(fields=['business', 'cohort_month'], name='customer_co_busines_defc8f_idx')],
+                'unique_together': {('business', 'customer')},
+            },
+        ),
+        migrations.RunPython(backfill_cohorts, migrations.RunPython.noop),
+    ]
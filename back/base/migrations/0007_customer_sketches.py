@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from base.sketches import rebuild_customer_sketches
+
+
+def backfill_customer_sketches(apps, schema_editor):
+    rebuild_customer_sketches(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0006_customer_cohorts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('month', 'Month')], max_length=5)),
+                ('start_date', models.DateField()),
+                ('registers', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='customer_sketches', to='base.business')),
+            ],
+            options={
+                'db_table': 'customer_sketches',
+                'unique_together': {('business', 'period', 'start_date')},
+            },
+        ),
+        migrations.RunPython(backfill_customer_sketches, migrations.RunPython.noop),
+    ]
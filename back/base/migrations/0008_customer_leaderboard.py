@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from base.leaderboard import rebuild_leaderboard
+
+
+def backfill_leaderboard(apps, schema_editor):
+    rebuild_leaderboard(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0007_customer_sketches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('bookings', models.IntegerField(default=0)),
+                ('paid_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='base.business')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='base.customer')),
+            ],
+            options={
+                'verbose_name_plural': 'Leaderboard entries',
+                'db_table': 'customer_leaderboard',
+                'indexes': [models.Index(fields=['business', 'month'], name='customer_le_busines_0e7128_idx')],
+                'unique_together': {('business', 'customer', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_leaderboard, migrations.RunPython.noop),
+    ]
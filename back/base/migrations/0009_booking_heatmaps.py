@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from base.heatmap import rebuild_heatmaps
+
+
+def backfill_heatmaps(apps, schema_editor):
+    rebuild_heatmaps(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_customer_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingHeatmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('counts', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_heatmaps', to='base.business')),
+            ],
+            options={
+                'db_table': 'booking_heatmaps',
+                'ordering': ['month'],
+                'unique_together': {('business', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_heatmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_rating_stats(apps, schema_editor):
+    Review = apps.get_model('base', 'Review')
+    BusinessRatingStats = apps.get_model('base', 'BusinessRatingStats')
+
+    totals = Review.objects.order_by().values('business_id').annotate(
+        rating_sum=Sum('rating'),
+        rating_count=Count('id'),
+        **{f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in range(1, 6)}
+    )
+    BusinessRatingStats.objects.bulk_create(
+        [BusinessRatingStats(**row) for row in totals.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0009_booking_heatmaps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingStats',
+            fields=[
+                ('business', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to='base.business')),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Business rating stats',
+                'db_table': 'business_rating_stats',
+            },
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -191,11 +191,237 @@ class Booking(models.Model):
     class Meta:
         db_table = 'bookings'
         ordering = ['-booking_date', '-start_time']
+        indexes = [
+            models.Index(fields=['business', 'booking_date', 'start_time'], name='booking_business_day_idx'),
+            models.Index(fields=['service', 'booking_date'], name='booking_service_day_idx'),
+            # Keyset pages of ``-booking_date, -start_time, id``
+            models.Index(fields=['business', '-booking_date', '-start_time', 'id'], name='booking_business_page_idx'),
+            models.Index(fields=['customer', '-booking_date', '-start_time', 'id'], name='booking_customer_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.customer.user.email} - {self.service.name} - {self.booking_date}"
 
 
+class SlotCapacity(models.Model):
+    """Pending/confirmed bookings per service slot, maintained on booking writes"""
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='slot_capacities')
+    booking_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    booked = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'slot_capacities'
+        unique_together = ['service', 'booking_date', 'start_time']
+        ordering = ['booking_date', 'start_time']
+    
+    def __str__(self):
+        return f"{self.service_id} - {self.booking_date} {self.start_time} ({self.booked})"
+
+
+class SlotHold(models.Model):
+    """Short-lived reservation of a slot while a customer completes a booking"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='slot_holds')
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='slot_holds')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='slot_holds')
+    
+    booking_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'slot_holds'
+        ordering = ['expires_at']
+        indexes = [
+            models.Index(fields=['business', 'booking_date', 'start_time'], name='hold_business_day_idx'),
+            models.Index(fields=['service', 'booking_date'], name='hold_service_day_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.service.name} - {self.booking_date} {self.start_time}"
+    
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+class BusinessDailyStats(models.Model):
+    """Per-day booking rollup of a business, maintained on booking writes"""
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+
+    # Bookings by status
+    total_bookings = models.IntegerField(default=0)
+    pending_bookings = models.IntegerField(default=0)
+    confirmed_bookings = models.IntegerField(default=0)
+    completed_bookings = models.IntegerField(default=0)
+    cancelled_bookings = models.IntegerField(default=0)
+    no_show_bookings = models.IntegerField(default=0)
+
+    # Revenue of paid bookings, in total and for confirmed/completed ones only
+    paid_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    confirmed_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    # Bookings that are the customer's first with the business, and the rest
+    new_customers = models.IntegerField(default=0)
+    returning_customers = models.IntegerField(default=0)
+
+    # Start hour ("0".."23") -> number of bookings
+    bookings_by_hour = models.JSONField(default=dict)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'business_daily_stats'
+        unique_together = ['business', 'date']
+        ordering = ['date']
+        verbose_name_plural = 'Business daily stats'
+
+    def __str__(self):
+        return f"{self.business.name} - {self.date}"
+
+
+class CustomerCohort(models.Model):
+    """
+    A customer's booking activity with a business, maintained on booking writes.
+    
+    The cohort is the month of the customer's first booking with the business.
+    """
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='customer_cohorts')
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='business_cohorts')
+    cohort_month = models.DateField()
+    total_bookings = models.IntegerField(default=0)
+
+    # First day of a month ("YYYY-MM-DD") -> number of bookings in it
+    bookings_by_month = models.JSONField(default=dict)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'customer_cohorts'
+        unique_together = ['business', 'customer']
+        indexes = [
+            models.Index(fields=['business', 'cohort_month']),
+        ]
+
+    def __str__(self):
+        return f"{self.customer} - {self.business.name} ({self.cohort_month:%Y-%m})"
+
+
+class CohortActivity(models.Model):
+    """Customers of one cohort of a business active (booked) in one month"""
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='cohort_activity')
+    cohort_month = models.DateField()
+    month = models.DateField()
+    active_customers = models.IntegerField(default=0)
+    bookings = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'cohort_activity'
+        unique_together = ['business', 'cohort_month', 'month']
+        ordering = ['cohort_month', 'month']
+        verbose_name_plural = 'Cohort activity'
+
+    def __str__(self):
+        return f"{self.business.name} - {self.cohort_month:%Y-%m} in {self.month:%Y-%m}"
+
+
+class CustomerSketch(models.Model):
+    """HyperLogLog sketch of the customers booked on a day or in a month of a business"""
+    PERIOD_CHOICES = [
+        ('day', 'Day'),
+        ('month', 'Month'),
+    ]
+    
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='customer_sketches')
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    start_date = models.DateField()
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'customer_sketches'
+        unique_together = ['business', 'period', 'start_date']
+
+    def __str__(self):
+        return f"{self.business.name} - {self.period} of {self.start_date}"
+
+
+class LeaderboardEntry(models.Model):
+    """Bookings and paid value of a customer with a business in one month"""
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='leaderboard')
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    month = models.DateField()
+    bookings = models.IntegerField(default=0)
+    paid_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'customer_leaderboard'
+        unique_together = ['business', 'customer', 'month']
+        indexes = [
+            models.Index(fields=['business', 'month']),
+        ]
+        verbose_name_plural = 'Leaderboard entries'
+
+    def __str__(self):
+        return f"{self.customer} - {self.business.name} ({self.month:%Y-%m})"
+
+
+class BookingHeatmap(models.Model):
+    """Bookings of a business in one month by weekday and start hour, maintained on booking writes"""
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='booking_heatmaps')
+    month = models.DateField()
+
+    # 7 rows (Monday first) of 24 hourly booking counts
+    counts = models.JSONField(default=list)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'booking_heatmaps'
+        unique_together = ['business', 'month']
+        ordering = ['month']
+
+    def __str__(self):
+        return f"{self.business.name} - {self.month:%Y-%m}"
+
+
+class BusinessRatingStats(models.Model):
+    """Review rating totals of a business, maintained on review writes"""
+    business = models.OneToOneField(
+        Business, on_delete=models.CASCADE, primary_key=True, related_name='rating_stats'
+    )
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+
+    # Number of reviews with each rating
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'business_rating_stats'
+        verbose_name_plural = 'Business rating stats'
+
+    def __str__(self):
+        return f"{self.business.name} - {self.rating_count} reviews"
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else 0
+
+    @property
+    def histogram(self):
+        return {rating: getattr(self, f'rating_{rating}') for rating in range(1, 6)}
+
+
 class Review(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='reviews')
@@ -221,6 +447,9 @@ class Review(models.Model):
         db_table = 'reviews'
         ordering = ['-created_at']
         unique_together = ['customer', 'booking']
+        indexes = [
+            models.Index(fields=['business', '-created_at', 'id'], name='review_business_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.customer.user.email} - {self.business.name} - {self.rating}★"
@@ -264,6 +493,9 @@ class Notification(models.Model):
     class Meta:
         db_table = 'notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', 'id'], name='notification_user_page_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.title}"
\ No newline at end of file
@@ -0,0 +1,133 @@
+# base/pagination.py
+"""
+Page number pagination with opt-in keyset pages.
+
+Lists are paginated by page number. Passing ``?pagination=cursor`` switches
+a request to keyset pagination: each page is read with a WHERE on the last
+row's ordering values instead of an OFFSET, and no COUNT runs, so deep pages
+cost the same as the first one given an index matching the ordering.
+
+The key is the queryset's ordering with the primary key appended as a
+tie-breaker. Ordering fields must be non-null model fields.
+"""
+import base64
+import json
+from datetime import date, datetime, time
+from uuid import UUID
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_ordering(queryset):
+    """Ordering of ``queryset`` as field names ending with the primary key"""
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    if any(not isinstance(field, str) for field in ordering):
+        raise ValidationError({'pagination': 'This ordering does not support cursor pagination'})
+
+    names = {field.lstrip('-') for field in ordering}
+    if not names & {'pk', 'id', queryset.model._meta.pk.name}:
+        ordering.append('pk')
+    return ordering
+
+
+def _model_field(model, path):
+    for name in path.lstrip('-').split('__'):
+        field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        model = field.related_model
+    return field
+
+
+def _value(instance, field):
+    value = instance
+    for name in field.lstrip('-').split('__'):
+        value = getattr(value, name)
+    return value
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def rows_after(ordering, position):
+    """Filter on the rows following ``position`` (ordering values) in ``ordering``"""
+    after = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        ties = {prior.lstrip('-'): value for prior, value in zip(ordering[:index], position)}
+        after |= Q(**ties, **{f'{name}__{lookup}': position[index]})
+    return after
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page number pagination, or keyset pages with ``?pagination=cursor``.
+
+    Keyset responses are ``{'next', 'results'}``; ``next`` carries an opaque
+    ``cursor`` parameter and is ``None`` on the last page.
+    """
+    pagination_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = request.query_params.get(self.pagination_query_param) == 'cursor'
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = keyset_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(rows_after(ordering, self.decode_cursor(cursor, queryset.model, ordering)))
+
+        rows = list(queryset[:page_size + 1])
+        page = rows[:page_size]
+        self.next_position = None
+        if len(rows) > page_size:
+            self.next_position = [_encode(_value(page[-1], field)) for field in ordering]
+        return page
+
+    def decode_cursor(self, cursor, model, ordering):
+        """Ordering values of ``cursor``, converted by their model fields"""
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(position, list) or len(position) != len(ordering):
+                raise ValueError(cursor)
+            return [
+                _model_field(model, field).to_python(value)
+                for field, value in zip(ordering, position)
+            ]
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({'next': self.get_next_link(), 'results': data})
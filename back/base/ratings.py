@@ -0,0 +1,109 @@
+# base/ratings.py
+"""
+Per-business review rating totals.
+
+``BusinessRatingStats`` holds the sum and count of a business' review
+ratings and the number of reviews per rating. Review writes adjust them
+atomically with F-expressions, so average ratings are read from one row
+instead of aggregating reviews.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, FloatField, Q, Sum, When
+from django.db.models.functions import Cast
+
+from .models import BusinessRatingStats, Review
+
+RATINGS = range(1, 6)
+
+# Average rating of the businesses of a queryset, NULL without reviews
+AVERAGE_RATING = Case(
+    When(
+        rating_stats__rating_count__gt=0,
+        then=Cast('rating_stats__rating_sum', FloatField()) / F('rating_stats__rating_count')
+    ),
+    output_field=FloatField()
+)
+
+
+def _contribution(state):
+    if not state:
+        return {}
+    return {'rating_sum': state['rating'], 'rating_count': 1, f"rating_{state['rating']}": 1}
+
+
+def adjust_rating_stats(business_id, deltas):
+    """Atomically add counter deltas to the rating totals of a business"""
+    stats = BusinessRatingStats.objects.filter(business_id=business_id)
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if stats.update(**updates):
+        return
+    if min(deltas.values()) < 0:
+        # Totals are only created by additions. A missing row was deleted
+        # along with its business, or is left to rebuild_rating_stats
+        return
+
+    try:
+        with transaction.atomic():
+            BusinessRatingStats.objects.create(business_id=business_id, **deltas)
+    except IntegrityError:
+        # Created concurrently - fall back to the atomic increment
+        stats.update(**updates)
+
+
+def sync_rating_stats(previous, current):
+    """
+    Move a review's rating between rating totals.
+
+    ``previous`` and ``current`` are review field snapshots (``None`` for a
+    review that did not exist before or no longer exists).
+    """
+    if previous == current:
+        return
+
+    changes = {}
+    for state, sign in ((previous, -1), (current, 1)):
+        if state:
+            deltas = changes.setdefault(state['business_id'], {})
+            for field, delta in _contribution(state).items():
+                deltas[field] = deltas.get(field, 0) + sign * delta
+
+    for business_id, deltas in changes.items():
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            adjust_rating_stats(business_id, deltas)
+
+
+def rebuild_rating_stats(business_ids=None):
+    """
+    Rebuild rating totals from the reviews table in bulk.
+
+    Returns the number of businesses written.
+    """
+    reviews = Review.objects.order_by()
+    if business_ids:
+        reviews = reviews.filter(business_id__in=business_ids)
+
+    totals = reviews.values('business_id').annotate(
+        rating_sum=Sum('rating'),
+        rating_count=Count('id'),
+        **{f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in RATINGS}
+    )
+
+    with transaction.atomic():
+        BusinessRatingStats.objects.filter(
+            **({'business_id__in': business_ids} if business_ids else {})
+        ).delete()
+        stats = BusinessRatingStats.objects.bulk_create(
+            [BusinessRatingStats(**row) for row in totals.iterator()],
+            batch_size=1000
+        )
+
+    return len(stats)
+
+
+def business_rating_stats(business):
+    """Stored rating totals of a business (empty totals without reviews)"""
+    try:
+        return business.rating_stats
+    except BusinessRatingStats.DoesNotExist:
+        return BusinessRatingStats(business=business)
@@ -0,0 +1,26 @@
+# base/rollups.py
+"""
+Row access shared by the incrementally maintained rollup tables.
+
+Deleting a business or customer deletes its rollup rows before the delete
+signals of its bookings run, so removing a booking must never create a row:
+a missing one is already gone with its owner and has nothing to take away.
+"""
+
+
+def has_additions(*deltas):
+    """Whether any of the ``{key: delta}`` mappings adds to a row"""
+    return any(delta > 0 for mapping in deltas for delta in mapping.values())
+
+
+def locked_row(model, lookup, create, defaults=None):
+    """
+    Lock and return the ``model`` row matching ``lookup``.
+
+    A missing row is created with ``defaults`` when ``create`` is set and
+    ``None`` is returned otherwise.
+    """
+    rows = model.objects.select_for_update()
+    if create:
+        return rows.get_or_create(**lookup, defaults=defaults or {})[0]
+    return rows.filter(**lookup).first()
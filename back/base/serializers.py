@@ -1,10 +1,140 @@
 # base/serializers.py
 from rest_framework import serializers
+from django.db.models import F, Prefetch, Value
 from .models import (
     Business, BusinessHours, Service, Customer, 
-    Booking, Review, Notification
+    Booking, Review, Notification, SlotCapacity, SlotHold
 )
-from accounts.serializers import UserSerializer
+from .availability import BLOCKING_STATUSES
+from .holds import active_holds
+from .ratings import business_rating_stats
+from accounts.serializers import UserSerializer, UserSummarySerializer
+
+
+def validate_slot(business, service, booking_date, start_time, end_time, exclude_booking=None):
+    """
+    Validate that a service can be booked at the given date and time.
+    
+    Checks the date is in the future, the duration matches the service, the
+    slot is within business hours and that no conflicting booking or hold
+    exists. Raises ``serializers.ValidationError`` otherwise.
+    """
+    from datetime import datetime
+    from django.utils import timezone
+    
+    # Validate booking is not in the past
+    now = timezone.now()
+    booking_datetime = timezone.make_aware(datetime.combine(booking_date, start_time))
+    
+    if booking_datetime <= now:
+        raise serializers.ValidationError({
+            'booking_date': 'Cannot book appointments in the past'
+        })
+    
+    # Validate end time is after start time
+    if end_time <= start_time:
+        raise serializers.ValidationError({
+            'end_time': 'End time must be after start time'
+        })
+    
+    # Calculate duration and validate against service duration
+    duration_minutes = (datetime.combine(booking_date, end_time) - 
+                      datetime.combine(booking_date, start_time)).total_seconds() / 60
+    
+    if abs(duration_minutes - service.duration_minutes) > 5:  # 5 minute tolerance
+        raise serializers.ValidationError({
+            'end_time': f'Booking duration must match service duration ({service.duration_minutes} minutes)'
+        })
+    
+    # Validate business hours
+    weekday = booking_date.weekday()
+    business_hours = business.hours.filter(weekday=weekday, is_closed=False).first()
+    
+    if not business_hours:
+        raise serializers.ValidationError({
+            'booking_date': 'Business is closed on this day'
+        })
+    
+    if start_time < business_hours.opening_time or end_time > business_hours.closing_time:
+        raise serializers.ValidationError({
+            'start_time': f'Booking must be within business hours ({business_hours.opening_time} - {business_hours.closing_time})'
+        })
+    
+    # Other services' bookings, active holds and this service's slot counters
+    # overlapping the requested interval, fetched with one indexed UNION query
+    other_bookings = Booking.objects.filter(
+        business=business,
+        booking_date=booking_date,
+        status__in=BLOCKING_STATUSES,
+        start_time__lt=end_time,
+        end_time__gt=start_time
+    ).exclude(service=service)
+    
+    # Exclude current booking if this is an update
+    if exclude_booking is not None:
+        other_bookings = other_bookings.exclude(id=exclude_booking.id)
+    
+    counters = SlotCapacity.objects.filter(
+        service=service,
+        booking_date=booking_date,
+        booked__gt=0,
+        start_time__lt=end_time,
+        end_time__gt=start_time
+    )
+    
+    # Active holds occupy slots just like bookings
+    holds = active_holds().filter(
+        business=business,
+        booking_date=booking_date,
+        start_time__lt=end_time,
+        end_time__gt=start_time
+    )
+    
+    fields = ('service_id', 'start_time', 'end_time', 'places')
+    overlapping = list(
+        other_bookings.order_by().annotate(places=Value(1)).values_list(*fields).union(
+            counters.order_by().annotate(places=F('booked')).values_list(*fields),
+            holds.order_by().annotate(places=Value(1)).values_list(*fields),
+            all=True
+        ).order_by('start_time')
+    )
+    
+    # Bookings of other services conflict outright
+    conflicts = [
+        f'Time slot conflicts with existing booking ({existing_start} - {existing_end})'
+        for existing_service_id, existing_start, existing_end, places in overlapping
+        if existing_service_id != service.id
+    ]
+    if conflicts:
+        raise serializers.ValidationError({'start_time': conflicts})
+    
+    # Bookings and holds of the same service share its per-slot capacity
+    booked = sum(places for _, _, _, places in overlapping)
+    
+    # The counters still include the booking being updated
+    if (exclude_booking is not None
+            and exclude_booking.status in BLOCKING_STATUSES
+            and exclude_booking.service_id == service.id
+            and exclude_booking.booking_date == booking_date
+            and exclude_booking.start_time < end_time
+            and exclude_booking.end_time > start_time):
+        booked -= 1
+    
+    if booked >= service.max_bookings_per_slot:
+        raise serializers.ValidationError({
+            'start_time': 'This time slot is fully booked for this service'
+        })
+
+
+class SparseFieldsMixin:
+    """Serializer accepting ``fields`` to only include some of its fields"""
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 
 class BusinessHoursSerializer(serializers.ModelSerializer):
     weekday_display = serializers.CharField(source='get_weekday_display', read_only=True)
@@ -32,6 +162,7 @@ class BusinessSerializer(serializers.ModelSerializer):
     services = ServiceSerializer(many=True, read_only=True)
     average_rating = serializers.SerializerMethodField()
     total_reviews = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
     
     class Meta:
         model = Business
@@ -40,17 +171,24 @@ class BusinessSerializer(serializers.ModelSerializer):
                  'postal_code', 'category', 'logo', 'cover_image', 'qr_code',
                  'is_active', 'accepts_online_bookings', 'auto_confirm_bookings',
                  'hours', 'services', 'average_rating', 'total_reviews',
-                 'created_at', 'updated_at']
+                 'rating_histogram', 'created_at', 'updated_at']
         read_only_fields = ['id', 'owner', 'qr_code', 'created_at', 'updated_at']
     
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of businesses at ``prefix`` with ``queryset``"""
+        return queryset.select_related(f'{prefix}owner', f'{prefix}rating_stats').prefetch_related(
+            f'{prefix}hours', f'{prefix}services'
+        )
+    
     def get_average_rating(self, obj):
-        reviews = obj.reviews.all()
-        if reviews:
-            return round(sum(r.rating for r in reviews) / len(reviews), 1)
-        return 0
+        return round(business_rating_stats(obj).average_rating, 1)
     
     def get_total_reviews(self, obj):
-        return obj.reviews.count()
+        return business_rating_stats(obj).rating_count
+    
+    def get_rating_histogram(self, obj):
+        return business_rating_stats(obj).histogram
 
 
 class CustomerSerializer(serializers.ModelSerializer):
@@ -64,6 +202,14 @@ class CustomerSerializer(serializers.ModelSerializer):
                  'receive_marketing_emails', 'total_bookings', 
                  'total_spent', 'created_at']
         read_only_fields = ['id', 'user', 'total_bookings', 'total_spent', 'created_at']
+    
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of customers at ``prefix`` with ``queryset``"""
+        return queryset.select_related(f'{prefix}user').prefetch_related(Prefetch(
+            f'{prefix}preferred_businesses',
+            queryset=BusinessSerializer.eager_load(Business.objects.all())
+        ))
 
 
 class BookingSerializer(serializers.ModelSerializer):
@@ -81,14 +227,17 @@ class BookingSerializer(serializers.ModelSerializer):
                  'created_at', 'updated_at']
         read_only_fields = ['id', 'customer', 'total_price', 'created_at', 'updated_at']
     
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of bookings at ``prefix`` with ``queryset``"""
+        queryset = queryset.select_related(f'{prefix}service')
+        queryset = BusinessSerializer.eager_load(queryset, f'{prefix}business__')
+        return CustomerSerializer.eager_load(queryset, f'{prefix}customer__')
+    
     def validate(self, attrs):
         """
         Validate booking data and associate business and service instances
         """
-        from django.shortcuts import get_object_or_404
-        from django.core.exceptions import ValidationError
-        from datetime import datetime, time
-        
         # Get business and service instances from UUIDs
         business_id = attrs.get('business_id')
         service_id = attrs.get('service_id')
@@ -111,7 +260,7 @@ class BookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({'service_id': 'Invalid or inactive service'})
         
         # Validate service belongs to business
-        if service.business != business:
+        if service.business_id != business.id:
             raise serializers.ValidationError({
                 'service_id': 'Service does not belong to the specified business'
             })
@@ -128,75 +277,101 @@ class BookingSerializer(serializers.ModelSerializer):
         if not end_time:
             raise serializers.ValidationError({'end_time': 'End time is required'})
         
-        # Validate booking is not in the past
-        from django.utils import timezone
-        now = timezone.now()
-        booking_datetime = datetime.combine(booking_date, start_time)
-        
-        if booking_datetime <= now:
-            raise serializers.ValidationError({
-                'booking_date': 'Cannot book appointments in the past'
-            })
-        
-        # Validate end time is after start time
-        if end_time <= start_time:
-            raise serializers.ValidationError({
-                'end_time': 'End time must be after start time'
-            })
-        
-        # Calculate duration and validate against service duration
-        duration_minutes = (datetime.combine(booking_date, end_time) - 
-                          datetime.combine(booking_date, start_time)).total_seconds() / 60
-        
-        if abs(duration_minutes - service.duration_minutes) > 5:  # 5 minute tolerance
-            raise serializers.ValidationError({
-                'end_time': f'Booking duration must match service duration ({service.duration_minutes} minutes)'
-            })
-        
-        # Validate business hours
-        weekday = booking_date.weekday()
-        business_hours = business.hours.filter(weekday=weekday, is_closed=False).first()
-        
-        if not business_hours:
-            raise serializers.ValidationError({
-                'booking_date': 'Business is closed on this day'
-            })
-        
-        if start_time < business_hours.opening_time or end_time > business_hours.closing_time:
-            raise serializers.ValidationError({
-                'start_time': f'Booking must be within business hours ({business_hours.opening_time} - {business_hours.closing_time})'
-            })
-        
-        # Check for booking conflicts (excluding current booking for updates)
-        existing_bookings = Booking.objects.filter(
-            business=business,
-            booking_date=booking_date,
-            status__in=['pending', 'confirmed']
+        validate_slot(
+            business, service, booking_date, start_time, end_time,
+            exclude_booking=self.instance
         )
         
-        # Exclude current booking if this is an update
-        if self.instance:
-            existing_bookings = existing_bookings.exclude(id=self.instance.id)
+        return attrs
+
+
+class BusinessSummarySerializer(serializers.ModelSerializer):
+    """Display fields of a business embedded in list responses"""
+    
+    class Meta:
+        model = Business
+        fields = ['id', 'name', 'slug', 'logo', 'address', 'city', 'category']
+        read_only_fields = fields
+
+
+class ServiceSummarySerializer(serializers.ModelSerializer):
+    """Display fields of a service embedded in list responses"""
+    
+    class Meta:
+        model = Service
+        fields = ['id', 'name', 'description', 'duration_minutes', 'price']
+        read_only_fields = fields
+
+
+class CustomerSummarySerializer(serializers.ModelSerializer):
+    """Display fields of a customer embedded in list responses"""
+    user = UserSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = Customer
+        fields = ['id', 'user', 'phone', 'total_bookings']
+        read_only_fields = fields
+
+
+class BookingListSerializer(SparseFieldsMixin, BookingSerializer):
+    """
+    Compact booking representation for list responses.
+    
+    Related objects are reduced to IDs and display fields, all loaded by
+    ``select_related``; pass ``fields`` for a sparse subset.
+    """
+    business = BusinessSummarySerializer(read_only=True)
+    customer = CustomerSummarySerializer(read_only=True)
+    service = ServiceSummarySerializer(read_only=True)
+    
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of bookings at ``prefix`` with ``queryset``"""
+        return queryset.select_related(f'{prefix}business', f'{prefix}service', f'{prefix}customer__user')
+
+
+class SlotHoldSerializer(serializers.ModelSerializer):
+    service_id = serializers.UUIDField(write_only=True)
+    service = ServiceSerializer(read_only=True)
+    
+    class Meta:
+        model = SlotHold
+        fields = ['id', 'business', 'service', 'service_id', 'booking_date',
+                 'start_time', 'end_time', 'expires_at', 'created_at']
+        read_only_fields = ['id', 'business', 'end_time', 'expires_at', 'created_at']
+    
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of slot holds at ``prefix`` with ``queryset``"""
+        return queryset.select_related(f'{prefix}service')
+    
+    def validate(self, attrs):
+        """
+        Validate the held slot and derive business and end time from the service
+        """
+        from datetime import datetime, timedelta
         
-        for existing in existing_bookings:
-            # Check for time overlap
-            if (start_time < existing.end_time and end_time > existing.start_time):
-                raise serializers.ValidationError({
-                    'start_time': f'Time slot conflicts with existing booking ({existing.start_time} - {existing.end_time})'
-                })
+        try:
+            service = Service.objects.select_related('business').get(
+                id=attrs['service_id'],
+                is_active=True,
+                business__is_active=True
+            )
+        except Service.DoesNotExist:
+            raise serializers.ValidationError({'service_id': 'Invalid or inactive service'})
         
-        # Check service capacity
-        overlapping_bookings = existing_bookings.filter(
-            service=service,
-            start_time__lt=end_time,
-            end_time__gt=start_time
-        ).count()
+        booking_date = attrs['booking_date']
+        start_time = attrs['start_time']
+        end = datetime.combine(booking_date, start_time) + timedelta(minutes=service.duration_minutes)
+        if end.date() != booking_date:
+            raise serializers.ValidationError({'start_time': 'Slot must end on the same day'})
         
-        if overlapping_bookings >= service.max_bookings_per_slot:
-            raise serializers.ValidationError({
-                'start_time': 'This time slot is fully booked for this service'
-            })
+        validate_slot(service.business, service, booking_date, start_time, end.time())
         
+        attrs.pop('service_id')
+        attrs['service'] = service
+        attrs['business'] = service.business
+        attrs['end_time'] = end.time()
         return attrs
 
 
@@ -213,6 +388,12 @@ class ReviewSerializer(serializers.ModelSerializer):
                  'business_response', 'response_date', 'created_at']
         read_only_fields = ['id', 'customer', 'is_verified', 'is_featured', 
                           'business_response', 'response_date', 'created_at']
+    
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of reviews at ``prefix`` with ``queryset``"""
+        queryset = CustomerSerializer.eager_load(queryset, f'{prefix}customer__')
+        return BusinessSerializer.eager_load(queryset, f'{prefix}business__')
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -225,17 +406,35 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'type', 'title', 'message', 'booking', 
                  'business', 'is_read', 'read_at', 'created_at']
         read_only_fields = ['id', 'user', 'created_at']
+    
+    @staticmethod
+    def eager_load(queryset, prefix=''):
+        """Load what this serializer reads of notifications at ``prefix`` with ``queryset``"""
+        queryset = queryset.select_related(f'{prefix}user')
+        queryset = BookingSerializer.eager_load(queryset, f'{prefix}booking__')
+        return BusinessSerializer.eager_load(queryset, f'{prefix}business__')
 
 
-class DashboardSerializer(serializers.Serializer):
+class DashboardSerializer(SparseFieldsMixin, serializers.Serializer):
     """Serializer for dashboard analytics data"""
     total_bookings = serializers.IntegerField()
     total_revenue = serializers.DecimalField(max_digits=10, decimal_places=2)
     total_customers = serializers.IntegerField()
     average_rating = serializers.FloatField()
+    bookings_growth = serializers.FloatField()
+    revenue_growth = serializers.FloatField()
     
     # Time series data for charts
     bookings_by_date = serializers.ListField(child=serializers.DictField())
     revenue_by_month = serializers.ListField(child=serializers.DictField())
+    bookings_by_hour = serializers.ListField(child=serializers.DictField())
+    bookings_by_weekday = serializers.ListField(child=serializers.DictField())
     popular_services = serializers.ListField(child=serializers.DictField())
-    customer_demographics = serializers.DictField()
\ No newline at end of file
+    service_revenue = serializers.ListField(child=serializers.DictField())
+    customer_demographics = serializers.DictField()
+    top_customers = serializers.ListField(child=serializers.DictField())
+    customer_retention = serializers.DictField()
+    recent_bookings = serializers.ListField(child=serializers.DictField())
+    recent_reviews = serializers.ListField(child=serializers.DictField())
+    booking_status_breakdown = serializers.ListField(child=serializers.DictField())
+    next_week_bookings = serializers.IntegerField()
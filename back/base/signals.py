@@ -0,0 +1,137 @@
+# base/signals.py
+"""
+Model signal handlers keeping derived data in sync with bookings,
+business hours, services and reviews.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import (
+    invalidate_availability,
+    invalidate_business_analytics,
+    invalidate_business_availability,
+    invalidate_service_availability
+)
+from .capacity import sync_slot_capacity
+from .cohorts import remove_customer_cohorts, sync_cohorts
+from .heatmap import sync_heatmap
+from .leaderboard import sync_leaderboard
+from .models import Booking, BusinessHours, Customer, Review, Service
+from .ratings import sync_rating_stats
+from .sketches import sync_customer_sketches
+from .stats import recount_daily_stats, sync_daily_stats
+
+# Booking fields whose changes update derived data
+BOOKING_TRACKED_FIELDS = (
+    'business_id', 'service_id', 'customer_id', 'booking_date', 'start_time', 'end_time',
+    'status', 'total_price', 'is_paid'
+)
+
+# Review fields that rating totals are computed from
+REVIEW_TRACKED_FIELDS = ('business_id', 'rating')
+
+# Service fields that affect the slot grid
+SERVICE_AVAILABILITY_FIELDS = (
+    'duration_minutes', 'buffer_time_minutes', 'max_bookings_per_slot'
+)
+
+
+def _snapshot(instance, fields):
+    # Read from __dict__ so deferred fields are never loaded here
+    return {field: instance.__dict__.get(field) for field in fields}
+
+
+def _invalidate_booking_caches(*states):
+    for state in states:
+        if state and state['service_id'] and state['booking_date']:
+            invalidate_availability(state['business_id'], state['service_id'], state['booking_date'])
+    for business_id in {state['business_id'] for state in states if state}:
+        invalidate_business_analytics(business_id)
+
+
+@receiver(post_init, sender=Booking)
+def remember_booking_state(sender, instance, **kwargs):
+    instance._tracked_state = _snapshot(instance, BOOKING_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=Booking)
+def sync_saved_booking(sender, instance, created, **kwargs):
+    previous = None if created else instance._tracked_state
+    current = _snapshot(instance, BOOKING_TRACKED_FIELDS)
+    instance._tracked_state = current
+
+    if previous == current:
+        return
+
+    sync_slot_capacity(previous, current)
+    sync_daily_stats(instance, previous, current)
+    sync_cohorts(previous, current)
+    sync_leaderboard(previous, current)
+    sync_heatmap(previous, current)
+    sync_customer_sketches(previous, current)
+    transaction.on_commit(lambda: _invalidate_booking_caches(previous, current))
+
+
+@receiver(post_delete, sender=Booking)
+def sync_deleted_booking(sender, instance, origin=None, **kwargs):
+    previous = instance._tracked_state
+
+    sync_slot_capacity(previous, None)
+    if origin is instance:
+        sync_daily_stats(instance, previous, None)
+    else:
+        # Deleted in bulk or by a cascade, along with bookings it may have
+        # counted against
+        recount_daily_stats(instance, previous)
+    sync_cohorts(previous, None)
+    sync_leaderboard(previous, None)
+    sync_heatmap(previous, None)
+    transaction.on_commit(lambda: _invalidate_booking_caches(previous))
+
+
+@receiver(pre_delete, sender=Customer)
+def remove_deleted_customer_cohorts(sender, instance, **kwargs):
+    remove_customer_cohorts(instance.pk)
+
+
+@receiver(post_init, sender=Service)
+def remember_service_state(sender, instance, **kwargs):
+    instance._availability_state = _snapshot(instance, SERVICE_AVAILABILITY_FIELDS)
+
+
+@receiver(post_save, sender=Service)
+def invalidate_changed_service_availability(sender, instance, created, **kwargs):
+    current = _snapshot(instance, SERVICE_AVAILABILITY_FIELDS)
+    if not created and instance._availability_state != current:
+        transaction.on_commit(lambda: invalidate_service_availability(instance.id))
+    instance._availability_state = current
+
+
+@receiver(post_init, sender=Review)
+def remember_review_state(sender, instance, **kwargs):
+    instance._tracked_state = _snapshot(instance, REVIEW_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=Review)
+def sync_saved_review(sender, instance, created, **kwargs):
+    previous = None if created else instance._tracked_state
+    current = _snapshot(instance, REVIEW_TRACKED_FIELDS)
+    instance._tracked_state = current
+    sync_rating_stats(previous, current)
+
+
+@receiver(post_delete, sender=Review)
+def sync_deleted_review(sender, instance, **kwargs):
+    sync_rating_stats(instance._tracked_state, None)
+
+
+@receiver([post_save, post_delete], sender=Service)
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_analytics(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_business_analytics(instance.business_id))
+
+
+@receiver([post_save, post_delete], sender=BusinessHours)
+def invalidate_hours_availability(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_business_availability(instance.business_id))
@@ -0,0 +1,125 @@
+# base/sketches.py
+"""
+Approximate distinct-customer counts from HyperLogLog sketches.
+
+Every booking adds its customer to the sketch of its business' booking day
+and to the sketch of that day's month. The customers of a date range are
+estimated by merging the month sketches of the whole months inside the range
+with the day sketches of the days at its edges. A yearly window therefore
+reads about a dozen month sketches and at most ~60 day sketches instead of
+scanning bookings.
+
+Sketches only grow: deleting a booking or moving it away leaves its
+customer counted until ``rebuild_customer_sketches`` runs.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Q
+
+from .cohorts import add_months, month_start
+from .hll import REGISTERS, HyperLogLog
+from .models import CustomerSketch
+
+
+def add_to_sketches(business_id, day, customer_id):
+    """Add a customer to the day and month sketches of a business"""
+    with transaction.atomic():
+        for period, start_date in (('day', day), ('month', month_start(day))):
+            sketch, _ = CustomerSketch.objects.select_for_update().get_or_create(
+                business_id=business_id,
+                period=period,
+                start_date=start_date,
+                defaults={'registers': bytes(REGISTERS)}
+            )
+            hll = HyperLogLog(sketch.registers)
+            if hll.add(customer_id):
+                sketch.registers = hll.to_bytes()
+                sketch.save(update_fields=['registers', 'updated_at'])
+
+
+def sync_customer_sketches(previous, current):
+    """
+    Add a saved booking's customer to the sketches of its day.
+
+    ``previous`` and ``current`` are booking field snapshots (``previous`` is
+    ``None`` for a new booking).
+    """
+    if not current:
+        return
+    key = (current['business_id'], current['booking_date'], current['customer_id'])
+    if previous and (previous['business_id'], previous['booking_date'], previous['customer_id']) == key:
+        return
+    add_to_sketches(*key)
+
+
+def rebuild_customer_sketches(business_ids=None, apps=global_apps):
+    """
+    Rebuild day and month sketches from the bookings table.
+
+    Returns the number of sketches written. Migrations pass their ``apps``
+    to backfill with historical models.
+    """
+    sketch_model = apps.get_model('base', 'CustomerSketch')
+    bookings = apps.get_model('base', 'Booking').objects.order_by()
+    if business_ids:
+        bookings = bookings.filter(business_id__in=business_ids)
+
+    sketches = defaultdict(HyperLogLog)
+    rows = bookings.values_list('business_id', 'booking_date', 'customer_id').distinct()
+    for business_id, day, customer_id in rows.iterator():
+        sketches[(business_id, 'day', day)].add(customer_id)
+        sketches[(business_id, 'month', month_start(day))].add(customer_id)
+
+    with transaction.atomic():
+        sketch_model.objects.filter(
+            **({'business_id__in': business_ids} if business_ids else {})
+        ).delete()
+        sketch_model.objects.bulk_create([
+            sketch_model(
+                business_id=business_id,
+                period=period,
+                start_date=start_date,
+                registers=hll.to_bytes()
+            )
+            for (business_id, period, start_date), hll in sketches.items()
+        ], batch_size=500)
+
+    return len(sketches)
+
+
+def _window_sketches(start=None, end=None):
+    """
+    Filter on the sketches covering ``start`` to ``end`` inclusive.
+
+    Whole months come from month sketches and the days before the first and
+    after the last whole month from day sketches. Open ends reach the first
+    or last booking.
+    """
+    first_month = add_months(month_start(start - timedelta(days=1)), 1) if start else None
+    end_month = month_start(end + timedelta(days=1)) if end else None
+
+    if first_month and end_month and first_month >= end_month:
+        return Q(period='day', start_date__range=(start, end))
+
+    months = Q(period='month')
+    if first_month:
+        months &= Q(start_date__gte=first_month)
+    if end_month:
+        months &= Q(start_date__lt=end_month)
+    if start and start < first_month:
+        months |= Q(period='day', start_date__gte=start, start_date__lt=first_month)
+    if end and end_month <= end:
+        months |= Q(period='day', start_date__gte=end_month, start_date__lte=end)
+    return months
+
+
+def approximate_customers(business_id, start=None, end=None):
+    """Estimated number of distinct customers booked from ``start`` to ``end``"""
+    registers = CustomerSketch.objects.filter(
+        _window_sketches(start, end),
+        business_id=business_id
+    ).values_list('registers', flat=True)
+    return HyperLogLog.union(registers).count()
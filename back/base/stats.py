@@ -0,0 +1,206 @@
+# base/stats.py
+"""
+Daily business rollups.
+
+``BusinessDailyStats`` holds per-day booking counts by status, paid revenue,
+new/returning customer bookings and bookings by start hour. Booking writes
+move the booking's contribution between rows under a row lock, so the
+dashboard reads a single range of rows instead of aggregating bookings.
+
+A booking counts as a new customer's when it is the customer's first
+booking with the business (by creation); every later one is returning.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import ExtractHour
+
+from .models import Booking, BusinessDailyStats
+from .rollups import has_additions, locked_row
+
+# Bookings whose paid amount counts as realized revenue
+REVENUE_STATUSES = ('confirmed', 'completed')
+
+STATUS_FIELDS = {status: f'{status}_bookings' for status, _ in Booking.STATUS_CHOICES}
+
+
+def _earlier_bookings(business_id, customer_id, created_at, model=Booking):
+    return model.objects.filter(
+        business_id=business_id,
+        customer_id=customer_id,
+        created_at__lt=created_at
+    )
+
+
+def _contribution(state, is_first):
+    """Counter deltas of one booking state"""
+    price = Decimal(str(state['total_price'] or 0))
+    deltas = {
+        'total_bookings': 1,
+        STATUS_FIELDS[state['status']]: 1,
+        'new_customers' if is_first else 'returning_customers': 1,
+    }
+    if state['is_paid']:
+        deltas['paid_revenue'] = price
+        if state['status'] in REVENUE_STATUSES:
+            deltas['confirmed_revenue'] = price
+    return deltas
+
+
+def apply_daily_stats(business_id, day, deltas, hour_deltas=None):
+    """Add counter and per-hour deltas to the row of one business day"""
+    hour_deltas = hour_deltas or {}
+    with transaction.atomic():
+        stats = locked_row(
+            BusinessDailyStats,
+            {'business_id': business_id, 'date': day},
+            create=has_additions(deltas, hour_deltas)
+        )
+        if stats is None:
+            return
+
+        for field, delta in deltas.items():
+            setattr(stats, field, getattr(stats, field) + delta)
+
+        hours = stats.bookings_by_hour
+        for hour, delta in hour_deltas.items():
+            count = hours.get(str(hour), 0) + delta
+            if count:
+                hours[str(hour)] = count
+            else:
+                hours.pop(str(hour), None)
+
+        stats.save()
+
+
+def _next_booking_date(booking, state):
+    """Date of the customer's next booking with the business after ``booking``"""
+    return Booking.objects.filter(
+        business_id=state['business_id'],
+        customer_id=state['customer_id'],
+        created_at__gte=booking.created_at
+    ).exclude(pk=booking.pk).order_by('created_at').values_list('booking_date', flat=True).first()
+
+
+def sync_daily_stats(booking, previous, current):
+    """
+    Move a booking's contribution between daily rows.
+
+    ``previous`` and ``current`` are booking field snapshots (``None`` for a
+    booking that did not exist before or no longer exists).
+    """
+    changes = defaultdict(lambda: (defaultdict(int), defaultdict(int)))
+    first_in_group = {}
+
+    def is_first(state):
+        group = (state['business_id'], state['customer_id'])
+        if group not in first_in_group:
+            first_in_group[group] = not _earlier_bookings(
+                *group, booking.created_at
+            ).exclude(pk=booking.pk).exists()
+        return first_in_group[group]
+
+    def add(state, sign):
+        first = is_first(state)
+        deltas, hours = changes[(state['business_id'], state['booking_date'])]
+        for field, delta in _contribution(state, first).items():
+            deltas[field] += sign * delta
+        hours[state['start_time'].hour] += sign
+
+        # Leaving or joining a customer's bookings with a business as their
+        # first one changes whether their next booking is new or returning
+        regrouped = previous and current and (
+            (previous['business_id'], previous['customer_id'])
+            != (current['business_id'], current['customer_id'])
+        )
+        if first and (regrouped or (sign < 0 and not current)):
+            next_date = _next_booking_date(booking, state)
+            if next_date:
+                deltas, _ = changes[(state['business_id'], next_date)]
+                deltas['new_customers'] -= sign
+                deltas['returning_customers'] += sign
+
+    if previous:
+        add(previous, -1)
+    if current:
+        add(current, 1)
+
+    for (business_id, day), (deltas, hours) in changes.items():
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        hours = {hour: delta for hour, delta in hours.items() if delta}
+        if deltas or hours:
+            apply_daily_stats(business_id, day, deltas, hours)
+
+
+def recount_daily_stats(booking, state):
+    """
+    Recount the days a deleted booking counted in from the bookings table.
+
+    For bookings deleted in bulk or by a cascade, whose customer's other
+    bookings may be gone with them so deltas against those would be wrong.
+    The day of the customer's next remaining booking is recounted too, as
+    it may have become their first.
+    """
+    days = {state['booking_date'], _next_booking_date(booking, state)} - {None}
+    for day in sorted(days):
+        rebuild_daily_stats(business_ids=[state['business_id']], start_date=day, end_date=day)
+
+
+def rebuild_daily_stats(business_ids=None, start_date=None, end_date=None, apps=global_apps):
+    """
+    Rebuild daily rows from the bookings table in bulk.
+
+    Rows matching the filters are deleted with one query and recreated from
+    two grouped booking queries. Returns the number of rows written.
+    Migrations pass their ``apps`` to backfill with historical models.
+    """
+    booking_model = apps.get_model('base', 'Booking')
+    stats_model = apps.get_model('base', 'BusinessDailyStats')
+    filters = {}
+    if business_ids:
+        filters['business_id__in'] = business_ids
+    if start_date:
+        filters['booking_date__gte'] = start_date
+    if end_date:
+        filters['booking_date__lte'] = end_date
+
+    bookings = booking_model.objects.filter(**filters).order_by()
+
+    totals = bookings.annotate(
+        has_earlier=Exists(_earlier_bookings(
+            OuterRef('business_id'), OuterRef('customer_id'), OuterRef('created_at'), booking_model
+        ))
+    ).values('business_id', 'booking_date').annotate(
+        total_bookings=Count('id'),
+        paid_revenue=Sum('total_price', filter=Q(is_paid=True), default=0),
+        confirmed_revenue=Sum('total_price', filter=Q(is_paid=True, status__in=REVENUE_STATUSES), default=0),
+        new_customers=Count('id', filter=Q(has_earlier=False)),
+        returning_customers=Count('id', filter=Q(has_earlier=True)),
+        **{field: Count('id', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()}
+    )
+
+    by_hour = defaultdict(dict)
+    hourly = bookings.values('business_id', 'booking_date', hour=ExtractHour('start_time')).annotate(count=Count('id'))
+    for row in hourly.iterator():
+        by_hour[(row['business_id'], row['booking_date'])][str(row['hour'])] = row['count']
+
+    rows = []
+    for row in totals.iterator():
+        key = (row.pop('business_id'), row.pop('booking_date'))
+        rows.append(stats_model(
+            business_id=key[0],
+            date=key[1],
+            bookings_by_hour=by_hour.get(key, {}),
+            **row
+        ))
+
+    with transaction.atomic():
+        stats_model.objects.filter(**{
+            field.replace('booking_date', 'date'): value for field, value in filters.items()
+        }).delete()
+        stats_model.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
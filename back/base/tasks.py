@@ -0,0 +1,11 @@
+# base/tasks.py
+# Imported on first enqueue (and by the worker's autodiscovery), so Celery
+# never loads in web processes that run without a broker
+from back.celery import app
+
+
+@app.task(ignore_result=True)
+def refresh_analytics_snapshot(business_id, name, params):
+    """Recompute one cached analytics snapshot of a business"""
+    from .analytics import refresh_analytics
+    refresh_analytics(business_id, name, params)
@@ -0,0 +1,66 @@
+# base/test/helpers.py
+"""
+Shared test data: users, customers, businesses, services and opening hours.
+"""
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from base.models import Business, BusinessHours, Customer, Service
+
+User = get_user_model()
+
+
+class BusinessFixtures:
+    """Factories for the objects most tests build on"""
+
+    def create_user(self, email, user_type='customer', **fields):
+        return User.objects.create_user(email=email, password='testpass123', user_type=user_type, **fields)
+
+    def create_owner(self, email='owner@test.com', **fields):
+        return self.create_user(email, 'business_owner', **fields)
+
+    def create_customer(self, email='customer@test.com', **fields):
+        return Customer.objects.create(user=self.create_user(email, **fields))
+
+    def create_business(self, owner, index=None, **fields):
+        """``Test Business``, or ``Business <index>`` when numbered"""
+        if index is None:
+            names = {'name': 'Test Business', 'slug': 'test-business', 'email': 'business@test.com'}
+        else:
+            names = {'name': f'Business {index}', 'slug': f'business-{index}', 'email': f'business{index}@test.com'}
+        return Business.objects.create(**{
+            'owner': owner, 'phone': '1234567890', 'address': '123 Test St',
+            'city': 'Test City', 'state': 'TS', 'country': 'Test Country',
+            'postal_code': '12345', 'category': 'Test Category',
+            **names, **fields
+        })
+
+    def create_service(self, business, **fields):
+        return Service.objects.create(**{
+            'business': business, 'name': 'Haircut', 'description': 'Cut',
+            'duration_minutes': 60, 'price': 25,
+            **fields
+        })
+
+    def create_hours(self, business, opening_time=time(9, 0), closing_time=time(17, 0)):
+        """Open every day of the week"""
+        for weekday in range(7):
+            BusinessHours.objects.create(
+                business=business, weekday=weekday,
+                opening_time=opening_time, closing_time=closing_time
+            )
+
+
+class BusinessTestCase(BusinessFixtures, TestCase):
+    """An owner, a customer and the owner's business with one service"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customer = self.create_customer()
+        self.user = self.customer.user
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
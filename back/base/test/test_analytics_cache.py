@@ -0,0 +1,147 @@
+# base/test/test_analytics_cache.py
+from datetime import time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base import analytics
+from base.cache import analytics_cache_key
+from base.models import Booking, Review
+from base.test.helpers import BusinessTestCase
+
+
+class InlineExecutor:
+    """Runs submitted refreshes once ``run`` is called, in the test's thread"""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, function, *args):
+        self.pending.append(args)
+
+    def run(self):
+        # Skip the thread wrapper, which closes the test's connection
+        while self.pending:
+            analytics.refresh_analytics(*self.pending.pop(0))
+
+
+class AnalyticsCacheTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_owner = self.create_owner('other@test.com')
+        self.url = reverse('base:business-stats', kwargs={'slug': self.business.slug})
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+        self.executor = InlineExecutor()
+        patcher = mock.patch.object(analytics, 'get_refresh_executor', return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def book(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=timezone.now().date() + timedelta(days=1), start_time=time(10, 0),
+                end_time=time(11, 0), total_price=Decimal('25.00')
+            )
+
+    def test_reads_hit_cache_until_data_changes(self):
+        self.book()
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Analytics-Cache'], 'miss')
+        self.assertEqual(first.data['bookings'], 1)
+
+        # Only the business lookup runs on a hit
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached['X-Analytics-Cache'], 'fresh')
+        self.assertEqual(cached.data, first.data)
+        self.assertEqual(cached['X-Computed-At'], first['X-Computed-At'])
+
+    def test_stale_snapshot_served_while_refreshing(self):
+        self.book()
+        self.client.get(self.url)
+        self.book()
+
+        # The outdated snapshot is served without recomputing in the request
+        with self.assertNumQueries(1):
+            stale = self.client.get(self.url)
+        self.assertEqual(stale['X-Analytics-Cache'], 'stale')
+        self.assertEqual(stale.data['bookings'], 1)
+        self.assertEqual(len(self.executor.pending), 1)
+
+        self.executor.run()
+        fresh = self.client.get(self.url)
+        self.assertEqual(fresh['X-Analytics-Cache'], 'fresh')
+        self.assertEqual(fresh.data['bookings'], 2)
+
+    def test_concurrent_stale_reads_schedule_one_refresh(self):
+        self.client.get(self.url)
+        self.book()
+
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.url)['X-Analytics-Cache'], 'stale')
+        self.assertEqual(len(self.executor.pending), 1)
+
+        # Once the refresh finished, the next change may schedule another
+        self.executor.run()
+        self.book()
+        self.client.get(self.url)
+        self.assertEqual(len(self.executor.pending), 1)
+
+    def test_snapshot_from_previous_day_is_stale(self):
+        self.client.get(self.url)
+        key = analytics_cache_key(self.business.id, 'stats', {})
+        snapshot = cache.get(key)
+        snapshot['computed_at'] -= timedelta(days=1)
+        cache.set(key, snapshot)
+
+        # Rolling windows moved since, so the snapshot is refreshed
+        self.assertEqual(self.client.get(self.url)['X-Analytics-Cache'], 'stale')
+
+    def test_review_and_service_writes_mark_snapshot_stale(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(
+                business=self.business, customer=self.customer,
+                rating=4, title='Nice', comment='Good cut'
+            )
+        self.assertEqual(self.client.get(self.url)['X-Analytics-Cache'], 'stale')
+        self.executor.run()
+        self.assertEqual(self.client.get(self.url).data['rating'], 4.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.delete()
+        self.assertEqual(self.client.get(self.url)['X-Analytics-Cache'], 'stale')
+
+    @override_settings(CELERY_BROKER_URL='redis://localhost:6379')
+    def test_refresh_runs_in_celery_when_broker_configured(self):
+        self.client.get(self.url)
+        self.book()
+
+        with mock.patch('base.tasks.refresh_analytics_snapshot.delay') as delay:
+            self.client.get(self.url)
+        delay.assert_called_once_with(str(self.business.id), 'stats', {})
+        self.assertEqual(self.executor.pending, [])
+
+    def test_query_params_are_part_of_key(self):
+        self.book()
+        month = self.client.get(self.url, {'period': 'month'})
+        week = self.client.get(self.url, {'period': 'week'})
+        self.assertEqual((month.status_code, week.status_code), (200, 200))
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'period': 'week'})
+
+    def test_cached_response_not_served_to_other_users(self):
+        self.client.get(self.url)
+
+        self.client.force_authenticate(user=self.other_owner)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
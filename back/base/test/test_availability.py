@@ -0,0 +1,187 @@
+# base/test/test_availability.py
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.utils import timezone
+
+from base.availability import (
+    build_slot_grid, compute_day_slots, sweep_overlaps, to_intervals
+)
+from base.cache import availability_cache_stats, reset_availability_cache_stats
+from base.models import Booking, BusinessHours, Service
+from base.test.helpers import BusinessTestCase
+from base.utils import calculate_available_slots, get_available_dates
+
+
+def naive_overlaps(slots, intervals):
+    """Reference implementation: rescan every interval for every slot"""
+    return [
+        sum(weight for start, end, weight in intervals if start < slot_end and end > slot_start)
+        for slot_start, slot_end in slots
+    ]
+
+
+class AvailabilityEngineTestCase(SimpleTestCase):
+    def setUp(self):
+        self.hours = SimpleNamespace(
+            opening_time=time(9, 0), closing_time=time(17, 0), is_closed=False
+        )
+        self.service = SimpleNamespace(
+            duration_minutes=60, buffer_time_minutes=15, max_bookings_per_slot=1
+        )
+        self.day = date(2030, 1, 7)
+        self.now = timezone.make_aware(datetime(2030, 1, 1, 12, 0))
+
+    def test_slot_grid_respects_duration_and_buffer(self):
+        grid = build_slot_grid(time(9, 0), time(12, 0), 60, 15)
+        self.assertEqual(grid, [(540, 600), (615, 675)])
+
+    def test_sweep_matches_naive_scan(self):
+        grid = build_slot_grid(time(8, 0), time(20, 0), 30, 0)
+        intervals = to_intervals([
+            (time(8, 0), time(9, 0)),
+            (time(8, 30), time(12, 0)),
+            (time(10, 15), time(10, 45)),
+            (time(11, 59), time(12, 1)),
+            (time(19, 30), time(20, 0), 3),
+        ])
+        self.assertEqual(sweep_overlaps(grid, intervals), naive_overlaps(grid, intervals))
+
+    def test_booked_slot_is_removed(self):
+        intervals = to_intervals([(time(10, 15), time(11, 15))])
+        slots = compute_day_slots(self.hours, self.service, self.day, intervals, now=self.now)
+        starts = [slot['start_time'] for slot in slots]
+        self.assertNotIn('10:15', starts)
+        self.assertIn('09:00', starts)
+        self.assertEqual(slots[0], {'start_time': '09:00', 'end_time': '10:00', 'available_spots': 1})
+
+    def test_capacity_reports_remaining_spots(self):
+        self.service.max_bookings_per_slot = 3
+        intervals = to_intervals([(time(9, 0), time(10, 0))] * 2)
+        slots = compute_day_slots(self.hours, self.service, self.day, intervals, now=self.now)
+        self.assertEqual(slots[0]['available_spots'], 1)
+        self.assertEqual(slots[1]['available_spots'], 3)
+
+    def test_closed_and_past_days_have_no_slots(self):
+        self.assertEqual(compute_day_slots(None, self.service, self.day, [], now=self.now), [])
+        past = self.now.date() - timedelta(days=1)
+        self.assertEqual(compute_day_slots(self.hours, self.service, past, [], now=self.now), [])
+
+    def test_same_day_requires_lead_time(self):
+        now = timezone.make_aware(datetime.combine(self.day, time(12, 10)))
+        slots = compute_day_slots(self.hours, self.service, self.day, [], now=now)
+        self.assertEqual(slots[0]['start_time'], '14:00')
+
+
+class RangeAvailabilityTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_hours(self.business, closing_time=time(12, 0))
+        self.tomorrow = timezone.now().date() + timedelta(days=1)
+        self.bookings = [
+            Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=self.tomorrow, start_time=time(hour, 0),
+                end_time=time(hour + 1, 0), total_price=30
+            )
+            for hour in (9, 10, 11)
+        ]
+
+    def test_query_count_does_not_grow_with_window(self):
+        with self.assertNumQueries(3):
+            get_available_dates(self.business, self.service, days_ahead=365)
+
+    def test_range_matches_single_day_calculation(self):
+        dates = get_available_dates(self.business, self.service, days_ahead=14)
+        counts = {entry['date']: entry['slots_count'] for entry in dates}
+
+        for offset in range(15):
+            day = timezone.now().date() + timedelta(days=offset)
+            slots = calculate_available_slots(self.business, self.service, day)
+            self.assertEqual(counts.get(day.isoformat(), 0), len(slots))
+
+        self.assertNotIn(self.tomorrow.isoformat(), counts)
+
+
+class AvailabilityCacheTestCase(RangeAvailabilityTestCase):
+    def test_second_lookup_is_served_from_cache(self):
+        reset_availability_cache_stats()
+        calculate_available_slots(self.business, self.service, self.tomorrow)
+
+        with self.assertNumQueries(0):
+            calculate_available_slots(self.business, self.service, self.tomorrow)
+
+        self.assertEqual(availability_cache_stats()['hits'], 1)
+        self.assertEqual(availability_cache_stats()['misses'], 1)
+
+    def test_status_change_invalidates_the_day(self):
+        self.assertEqual(calculate_available_slots(self.business, self.service, self.tomorrow), [])
+
+        booking = self.bookings[0]
+        booking.status = 'cancelled'
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+
+        slots = calculate_available_slots(self.business, self.service, self.tomorrow)
+        self.assertEqual([slot['start_time'] for slot in slots], ['09:00'])
+
+    def test_hours_change_invalidates_all_dates(self):
+        get_available_dates(self.business, self.service, days_ahead=14)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BusinessHours.objects.filter(business=self.business).delete()
+            BusinessHours.objects.create(
+                business=self.business, weekday=self.tomorrow.weekday(),
+                opening_time=time(14, 0), closing_time=time(16, 0)
+            )
+
+        dates = get_available_dates(self.business, self.service, days_ahead=14)
+        self.assertEqual([entry['slots_count'] for entry in dates], [2] * len(dates))
+
+    def test_service_duration_change_invalidates_all_dates(self):
+        day = self.tomorrow + timedelta(days=1)
+        self.assertEqual(len(calculate_available_slots(self.business, self.service, day)), 3)
+
+        self.service.duration_minutes = 90
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.save()
+
+        slots = calculate_available_slots(self.business, self.service, day)
+        self.assertEqual([slot['end_time'] for slot in slots], ['10:30', '12:00'])
+
+
+class BatchAvailabilityTestCase(RangeAvailabilityTestCase):
+    def test_batch_returns_every_service_from_one_bulk_load(self):
+        other = Service.objects.create(
+            business=self.business, name='Shave', description='Shave',
+            duration_minutes=30, price=15
+        )
+        start = timezone.now().date() + timedelta(days=1)
+        end = start + timedelta(days=6)
+
+        client = APIClient()
+        with self.assertNumQueries(4):
+            response = client.get(reverse('base:business-batch-availability'), {
+                'services': f'{self.service.id},{other.id}',
+                'start_date': start.isoformat(),
+                'end_date': end.isoformat(),
+            })
+
+        self.assertEqual(response.status_code, 200)
+        grids = {entry['service_id']: entry['slots'] for entry in response.data['services']}
+        self.assertEqual(set(grids), {str(self.service.id), str(other.id)})
+        self.assertEqual(len(grids[str(other.id)]), 7)
+        self.assertEqual(grids[str(self.service.id)][start.isoformat()], [])
+        self.assertEqual(
+            grids[str(other.id)][start.isoformat()],
+            calculate_available_slots(self.business, other, start)
+        )
+
+    def test_batch_rejects_invalid_input(self):
+        client = APIClient()
+        url = reverse('base:business-batch-availability')
+        self.assertEqual(client.get(url, {'services': 'nope', 'start_date': '2030-01-01'}).status_code, 400)
+        self.assertEqual(client.get(url, {'services': str(self.service.id)}).status_code, 400)
@@ -0,0 +1,82 @@
+# base/test/test_booking_lists.py
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import Booking, Review
+from base.test.helpers import BusinessTestCase
+
+
+class BookingListTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_hours(self.business)
+        Review.objects.create(
+            business=self.business, customer=self.customer, rating=4, title='Good', comment='Good'
+        )
+        self.customer.preferred_businesses.add(self.business)
+        self.today = timezone.now().date()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def book(self, count, days=1):
+        for index in range(count):
+            Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=self.today + timedelta(days=days), start_time=time(9 + index, 0),
+                end_time=time(10 + index, 0), total_price=Decimal('25.00')
+            )
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_lists_are_compact_by_default(self):
+        self.book(2)
+        for name in ('booking-list', 'booking-upcoming'):
+            response = self.client.get(reverse(f'base:{name}'))
+            booking = response.data['results'][0]
+            with self.subTest(name=name):
+                self.assertEqual(
+                    set(booking['business']),
+                    {'id', 'name', 'slug', 'logo', 'address', 'city', 'category'}
+                )
+                self.assertEqual(booking['customer']['user']['email'], 'customer@test.com')
+                self.assertEqual(booking['service']['name'], 'Haircut')
+
+        booking_id = response.data['results'][0]['id']
+        detail = self.client.get(reverse('base:booking-detail', kwargs={'pk': booking_id}))
+        self.assertIn('hours', detail.data['business'])
+
+    def test_sparse_fields(self):
+        self.book(2)
+        response = self.client.get(reverse('base:booking-list'), {'fields': 'id,status,booking_date'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'status', 'booking_date'})
+
+        response = self.client.get(reverse('base:booking-list'), {'view': 'detailed'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        url = reverse('base:booking-list')
+        for params in ({}, {'view': 'full'}):
+            Booking.objects.all().delete()
+            self.book(2)
+            few, _ = self.count_queries(url, params)
+            self.book(6, days=2)
+            many, response = self.count_queries(url, params)
+            with self.subTest(params=params):
+                self.assertEqual(response.data['count'], 8)
+                self.assertEqual(few, many)
+
+        compact, _ = self.count_queries(url)
+        full, response = self.count_queries(url, {'view': 'full'})
+        self.assertLess(compact, full)
+        self.assertEqual(response.data['results'][0]['business']['average_rating'], 4.0)
+        self.assertEqual(len(response.data['results'][0]['customer']['preferred_businesses'][0]['hours']), 7)
@@ -0,0 +1,62 @@
+# base/test/test_booking_validation.py
+from datetime import time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from base.models import Booking
+from base.serializers import BookingSerializer
+from base.test.helpers import BusinessFixtures
+
+
+class BookingConflictTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        self.customer = self.create_customer()
+        self.business = self.create_business(self.create_owner())
+        self.create_hours(self.business, closing_time=time(18, 0))
+        self.service = self.create_service(
+            self.business, name='Class', description='Group class', price=20, max_bookings_per_slot=2
+        )
+        self.other_service = self.create_service(
+            self.business, name='Massage', description='Massage', price=50
+        )
+        self.day = timezone.now().date() + timedelta(days=2)
+
+    def book(self, service, hour, minute=0):
+        return Booking.objects.create(
+            business=self.business, customer=self.customer, service=service,
+            booking_date=self.day, start_time=time(hour, minute),
+            end_time=time(hour + 1, minute), total_price=service.price
+        )
+
+    def validate(self, service, hour):
+        serializer = BookingSerializer(data={
+            'business_id': str(self.business.id),
+            'service_id': str(service.id),
+            'booking_date': self.day.isoformat(),
+            'start_time': f'{hour:02d}:00',
+            'end_time': f'{hour + 1:02d}:00',
+        })
+        return serializer.is_valid(), serializer.errors
+
+    def test_free_slot_is_valid(self):
+        self.assertEqual(self.validate(self.service, 10), (True, {}))
+
+    def test_same_service_overlaps_share_capacity(self):
+        self.book(self.service, 10)
+        self.assertTrue(self.validate(self.service, 10)[0])
+
+        self.book(self.service, 10, 30)
+        valid, errors = self.validate(self.service, 10)
+        self.assertFalse(valid)
+        self.assertIn('fully booked', str(errors['start_time']))
+
+    def test_other_service_conflicts_are_all_reported(self):
+        self.book(self.other_service, 9, 30)
+        self.book(self.other_service, 10, 30)
+
+        with self.assertNumQueries(4):
+            valid, errors = self.validate(self.service, 10)
+
+        self.assertFalse(valid)
+        self.assertEqual(len(errors['start_time']), 2)
@@ -0,0 +1,70 @@
+# base/test/test_capacity.py
+from datetime import time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from base.capacity import rebuild_slot_capacity
+from base.models import Booking, SlotCapacity
+from base.test.helpers import BusinessFixtures
+
+
+class SlotCapacityTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        self.customer = self.create_customer()
+        self.business = self.create_business(self.create_owner())
+        self.service = self.create_service(
+            self.business, name='Class', description='Group class', price=20, max_bookings_per_slot=3
+        )
+        self.day = timezone.now().date() + timedelta(days=3)
+
+    def book(self, hour=10, **kwargs):
+        return Booking.objects.create(
+            business=self.business, customer=self.customer, service=self.service,
+            booking_date=self.day, start_time=time(hour, 0),
+            end_time=time(hour + 1, 0), total_price=20, **kwargs
+        )
+
+    def booked(self, hour=10):
+        counter = SlotCapacity.objects.filter(
+            service=self.service, booking_date=self.day, start_time=time(hour, 0)
+        ).first()
+        return counter.booked if counter else 0
+
+    def test_counters_follow_booking_lifecycle(self):
+        first = self.book()
+        second = self.book()
+        self.assertEqual(self.booked(), 2)
+
+        first.status = 'confirmed'
+        first.save()
+        self.assertEqual(self.booked(), 2)
+
+        first.status = 'cancelled'
+        first.save()
+        self.assertEqual(self.booked(), 1)
+
+        second.status = 'no_show'
+        second.save()
+        self.assertEqual(self.booked(), 0)
+
+        self.book(status='cancelled')
+        self.assertEqual(self.booked(), 0)
+
+    def test_moving_and_deleting_bookings(self):
+        booking = self.book(hour=10)
+        booking.start_time, booking.end_time = time(14, 0), time(15, 0)
+        booking.save()
+        self.assertEqual((self.booked(10), self.booked(14)), (0, 1))
+
+        booking.delete()
+        self.assertEqual(self.booked(14), 0)
+
+    def test_rebuild_matches_bookings_table(self):
+        for hour in (9, 9, 10):
+            self.book(hour=hour)
+        self.book(hour=11, status='cancelled')
+        SlotCapacity.objects.update(booked=42)
+
+        self.assertEqual(rebuild_slot_capacity(service_ids=[self.service.id]), 2)
+        self.assertEqual((self.booked(9), self.booked(10), self.booked(11)), (2, 1, 0))
@@ -0,0 +1,84 @@
+# base/test/test_charts.py
+import json
+from datetime import time, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base import analytics
+from base.cache import analytics_cache_key
+from base.charts import CHART_SPECS, plotly_available
+from base.models import Booking, Review
+from base.test.helpers import BusinessTestCase
+
+
+class ChartSpecTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        today = timezone.now().date()
+        with self.captureOnCommitCallbacks(execute=True):
+            for days in range(1, 20):
+                Booking.objects.create(
+                    business=self.business, customer=self.customer, service=self.service,
+                    booking_date=today - timedelta(days=days), start_time=time(9 + days % 8, 0),
+                    end_time=time(10 + days % 8, 0), total_price=Decimal('25.00'), is_paid=True
+                )
+        self.url = reverse('base:business-analytics-chart', kwargs={'slug': self.business.slug})
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_spec_output(self):
+        response = self.client.get(self.url, {'type': 'heatmap', 'output': 'spec'})
+        self.assertEqual(response.status_code, 200)
+        trace = response.data['spec']['data'][0]
+        self.assertEqual(trace['type'], 'heatmap')
+        self.assertEqual(sum(map(sum, trace['z'])), 19)
+
+        for chart_type in CHART_SPECS:
+            cache.clear()
+            response = self.client.get(self.url, {'type': chart_type, 'output': 'spec'})
+            with self.subTest(chart_type=chart_type):
+                self.assertEqual(response.status_code, 200)
+                json.dumps(response.data['spec'])
+
+        self.assertEqual(self.client.get(self.url, {'output': 'png'}).status_code, 400)
+
+    def test_spec_does_not_need_plotly(self):
+        with mock.patch.object(analytics, 'plotly_available', return_value=False):
+            self.assertEqual(self.client.get(self.url, {'output': 'spec'}).status_code, 200)
+            self.assertEqual(self.client.get(self.url, {'period': '7'}).status_code, 501)
+
+    @skipUnless(plotly_available(), 'plotly is not installed')
+    def test_spec_is_an_order_of_magnitude_smaller(self):
+        html = self.client.get(self.url, {'type': 'revenue'})
+        spec = self.client.get(self.url, {'type': 'revenue', 'output': 'spec'})
+        self.assertLess(len(spec.content) * 10, len(html.content))
+
+    @skipUnless(plotly_available(), 'plotly is not installed')
+    def test_rendered_figure_cached_until_chart_data_changes(self):
+        self.client.get(self.url, {'type': 'revenue'})
+
+        # A review bumps the data version but leaves the revenue chart alone
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(
+                business=self.business, customer=self.customer, rating=5, title='Great', comment='Great'
+            )
+        cache.delete(analytics_cache_key(self.business.id, 'analytics_chart', {'type': 'revenue'}))
+        with mock.patch('plotly.io.to_html') as to_html:
+            self.client.get(self.url, {'type': 'revenue'})
+        to_html.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=timezone.now().date(), start_time=time(18, 0),
+                end_time=time(19, 0), total_price=Decimal('40.00'), is_paid=True
+            )
+        cache.delete(analytics_cache_key(self.business.id, 'analytics_chart', {'type': 'revenue'}))
+        with mock.patch('plotly.io.to_html', return_value='<div></div>') as to_html:
+            self.client.get(self.url, {'type': 'revenue'})
+        to_html.assert_called_once()
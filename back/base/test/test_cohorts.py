@@ -0,0 +1,129 @@
+# base/test/test_cohorts.py
+from datetime import time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.analytics import _calculate_retention_rate
+from base.cohorts import add_months, rebuild_cohorts
+from base.models import Booking, CohortActivity, CustomerCohort
+from base.test.helpers import BusinessFixtures
+
+
+class CohortTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customers = [self.create_customer(f'customer{index}@test.com') for index in range(3)]
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
+        self.this_month = timezone.now().date().replace(day=1)
+
+    def book(self, months_ago, customer=0, day=10):
+        return Booking.objects.create(
+            business=self.business, customer=self.customers[customer], service=self.service,
+            booking_date=add_months(self.this_month, -months_ago).replace(day=day),
+            start_time=time(10, 0), end_time=time(11, 0), total_price=Decimal('25.00')
+        )
+
+    def matrix(self):
+        return {
+            (cell.cohort_month, cell.month): (cell.active_customers, cell.bookings)
+            for cell in CohortActivity.objects.filter(business=self.business)
+        }
+
+    def memberships(self):
+        return {
+            membership.customer_id: (membership.cohort_month, membership.total_bookings, membership.bookings_by_month)
+            for membership in CustomerCohort.objects.filter(business=self.business)
+        }
+
+    def test_bookings_move_customers_between_cohorts(self):
+        cohort = add_months(self.this_month, -2)
+        first = self.book(2)
+        self.book(2, day=20)
+        self.book(0)
+
+        self.assertEqual(self.matrix(), {
+            (cohort, cohort): (1, 2),
+            (cohort, self.this_month): (1, 1),
+        })
+
+        # An earlier booking moves the customer to an older cohort
+        earlier = self.book(3)
+        older = add_months(self.this_month, -3)
+        self.assertEqual(set(self.matrix()), {
+            (older, older), (older, cohort), (older, self.this_month)
+        })
+
+        earlier.delete()
+        first.delete()
+        self.assertEqual(self.matrix(), {
+            (cohort, cohort): (1, 1),
+            (cohort, self.this_month): (1, 1),
+        })
+        self.assertEqual(CustomerCohort.objects.get().total_bookings, 2)
+
+    def test_rebuild_matches_incremental(self):
+        self.book(5)
+        self.book(2, customer=1)
+        moved = self.book(1, customer=1)
+        moved.booking_date = add_months(self.this_month, -4)
+        moved.save()
+        self.book(0, customer=2)
+        self.book(0, customer=2, day=11).delete()
+
+        matrix, memberships = self.matrix(), self.memberships()
+        CohortActivity.objects.all().delete()
+        CustomerCohort.objects.all().delete()
+
+        self.assertEqual(rebuild_cohorts(business_ids=[self.business.id]), 3)
+        self.assertEqual(self.matrix(), matrix)
+        self.assertEqual(self.memberships(), memberships)
+
+    def test_deleting_a_customer(self):
+        self.book(3)
+        self.book(1)
+        self.book(3, customer=1)
+        self.book(0, customer=1)
+
+        self.customers[0].user.delete()
+        self.assertEqual(set(self.memberships()), {self.customers[1].id})
+        matrix = self.matrix()
+        rebuild_cohorts(business_ids=[self.business.id])
+        self.assertEqual(self.matrix(), matrix)
+        self.assertEqual(set(matrix.values()), {(1, 1)})
+
+    def test_retention_rate_reads_matrix(self):
+        self.book(2)
+        self.book(2, customer=1)
+        self.book(0)
+
+        with self.assertNumQueries(1):
+            retention = _calculate_retention_rate(self.business)
+        self.assertEqual(retention, {'rate': 50.0, 'retained': 1, 'total': 2})
+
+    def test_cohorts_endpoint(self):
+        self.book(2)
+        self.book(2, customer=1)
+        self.book(1, customer=1)
+        self.book(0)
+        self.book(1, customer=2)
+
+        client = APIClient()
+        client.force_authenticate(user=self.owner)
+        url = reverse('base:business-cohorts', kwargs={'slug': self.business.slug})
+        response = client.get(url, {'months': 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['customers'], row['active']) for row in response.data['cohorts']],
+            [(2, [2, 1, 1]), (1, [1, 0]), (0, [0])]
+        )
+        self.assertEqual(response.data['cohorts'][0]['retention'], [100.0, 50.0, 50.0])
+        self.assertEqual(response.data['retention_curve'], [100.0, 33.33, 50.0])
+        self.assertEqual(client.get(url, {'months': 0}).status_code, 400)
@@ -0,0 +1,110 @@
+# base/test/test_dashboard_sections.py
+import threading
+from datetime import time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base import analytics
+from base.analytics import DEFAULT_DASHBOARD_FIELDS
+from base.models import Booking, Review
+from base.test.helpers import BusinessFixtures
+
+
+class DashboardSectionsMixin(BusinessFixtures):
+    def seed_dashboard(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customer = self.create_customer()
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
+        today = timezone.now().date()
+        for days in (-40, -5, -2, 3):
+            Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=today + timedelta(days=days), start_time=time(10, 0),
+                end_time=time(11, 0), total_price=Decimal('25.00'), is_paid=True,
+                status='confirmed'
+            )
+        Review.objects.create(
+            business=self.business, customer=self.customer, rating=5, title='Great', comment='Great cut'
+        )
+        self.url = reverse('base:business-dashboard', kwargs={'slug': self.business.slug})
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def get_fresh(self, params=None):
+        cache.clear()
+        return self.client.get(self.url, params or {})
+
+
+class DashboardSectionsTestCase(DashboardSectionsMixin, TestCase):
+    def setUp(self):
+        self.seed_dashboard()
+
+    def test_default_fields_skip_other_sections(self):
+        response = self.get_fresh()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(tuple(response.data), DEFAULT_DASHBOARD_FIELDS)
+        self.assertEqual(response.data['total_bookings'], 3)
+
+    def test_selected_sections_and_fields(self):
+        response = self.get_fresh({'fields': 'overview,top_customers,next_week_bookings'})
+        self.assertEqual(set(response.data), {
+            'total_bookings', 'total_revenue', 'total_customers', 'average_rating',
+            'top_customers', 'next_week_bookings'
+        })
+        self.assertEqual(response.data['next_week_bookings'], 1)
+        self.assertEqual(response.data['top_customers'][0]['bookings'], 4)
+
+        # A daily-rollup field needs only the rollup read
+        with self.assertNumQueries(3):
+            response = self.get_fresh({'fields': 'bookings_growth'})
+        self.assertEqual(set(response.data), {'bookings_growth'})
+
+    def test_unknown_field_rejected(self):
+        response = self.get_fresh({'fields': 'overview,nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nope', response.data['error'])
+
+    @override_settings(DEBUG=True)
+    def test_server_timing_reports_sections(self):
+        response = self.get_fresh({'fields': 'overview,recent_reviews'})
+        parts = {part.split(';')[0] for part in response['Server-Timing'].split(', ')}
+        self.assertEqual(parts, {'daily', 'customer_metrics', 'overview', 'recent_reviews', 'total'})
+
+        # Cache hits only report the lookup, not the stored compute time
+        response = self.client.get(self.url, {'fields': 'overview,recent_reviews'})
+        self.assertEqual(response['X-Analytics-Cache'], 'fresh')
+        self.assertEqual(response['Server-Timing'].split(';')[0], 'cache')
+
+    def test_server_timing_hidden_without_debug(self):
+        self.assertFalse(self.get_fresh().has_header('Server-Timing'))
+
+
+class ParallelDashboardSectionsTestCase(DashboardSectionsMixin, TransactionTestCase):
+    def setUp(self):
+        self.seed_dashboard()
+
+    def test_parallel_sections_match_sequential(self):
+        fields = {'fields': ','.join(analytics.DASHBOARD_SECTIONS)}
+        with mock.patch.object(analytics, 'DASHBOARD_SECTION_WORKERS', 1):
+            sequential = self.get_fresh(fields).data
+
+        threads = set()
+        run_timed = analytics._run_timed
+
+        def record_thread(*args):
+            threads.add(threading.current_thread().name)
+            return run_timed(*args)
+
+        with mock.patch.object(analytics, '_run_timed', side_effect=record_thread):
+            parallel = self.get_fresh(fields).data
+
+        self.assertEqual(parallel, sequential)
+        self.assertTrue(any(name.startswith('dashboard-section') for name in threads))
@@ -0,0 +1,68 @@
+# base/test/test_exports.py
+import csv
+import json
+from datetime import time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from base.models import Booking
+from base.test.helpers import BusinessFixtures
+
+
+class BookingExportTestCase(BusinessFixtures, APITestCase):
+    def setUp(self):
+        self.owner = self.create_owner()
+        customer = self.create_customer(first_name='Jane', last_name='Doe')
+        self.user = customer.user
+        self.today = timezone.now().date()
+        for index, owner in enumerate((self.owner, self.create_owner('other@test.com'))):
+            business = self.create_business(owner, index)
+            service = self.create_service(business)
+            for days in range(5):
+                Booking.objects.create(
+                    business=business, customer=customer, service=service,
+                    booking_date=self.today - timedelta(days=days), start_time=time(10, 0),
+                    end_time=time(11, 0), total_price=Decimal('25.50'),
+                    status='completed' if days % 2 else 'confirmed'
+                )
+        self.url = reverse('base:booking-export')
+        self.client.force_authenticate(user=self.owner)
+
+    def content(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_covers_the_owners_bookings(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(StringIO(self.content(response))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual({row['business'] for row in rows}, {'Business 0'})
+        self.assertEqual(rows[0]['booking_date'], self.today.isoformat())
+        self.assertEqual(rows[0]['customer_last_name'], 'Doe')
+        self.assertEqual(rows[0]['total_price'], '25.50')
+
+    def test_ndjson_export_applies_list_filters(self):
+        response = self.client.get(self.url, {
+            'output': 'ndjson', 'status': 'confirmed',
+            'start_date': (self.today - timedelta(days=2)).isoformat(), 'end_date': self.today.isoformat(),
+        })
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(
+            [row['booking_date'] for row in rows],
+            [self.today.isoformat(), (self.today - timedelta(days=2)).isoformat()]
+        )
+        self.assertEqual(rows[0]['customer_email'], 'customer@test.com')
+
+    def test_export_is_for_owners(self):
+        self.assertEqual(self.client.get(self.url, {'output': 'xml'}).status_code, 400)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -0,0 +1,109 @@
+# base/test/test_heatmap.py
+from datetime import time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.heatmap import booking_heatmap, count_heatmap
+from base.models import Booking, BookingHeatmap
+from base.test.helpers import BusinessTestCase
+
+
+class BookingHeatmapTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.now().date()
+
+    def book(self, days, hour, **kwargs):
+        return Booking.objects.create(
+            business=self.business, customer=self.customer, service=self.service,
+            booking_date=self.today + timedelta(days=days), start_time=time(hour, 0),
+            end_time=time(hour + 1, 0), total_price=Decimal('25.00'), **kwargs
+        )
+
+    def stored(self):
+        return {
+            heatmap.month: heatmap.counts
+            for heatmap in BookingHeatmap.objects.filter(business=self.business)
+        }
+
+    def test_cells_follow_booking_lifecycle(self):
+        booking = self.book(0, 9)
+        self.book(0, 9, status='confirmed')
+        weekday = self.today.weekday()
+        counts = self.stored()[self.today.replace(day=1)]
+        self.assertEqual(counts[weekday][9], 2)
+        self.assertEqual(sum(map(sum, counts)), 2)
+
+        booking.start_time = time(15, 0)
+        booking.end_time = time(16, 0)
+        booking.save()
+        counts = self.stored()[self.today.replace(day=1)]
+        self.assertEqual((counts[weekday][9], counts[weekday][15]), (1, 1))
+
+        booking.delete()
+        Booking.objects.get().delete()
+        self.assertEqual(self.stored(), {})
+
+    def test_window_matches_aggregation(self):
+        for days in range(-130, 10, 3):
+            self.book(days, 8 + days % 11)
+
+        incremental = self.stored()
+        BookingHeatmap.objects.all().delete()
+        call_command('rebuild_booking_heatmaps', stdout=StringIO())
+        self.assertEqual(self.stored(), incremental)
+
+        bookings = Booking.objects.filter(business=self.business)
+        for start, end in ((-90, 0), (-130, 9), (-5, -2), (-60, -31)):
+            start, end = self.today + timedelta(days=start), self.today + timedelta(days=end)
+            with self.subTest(start=start, end=end):
+                self.assertEqual(
+                    booking_heatmap(self.business.id, start, end),
+                    count_heatmap(bookings.filter(booking_date__range=(start, end)))
+                )
+
+        # An open end reaches the last booking
+        start = self.today - timedelta(days=90)
+        self.assertEqual(
+            booking_heatmap(self.business.id, start),
+            count_heatmap(bookings.filter(booking_date__gte=start))
+        )
+
+    def test_whole_months_are_read_from_stored_heatmaps(self):
+        self.book(-70, 10)
+        self.book(-40, 11)
+        self.book(-20, 12)
+        first = (self.today.replace(day=1) - timedelta(days=1)).replace(day=1)
+        last = self.today.replace(day=1) - timedelta(days=1)
+
+        with self.assertNumQueries(1):
+            matrix = booking_heatmap(self.business.id, first, last)
+        self.assertEqual(sum(map(sum, matrix)), Booking.objects.filter(booking_date__range=(first, last)).count())
+
+    def test_deletes_never_create_heatmaps(self):
+        booking = self.book(-3, 10)
+        # As when a cascade deletes the heatmaps before the booking
+        BookingHeatmap.objects.all().delete()
+
+        booking.delete()
+        self.assertEqual(self.stored(), {})
+
+    def test_dashboard_trends_read_stored_heatmaps(self):
+        for days in (-100, -80, -45, -3, 0, 4):
+            self.book(days, 10 + days % 5)
+        client = APIClient()
+        client.force_authenticate(user=self.owner)
+
+        response = client.get(
+            reverse('base:business-dashboard', kwargs={'slug': self.business.slug}),
+            {'fields': 'trends'}
+        )
+        self.assertEqual(response.status_code, 200)
+        # Bookings of the last 90 days and later ones
+        self.assertEqual(sum(hour['count'] for hour in response.data['bookings_by_hour']), 5)
+        self.assertEqual(sum(day['count'] for day in response.data['bookings_by_weekday']), 5)
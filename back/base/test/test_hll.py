@@ -0,0 +1,120 @@
+# base/test/test_hll.py
+import uuid
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.hll import STANDARD_ERROR, HyperLogLog
+from base.models import Booking, CustomerSketch
+from base.sketches import approximate_customers, rebuild_customer_sketches
+from base.test.helpers import BusinessFixtures
+
+
+def customer_ids(count, offset=0):
+    return [uuid.uuid5(uuid.NAMESPACE_OID, str(index)) for index in range(offset, offset + count)]
+
+
+class HyperLogLogTestCase(SimpleTestCase):
+    def test_estimates_within_error_bound(self):
+        # Three standard errors; small sets are counted (nearly) exactly
+        for count in (10, 100, 1000, 10000, 50000):
+            sketch = HyperLogLog()
+            for customer_id in customer_ids(count):
+                sketch.add(customer_id)
+            with self.subTest(count=count):
+                self.assertLessEqual(abs(sketch.count() - count), max(3 * STANDARD_ERROR * count, 1))
+
+    def test_merge_counts_union(self):
+        first, second, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for customer_id in customer_ids(3000):
+            first.add(customer_id)
+            both.add(customer_id)
+        for customer_id in customer_ids(3000, offset=2000):
+            second.add(customer_id)
+            both.add(customer_id)
+
+        merged = HyperLogLog.union([first, second.to_bytes()])
+        self.assertEqual(merged.to_bytes(), both.to_bytes())
+        self.assertLessEqual(abs(merged.count() - 5000), 3 * STANDARD_ERROR * 5000)
+
+    def test_duplicates_do_not_change_sketch(self):
+        sketch = HyperLogLog()
+        self.assertTrue(sketch.add('customer'))
+        self.assertFalse(sketch.add('customer'))
+        self.assertEqual(sketch.count(), 1)
+
+
+class CustomerSketchTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customers = [self.create_customer(f'customer{index}@test.com') for index in range(4)]
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
+
+    def book(self, day, customer):
+        return Booking.objects.create(
+            business=self.business, customer=self.customers[customer], service=self.service,
+            booking_date=day, start_time=time(10, 0), end_time=time(11, 0),
+            total_price=Decimal('25.00')
+        )
+
+    def test_windows_merge_months_and_edge_days(self):
+        self.book(date(2026, 1, 31), 0)
+        self.book(date(2026, 2, 10), 1)
+        self.book(date(2026, 3, 1), 2)
+        self.book(date(2026, 3, 15), 0)
+        self.book(date(2026, 4, 2), 3)
+
+        windows = {
+            (None, None): 4,
+            (date(2026, 2, 1), date(2026, 3, 31)): 3,
+            (date(2026, 1, 31), date(2026, 3, 1)): 3,
+            (date(2026, 2, 11), date(2026, 3, 14)): 1,
+            (date(2026, 3, 2), None): 2,
+            (None, date(2026, 2, 28)): 2,
+        }
+        for (start, end), expected in windows.items():
+            with self.subTest(start=start, end=end):
+                self.assertEqual(approximate_customers(self.business.id, start, end), expected)
+
+        # A yearly window reads month sketches plus its edge days
+        with self.assertNumQueries(1):
+            approximate_customers(self.business.id, date(2025, 4, 16), date(2026, 4, 15))
+
+    def test_rebuild_matches_incremental(self):
+        today = timezone.now().date()
+        for days, customer in ((-40, 0), (-3, 1), (-3, 2), (0, 1)):
+            self.book(today + timedelta(days=days), customer)
+        incremental = {
+            (sketch.period, sketch.start_date): bytes(sketch.registers)
+            for sketch in CustomerSketch.objects.all()
+        }
+
+        self.assertEqual(rebuild_customer_sketches(), len(incremental))
+        self.assertEqual({
+            (sketch.period, sketch.start_date): bytes(sketch.registers)
+            for sketch in CustomerSketch.objects.all()
+        }, incremental)
+
+    def test_approximate_mode_matches_exact_counts(self):
+        today = timezone.now().date()
+        for days, customer in ((-400, 3), (-40, 0), (-10, 1), (-3, 2), (-3, 1)):
+            self.book(today + timedelta(days=days), customer)
+
+        client = APIClient()
+        client.force_authenticate(user=self.owner)
+        for name in ('business-stats', 'business-dashboard'):
+            url = reverse(f'base:{name}', kwargs={'slug': self.business.slug})
+            exact = client.get(url, {'period': 'year', 'approximate': 'false'}).data
+            approximate = client.get(url, {'period': 'year', 'approximate': 'true'}).data
+            with self.subTest(endpoint=name):
+                self.assertEqual(
+                    approximate.get('customers', approximate.get('total_customers')),
+                    exact.get('customers', exact.get('total_customers'))
+                )
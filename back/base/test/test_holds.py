@@ -0,0 +1,88 @@
+# base/test/test_holds.py
+from datetime import time, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.holds import reap_expired_holds
+from base.models import Booking, SlotHold
+from base.test.helpers import BusinessFixtures
+from base.utils import calculate_available_slots
+
+
+class SlotHoldTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer_user = self.create_user('customer@test.com')
+        self.other_user = self.create_user('other@test.com')
+        self.business = self.create_business(self.create_owner())
+        self.create_hours(self.business, closing_time=time(12, 0))
+        self.service = self.create_service(self.business, price=30)
+        self.day = timezone.now().date() + timedelta(days=2)
+        self.client = APIClient()
+
+    def place_hold(self, user, hour=10):
+        self.client.force_authenticate(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('base:slothold-list'), {
+                'service_id': str(self.service.id),
+                'booking_date': self.day.isoformat(),
+                'start_time': f'{hour:02d}:00',
+            }, format='json')
+
+    def start_times(self):
+        return [
+            slot['start_time']
+            for slot in calculate_available_slots(self.business, self.service, self.day)
+        ]
+
+    def test_hold_counts_against_capacity(self):
+        self.assertIn('10:00', self.start_times())
+
+        response = self.place_hold(self.customer_user)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['end_time'], '11:00:00')
+        self.assertNotIn('10:00', self.start_times())
+
+        response = self.place_hold(self.other_user)
+        self.assertEqual(response.status_code, 400)
+
+    def test_confirm_turns_hold_into_booking(self):
+        hold_id = self.place_hold(self.customer_user).data['id']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('base:booking-confirm-hold'), {'hold_id': hold_id}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(SlotHold.objects.exists())
+        booking = Booking.objects.get()
+        self.assertEqual((booking.start_time, booking.end_time), (time(10, 0), time(11, 0)))
+        self.assertNotIn('10:00', self.start_times())
+
+        response = self.client.post(
+            reverse('base:booking-confirm-hold'), {'hold_id': hold_id}, format='json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_expired_holds_are_ignored_and_reaped_in_bulk(self):
+        self.place_hold(self.customer_user, hour=9)
+        self.place_hold(self.customer_user, hour=10)
+        SlotHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        cache.clear()
+
+        self.assertIn('10:00', self.start_times())
+
+        self.client.force_authenticate(user=self.customer_user)
+        hold_id = SlotHold.objects.first().id
+        response = self.client.post(
+            reverse('base:booking-confirm-hold'), {'hold_id': str(hold_id)}, format='json'
+        )
+        self.assertEqual(response.status_code, 410)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(reap_expired_holds(), 2)
@@ -0,0 +1,33 @@
+# base/test/test_imports.py
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from base.management.commands.benchmark_imports import parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       300 |        420 | json
+import time:        50 |         50 |     base.hll
+import time:       200 |        250 |   base.sketches
+import time:       400 |        650 | base.urls
+"""
+
+
+class StartupImportsTestCase(SimpleTestCase):
+    def test_parse_importtime(self):
+        modules, total = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual(modules['base.sketches'], 250)
+        self.assertEqual(modules['json'], 420)
+        self.assertEqual(total, 1070)
+
+    def test_charting_packages_load_on_first_use(self):
+        out = StringIO()
+        call_command('benchmark_imports', '--repeat', '1', stdout=out)
+        self.assertIn('Startup imports took', out.getvalue())
+
+        with self.assertRaisesMessage(CommandError, 'Imported at startup: django'):
+            call_command('benchmark_imports', '--repeat', '1', '--lazy', 'django', stdout=StringIO())
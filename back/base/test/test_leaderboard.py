@@ -0,0 +1,109 @@
+# base/test/test_leaderboard.py
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count, Q, Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from base.leaderboard import top_customers
+from base.models import Booking, Customer, LeaderboardEntry
+from base.test.helpers import BusinessFixtures
+
+
+def aggregate_top_customers(business, start_date, limit=10):
+    """The aggregate-and-sort query the leaderboard replaces"""
+    customers = Customer.objects.filter(
+        bookings__business=business,
+        bookings__booking_date__gte=start_date
+    ).select_related('user').annotate(
+        booking_count=Count('bookings'),
+        calculated_spent=Sum('bookings__total_price', filter=Q(bookings__is_paid=True))
+    ).order_by('-calculated_spent')[:limit]
+    return [
+        {
+            'id': str(customer.id),
+            'name': customer.user.full_name,
+            'email': customer.user.email,
+            'bookings': customer.booking_count,
+            'total_spent': float(customer.calculated_spent or 0)
+        }
+        for customer in customers
+    ]
+
+
+class LeaderboardTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customers = [
+            self.create_customer(f'customer{index}@test.com', first_name=f'Customer{index}')
+            for index in range(14)
+        ]
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
+        self.today = timezone.now().date()
+
+    def book(self, days, customer, price, **kwargs):
+        return Booking.objects.create(
+            business=self.business, customer=self.customers[customer], service=self.service,
+            booking_date=self.today + timedelta(days=days), start_time=time(10, 0),
+            end_time=time(11, 0), total_price=Decimal(price), **kwargs
+        )
+
+    def seed(self):
+        # Distinct totals per window so both rankings are unambiguous
+        for index in range(14):
+            self.book(-(index * 13 % 200), index, f'{10 + index * 7}.00', is_paid=True)
+            self.book(-(index * 29 % 120) - 1, index, f'{3 + index * 11}.50', is_paid=index % 3 != 0)
+            self.book(index % 5, index, '1.25', is_paid=index % 2 == 0)
+
+        # Lifecycle changes the buckets have to follow
+        moved = self.book(-100, 3, '400.00')
+        moved.is_paid = True
+        moved.booking_date = self.today - timedelta(days=2)
+        moved.save()
+        self.book(-5, 12, '999.00', is_paid=True).delete()
+        cancelled = self.book(-45, 7, '80.00', is_paid=True)
+        cancelled.status = 'cancelled'
+        cancelled.save()
+
+    def test_matches_aggregate_query(self):
+        self.seed()
+        for days in (7, 30, 45, 90, 365):
+            start_date = self.today - timedelta(days=days)
+            with self.subTest(days=days):
+                self.assertEqual(
+                    top_customers(self.business.id, start_date),
+                    aggregate_top_customers(self.business, start_date)
+                )
+        self.assertEqual(
+            top_customers(self.business.id, self.today.replace(day=1), limit=5),
+            aggregate_top_customers(self.business, self.today.replace(day=1), limit=5)
+        )
+
+    def test_rebuild_matches_incremental(self):
+        self.seed()
+        incremental = set(LeaderboardEntry.objects.values_list('customer_id', 'month', 'bookings', 'paid_value'))
+        LeaderboardEntry.objects.all().delete()
+
+        call_command('rebuild_leaderboard', stdout=open('/dev/null', 'w'))
+        self.assertEqual(
+            set(LeaderboardEntry.objects.values_list('customer_id', 'month', 'bookings', 'paid_value')),
+            incremental
+        )
+
+    def test_reads_buckets_not_bookings(self):
+        self.seed()
+        with self.assertNumQueries(4):
+            top_customers(self.business.id, self.today - timedelta(days=90))
+
+    def test_deletes_never_create_entries(self):
+        booking = self.book(-3, 0, '25.00', is_paid=True)
+        # As when a cascade deletes the entries before the booking
+        LeaderboardEntry.objects.all().delete()
+
+        booking.delete()
+        self.assertFalse(LeaderboardEntry.objects.exists())
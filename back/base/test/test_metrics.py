@@ -0,0 +1,75 @@
+# base/test/test_metrics.py
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.metrics import booked_between, booking_metrics
+from base.models import Booking
+from base.test.helpers import BusinessFixtures
+
+
+class BookingMetricsTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customers = [self.create_customer(f'customer{index}@test.com') for index in range(3)]
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
+        self.today = timezone.now().date()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def book(self, days, customer=0, **kwargs):
+        return Booking.objects.create(
+            business=self.business, customer=self.customers[customer], service=self.service,
+            booking_date=self.today + timedelta(days=days), start_time=time(10, 0),
+            end_time=time(11, 0), total_price=Decimal('25.00'), **kwargs
+        )
+
+    def seed(self, count):
+        for index in range(count):
+            self.book(-(index % 60) - 40, customer=index % 3, is_paid=index % 2 == 0,
+                      status=['pending', 'confirmed', 'completed'][index % 3])
+
+    def test_windows_computed_in_one_query(self):
+        self.book(-2, is_paid=True, status='confirmed')
+        self.book(-2, customer=1, is_paid=True)
+        self.book(-20, customer=1, status='completed')
+
+        with self.assertNumQueries(1):
+            metrics = booking_metrics(self.business, {
+                'recent': (booked_between(self.today - timedelta(days=7)), ['bookings', 'revenue', 'paid_revenue']),
+                'all_time': (Q(), ['customers', 'confirmed_bookings', 'average_paid_value']),
+            })
+
+        self.assertEqual(metrics['recent'], {
+            'bookings': 2, 'revenue': Decimal('25.00'), 'paid_revenue': Decimal('50.00')
+        })
+        self.assertEqual(metrics['all_time']['customers'], 2)
+        self.assertEqual(metrics['all_time']['confirmed_bookings'], 2)
+        self.assertEqual(metrics['all_time']['average_paid_value'], Decimal('25.00'))
+
+    def test_endpoint_query_counts_do_not_grow(self):
+        endpoints = {
+            'stats': (reverse('base:business-stats', kwargs={'slug': self.business.slug}), {'period': 'year'}),
+            'revenue_data': (reverse('base:business-revenue-data', kwargs={'slug': self.business.slug}), {}),
+            'revenue_report': (reverse('base:business-revenue-report', kwargs={'slug': self.business.slug}), {'period': 'quarter'}),
+            'dashboard': (reverse('base:business-dashboard', kwargs={'slug': self.business.slug}), {}),
+        }
+        expected = {'stats': 2, 'revenue_data': 2, 'revenue_report': 9, 'dashboard': 8}
+
+        for count in (3, 30):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.seed(count)
+            for name, (url, params) in endpoints.items():
+                # Measure a full computation, not a cached snapshot
+                cache.clear()
+                with self.subTest(endpoint=name, bookings=count), self.assertNumQueries(expected[name]):
+                    response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, 200)
@@ -0,0 +1,86 @@
+# base/test/test_pagination.py
+import base64
+import json
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import Booking, Notification
+from base.test.helpers import BusinessTestCase
+
+
+class KeysetPaginationTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        # Several bookings share a day and start time, so pages break on ``id``
+        today = timezone.now().date()
+        for index in range(45):
+            Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=today - timedelta(days=index % 4), start_time=time(9 + index % 3, 0),
+                end_time=time(10 + index % 3, 0), total_price=Decimal('25.00')
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, url, params):
+        """Follow ``next`` links, returning every id and the queries each page ran"""
+        ids, queries = [], []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            if not response.data['next']:
+                return ids, queries
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(response.data['next'])
+            queries.append(captured)
+
+    def expected(self, queryset, *ordering):
+        return [str(pk) for pk in queryset.order_by(*ordering).values_list('pk', flat=True)]
+
+    def test_cursor_pages_cover_the_ordering(self):
+        today = timezone.now().date()
+        lists = {
+            'booking-list': (Booking.objects.all(), 2),
+            'booking-history': (Booking.objects.filter(booking_date__lt=today), 1),
+        }
+        for name, (bookings, pages) in lists.items():
+            ids, queries = self.walk(reverse(f'base:{name}'), {'pagination': 'cursor', 'fields': 'id'})
+            with self.subTest(name=name):
+                self.assertEqual(ids, self.expected(bookings, '-booking_date', '-start_time', 'id'))
+                self.assertEqual(len(queries), pages)
+                for captured in queries:
+                    self.assertFalse([query for query in captured if 'COUNT(' in query['sql']])
+                    self.assertFalse([query for query in captured if 'OFFSET' in query['sql']])
+
+        for booking in Booking.objects.all()[:25]:
+            Notification.objects.create(user=self.user, title='Booked', message='Booked', booking=booking)
+        ids, _ = self.walk(reverse('base:notification-list'), {'pagination': 'cursor'})
+        self.assertEqual(ids, self.expected(Notification.objects, '-created_at', 'id'))
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get(reverse('base:booking-list'))
+        self.assertEqual(response.data['count'], 45)
+        self.assertIsNone(response.data['previous'])
+
+    def test_forged_cursors_are_not_found(self):
+        booking_id = str(Booking.objects.values_list('pk', flat=True).first())
+        for position in (
+            'bad',
+            ['2026-01-01', '10:00:00'],
+            ['2026-13-45', '10:00:00', booking_id],
+            ['x', {}, 3],
+            ['2026-01-01', '10:00:00', 'not-a-uuid'],
+        ):
+            cursor = position if isinstance(position, str) else (
+                base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            )
+            response = self.client.get(reverse('base:booking-list'), {'pagination': 'cursor', 'cursor': cursor})
+            with self.subTest(position=position):
+                self.assertEqual(response.status_code, 404)
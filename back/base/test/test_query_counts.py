@@ -0,0 +1,101 @@
+# base/test/test_query_counts.py
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import Booking, Notification, Review
+from base.test.helpers import BusinessFixtures
+
+# Endpoint -> (user, URL name, URL kwargs, query params, most queries allowed)
+ENDPOINTS = {
+    'business list': ('customer', 'business-list', {}, {}, 4),
+    'business detail': ('customer', 'business-detail', {'slug': 'business-0'}, {}, 3),
+    'business search': ('customer', 'business-search', {}, {'sort_by': 'rating'}, 4),
+    'featured businesses': ('customer', 'business-featured', {}, {}, 3),
+    'my businesses': ('owner', 'business-my', {}, {}, 3),
+    'booking list': ('customer', 'booking-list', {}, {}, 2),
+    'full booking list': ('customer', 'booking-list', {}, {'view': 'full'}, 7),
+    'upcoming bookings': ('customer', 'booking-upcoming', {}, {}, 2),
+    'booking history': ('customer', 'booking-history', {}, {}, 2),
+    'customer list': ('owner', 'customer-list', {}, {}, 5),
+    'customer profile': ('customer', 'customer-me', {}, {}, 5),
+    'customer booking history': ('customer', 'customer-booking-history', {'pk': None}, {}, 9),
+    'review list': ('customer', 'review-list', {}, {}, 7),
+    'notification list': ('customer', 'notification-list', {}, {}, 9),
+    'recent activity': ('owner', 'business-recent-activity', {'slug': 'business-0'}, {}, 4),
+    'dashboard recent items': (
+        'owner', 'business-dashboard', {'slug': 'business-0'},
+        {'fields': 'recent_bookings,recent_reviews'}, 14
+    ),
+}
+
+
+class QueryCountTestCase(BusinessFixtures, TestCase):
+    """Query counts of read endpoints must not grow with the number of objects listed"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customer = self.create_customer()
+        self.user = self.customer.user
+        self.today = timezone.now().date()
+        self.businesses = []
+        self.clients = {}
+        for name, user in (('owner', self.owner), ('customer', self.user)):
+            self.clients[name] = APIClient()
+            self.clients[name].force_authenticate(user=user)
+
+    def seed(self, count):
+        """Add ``count`` businesses, each booked, reviewed and favourited by the customer"""
+        for _ in range(count):
+            index = len(self.businesses)
+            business = self.create_business(self.owner, index)
+            self.businesses.append(business)
+            self.create_hours(business)
+            service = self.create_service(business)
+            self.customer.preferred_businesses.add(business)
+            for days in (-3, 3):
+                booking = Booking.objects.create(
+                    business=self.businesses[0] if days < 0 else business, customer=self.customer,
+                    service=service, booking_date=self.today + timedelta(days=days),
+                    start_time=time(9 + index % 8, 0), end_time=time(10 + index % 8, 14),
+                    total_price=Decimal('25.00')
+                )
+                Notification.objects.create(
+                    user=self.user, title='Booked', message='Booked', booking=booking, business=business
+                )
+            for _ in range(5):
+                Review.objects.create(
+                    business=business, customer=self.customer, rating=5, title='Great', comment='Great'
+                )
+            Review.objects.create(
+                business=self.businesses[0], customer=self.customer, rating=4, title='Good', comment='Good'
+            )
+
+    def count_queries(self, user, name, kwargs, params):
+        cache.clear()
+        kwargs = {key: value or self.customer.pk for key, value in kwargs.items()}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.clients[user].get(reverse(f'base:{name}', kwargs=kwargs), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return len(queries)
+
+    def test_read_endpoints_have_fixed_query_counts(self):
+        self.seed(2)
+        few = {
+            endpoint: self.count_queries(*spec[:4])
+            for endpoint, spec in ENDPOINTS.items()
+        }
+        self.seed(4)
+        for endpoint, (*spec, limit) in ENDPOINTS.items():
+            many = self.count_queries(*spec)
+            with self.subTest(endpoint=endpoint):
+                self.assertEqual(many, few[endpoint])
+                self.assertLessEqual(many, limit)
@@ -0,0 +1,91 @@
+# base/test/test_ratings.py
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from base.models import Business, BusinessRatingStats, Review
+from base.ratings import rebuild_rating_stats
+from base.test.helpers import BusinessFixtures
+
+
+class RatingStatsTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customer = self.create_customer()
+        self.businesses = [self.create_business(self.owner, index) for index in range(3)]
+
+    def review(self, business, rating):
+        return Review.objects.create(
+            business=self.businesses[business], customer=self.customer,
+            rating=rating, title='Review', comment='Review'
+        )
+
+    def stats(self, business):
+        return BusinessRatingStats.objects.get(business=self.businesses[business])
+
+    def test_totals_follow_review_writes(self):
+        first = self.review(0, 5)
+        self.review(0, 3)
+        stats = self.stats(0)
+        self.assertEqual((stats.rating_sum, stats.rating_count), (8, 2))
+        self.assertEqual(stats.histogram, {1: 0, 2: 0, 3: 1, 4: 0, 5: 1})
+
+        first.rating = 1
+        first.save()
+        first.business = self.businesses[1]
+        first.save()
+        stats = self.stats(0)
+        self.assertEqual((stats.rating_sum, stats.rating_count, stats.rating_1), (3, 1, 0))
+        self.assertEqual(self.stats(1).histogram[1], 1)
+
+        first.delete()
+        self.assertEqual(self.stats(1).rating_count, 0)
+
+        self.review(2, 4)
+        incremental = [
+            (row.business_id, row.rating_sum, row.rating_count, row.histogram)
+            for row in BusinessRatingStats.objects.filter(rating_count__gt=0).order_by('business_id')
+        ]
+        self.assertEqual(rebuild_rating_stats(), 2)
+        self.assertEqual(incremental, [
+            (row.business_id, row.rating_sum, row.rating_count, row.histogram)
+            for row in BusinessRatingStats.objects.order_by('business_id')
+        ])
+
+    def test_listings_read_stored_ratings(self):
+        for rating in (5, 5, 4, 5, 4):
+            self.review(0, rating)
+        for rating in (3, 4):
+            self.review(1, rating)
+
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('base:business-featured'))
+        self.assertFalse([query for query in queries if '"reviews"' in query['sql']])
+        self.assertEqual([business['slug'] for business in response.data], ['business-0'])
+        self.assertEqual(response.data[0]['average_rating'], 4.6)
+        self.assertEqual(response.data[0]['total_reviews'], 5)
+
+        response = client.get(reverse('base:business-search'), {'sort_by': 'rating'})
+        self.assertEqual(
+            [business['slug'] for business in response.data['results']],
+            ['business-0', 'business-1', 'business-2']
+        )
+        response = client.get(reverse('base:business-search'), {'rating': '4'})
+        self.assertEqual([business['slug'] for business in response.data['results']], ['business-0'])
+
+    def test_deletes_never_create_totals(self):
+        review = self.review(0, 4)
+        BusinessRatingStats.objects.all().delete()
+        review.delete()
+        self.assertFalse(BusinessRatingStats.objects.exists())
+
+        # The cascade deletes the totals before the reviews
+        self.review(1, 5)
+        self.businesses[1].delete()
+        self.assertFalse(Business.objects.filter(slug='business-1').exists())
+        self.assertFalse(BusinessRatingStats.objects.exists())
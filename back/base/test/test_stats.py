@@ -0,0 +1,148 @@
+# base/test/test_stats.py
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import (
+    Booking, BookingHeatmap, Business, BusinessDailyStats, BusinessRatingStats, CohortActivity,
+    CustomerCohort, LeaderboardEntry, Review, SlotCapacity
+)
+from base.stats import rebuild_daily_stats
+from base.test.helpers import BusinessFixtures
+
+COMPARED_FIELDS = (
+    'date', 'total_bookings', 'pending_bookings', 'confirmed_bookings', 'completed_bookings',
+    'cancelled_bookings', 'no_show_bookings', 'paid_revenue', 'confirmed_revenue',
+    'new_customers', 'returning_customers', 'bookings_by_hour'
+)
+
+
+class DailyStatsTestCase(BusinessFixtures, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = self.create_owner()
+        self.customers = [self.create_customer(f'customer{index}@test.com') for index in range(2)]
+        self.business = self.create_business(self.owner)
+        self.service = self.create_service(self.business)
+        self.today = timezone.now().date()
+
+    def book(self, days=0, hour=10, customer=0, **kwargs):
+        return Booking.objects.create(
+            business=self.business, customer=self.customers[customer], service=self.service,
+            booking_date=self.today + timedelta(days=days), start_time=time(hour, 0),
+            end_time=time(hour + 1, 0), total_price=Decimal('25.00'), **kwargs
+        )
+
+    def snapshot(self):
+        return [
+            {field: getattr(row, field) for field in COMPARED_FIELDS}
+            for row in BusinessDailyStats.objects.filter(business=self.business, total_bookings__gt=0)
+        ]
+
+    def test_counters_follow_booking_lifecycle(self):
+        first = self.book(hour=9)
+        second = self.book(hour=14, customer=1, is_paid=True)
+        self.book(hour=14)
+
+        stats = BusinessDailyStats.objects.get(business=self.business, date=self.today)
+        self.assertEqual(stats.total_bookings, 3)
+        self.assertEqual(stats.pending_bookings, 3)
+        self.assertEqual((stats.new_customers, stats.returning_customers), (2, 1))
+        self.assertEqual(stats.paid_revenue, Decimal('25.00'))
+        self.assertEqual(stats.confirmed_revenue, 0)
+        self.assertEqual(stats.bookings_by_hour, {'9': 1, '14': 2})
+
+        second.status = 'confirmed'
+        second.save()
+        first.booking_date = self.today + timedelta(days=1)
+        first.status = 'cancelled'
+        first.save()
+
+        stats.refresh_from_db()
+        self.assertEqual((stats.pending_bookings, stats.confirmed_bookings), (1, 1))
+        self.assertEqual(stats.confirmed_revenue, Decimal('25.00'))
+        self.assertEqual(stats.bookings_by_hour, {'14': 2})
+        moved = BusinessDailyStats.objects.get(business=self.business, date=first.booking_date)
+        self.assertEqual((moved.cancelled_bookings, moved.new_customers), (1, 1))
+
+        # The customer's next booking becomes their first one
+        first.delete()
+        stats.refresh_from_db()
+        self.assertEqual((stats.new_customers, stats.returning_customers), (2, 0))
+
+    def test_rebuild_matches_incremental_rows(self):
+        self.book(days=-3, hour=9, is_paid=True, status='completed')
+        self.book(days=-3, hour=9, customer=1)
+        self.book(days=-1, hour=11, status='no_show')
+        booking = self.book(days=2, hour=16, customer=1, is_paid=True)
+        booking.status = 'confirmed'
+        booking.save()
+
+        incremental = self.snapshot()
+        BusinessDailyStats.objects.update(total_bookings=0, bookings_by_hour={})
+
+        self.assertEqual(rebuild_daily_stats(business_ids=[self.business.id]), 3)
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_bulk_deletes_recount_days(self):
+        first = self.book(days=-2, hour=9)
+        second = self.book(days=-1, hour=10)
+        self.book(days=0, hour=11)
+        self.book(days=0, hour=11, customer=1)
+
+        # The customer's first two bookings go at once, so neither can be
+        # moved against the other
+        Booking.objects.filter(pk__in=[first.pk, second.pk]).delete()
+        incremental = self.snapshot()
+        today = BusinessDailyStats.objects.get(business=self.business, date=self.today)
+        self.assertEqual((today.new_customers, today.returning_customers), (2, 0))
+
+        rebuild_daily_stats(business_ids=[self.business.id])
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_deleting_customers_and_businesses(self):
+        self.book(days=-2, hour=9, is_paid=True, status='confirmed')
+        self.book(days=-1, hour=10, customer=1)
+        self.book(days=0, hour=11)
+        self.book(days=0, hour=11, customer=1)
+        Review.objects.create(
+            business=self.business, customer=self.customers[0], rating=5, title='Great', comment='Great'
+        )
+
+        self.customers[0].user.delete()
+        incremental = self.snapshot()
+        rebuild_daily_stats(business_ids=[self.business.id])
+        self.assertEqual(self.snapshot(), incremental)
+
+        self.owner.delete()
+        self.assertFalse(Business.objects.exists())
+        for model in (
+            BusinessDailyStats, BookingHeatmap, LeaderboardEntry, CohortActivity,
+            CustomerCohort, SlotCapacity, BusinessRatingStats
+        ):
+            with self.subTest(model=model.__name__):
+                self.assertFalse(model.objects.exists())
+
+    def test_dashboard_reads_rollup(self):
+        self.book(days=-5, hour=9, is_paid=True, status='confirmed')
+        self.book(days=-40, hour=10, is_paid=True, status='completed')
+        self.book(days=3, hour=15, customer=1)
+
+        client = APIClient()
+        client.force_authenticate(user=self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('base:business-dashboard', kwargs={'slug': self.business.slug}))
+
+        self.assertEqual(response.status_code, 200)
+        rollup_reads = [query for query in queries if 'business_daily_stats' in query['sql']]
+        self.assertEqual(len(rollup_reads), 1)
+        self.assertEqual(response.data['total_bookings'], 2)
+        self.assertEqual(Decimal(response.data['total_revenue']), Decimal('25.00'))
+        self.assertEqual(sum(month['revenue'] for month in response.data['revenue_by_month']), 50.0)
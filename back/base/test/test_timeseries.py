@@ -0,0 +1,80 @@
+# base/test/test_timeseries.py
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from base.models import Booking
+from base.test.helpers import BusinessTestCase
+from base.timeseries import bucket_starts
+
+
+class BucketStartsTestCase(SimpleTestCase):
+    def test_buckets_cover_range(self):
+        start, end = date(2026, 1, 15), date(2026, 7, 2)
+        self.assertEqual(len(bucket_starts(start, end, 'day')), 169)
+        self.assertEqual(bucket_starts(start, end, 'week')[:2], [date(2026, 1, 12), date(2026, 1, 19)])
+        self.assertEqual(bucket_starts(start, end, 'week')[-1], date(2026, 6, 29))
+        self.assertEqual(
+            bucket_starts(start, end, 'month'),
+            [date(2026, month, 1) for month in range(1, 8)]
+        )
+        self.assertEqual(
+            bucket_starts(start, end, 'quarter'),
+            [date(2026, 1, 1), date(2026, 4, 1), date(2026, 7, 1)]
+        )
+
+
+class TimeSeriesEndpointsTestCase(BusinessTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.now().date()
+        for days, booking_status in [(0, 'confirmed'), (0, 'pending'), (-3, 'cancelled'), (-200, 'confirmed')]:
+            Booking.objects.create(
+                business=self.business, customer=self.customer, service=self.service,
+                booking_date=self.today + timedelta(days=days), start_time=time(10, 0),
+                end_time=time(11, 0), total_price=Decimal('25.00'), status=booking_status,
+                is_paid=True
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_chart_data_year_uses_constant_queries(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('base:booking-chart-data'), {'period': 'year'})
+
+        data = response.data['data']
+        self.assertEqual(len(data), 366)
+        self.assertEqual(data[-1], {
+            'date': self.today.isoformat(), 'confirmed': 1, 'pending': 1, 'cancelled': 0, 'total': 2
+        })
+        # Bookings are filtered by creation date, like before
+        self.assertEqual(sum(day['total'] for day in data), 4)
+
+    def test_revenue_data_by_month(self):
+        response = self.client.get(
+            reverse('base:business-revenue-data', kwargs={'slug': self.business.slug}),
+            {'period': 'month', 'interval': 'month'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['date'], (self.today - timedelta(days=30)).replace(day=1).isoformat())
+        self.assertEqual(sum(bucket['revenue'] for bucket in response.data), 25.0)
+
+    def test_customer_analytics_acquisition(self):
+        response = self.client.get(reverse('base:customer-analytics'), {'period': 'quarter', 'interval': 'week'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(bucket['count'] for bucket in response.data['daily_acquisition']), 1)
+
+    def test_invalid_interval(self):
+        for url in (
+            reverse('base:booking-chart-data'),
+            reverse('base:business-revenue-data', kwargs={'slug': self.business.slug}),
+            reverse('base:customer-analytics'),
+        ):
+            response = self.client.get(url, {'interval': 'hour'})
+            with self.subTest(url=url):
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {'error': 'interval must be one of: day, week, month, quarter'})
@@ -0,0 +1,85 @@
+# base/test/test_vectorized.py
+import random
+import unittest
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from base.availability import open_slots, open_slots_by_day, to_intervals, use_vectorized
+from base.vectorized import NUMPY_AVAILABLE, open_slots_range
+
+
+def random_intervals(rng, count):
+    """Random bookings, including zero-length, overlapping and late ones"""
+    ranges = []
+    for _ in range(count):
+        start = rng.randrange(0, 24 * 60)
+        end = min(start + rng.choice([0, 15, 30, 45, 60, 90, 240]), 24 * 60 - 1)
+        ranges.append((
+            time(start // 60, start % 60),
+            time(end // 60, end % 60, rng.choice([0, 30])),
+            rng.randint(1, 3)
+        ))
+    return to_intervals(ranges)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, 'numpy is not installed')
+class VectorizedParityTestCase(SimpleTestCase):
+    def setUp(self):
+        self.rng = random.Random(20261017)
+        self.days = [date(2030, 1, 1) + timedelta(days=offset) for offset in range(120)]
+        self.weekly_hours = {
+            weekday: SimpleNamespace(
+                opening_time=time(8 + weekday % 3, 0),
+                closing_time=time(17 + weekday % 4, 30),
+                is_closed=weekday == 6
+            )
+            for weekday in range(6)
+        }
+
+    def assert_parity(self, service, intervals):
+        expected = {
+            day: open_slots(self.weekly_hours.get(day.weekday()), service, intervals.get(day, []))
+            for day in self.days
+        }
+        self.assertEqual(open_slots_range(self.weekly_hours, service, self.days, intervals), expected)
+
+    def test_matches_scalar_engine(self):
+        for duration, buffer, capacity in [(60, 0, 1), (45, 15, 1), (30, 5, 3), (90, 0, 5), (15, 0, 2)]:
+            service = SimpleNamespace(
+                duration_minutes=duration,
+                buffer_time_minutes=buffer,
+                max_bookings_per_slot=capacity
+            )
+            intervals = {
+                day: random_intervals(self.rng, self.rng.randint(0, 25))
+                for day in self.days
+                if self.rng.random() < 0.8
+            }
+            with self.subTest(duration=duration, buffer=buffer, capacity=capacity):
+                self.assert_parity(service, intervals)
+
+    def test_empty_range_and_grid(self):
+        service = SimpleNamespace(duration_minutes=600, buffer_time_minutes=0, max_bookings_per_slot=1)
+        self.assert_parity(service, {})
+        self.assertEqual(open_slots_range(self.weekly_hours, service, [], {}), {})
+
+    def test_backend_selection(self):
+        with override_settings(AVAILABILITY_BACKEND='auto'):
+            self.assertFalse(use_vectorized(7))
+            self.assertTrue(use_vectorized(365))
+        with override_settings(AVAILABILITY_BACKEND='numpy'):
+            self.assertTrue(use_vectorized(1))
+        with override_settings(AVAILABILITY_BACKEND='python'):
+            self.assertFalse(use_vectorized(365))
+
+    def test_dispatch_gives_same_result(self):
+        service = SimpleNamespace(duration_minutes=30, buffer_time_minutes=0, max_bookings_per_slot=2)
+        intervals = {day: random_intervals(self.rng, 10) for day in self.days}
+
+        with override_settings(AVAILABILITY_BACKEND='python'):
+            scalar = open_slots_by_day(self.weekly_hours, service, self.days, intervals)
+        with override_settings(AVAILABILITY_BACKEND='numpy'):
+            vectorized = open_slots_by_day(self.weekly_hours, service, self.days, intervals)
+        self.assertEqual(vectorized, scalar)
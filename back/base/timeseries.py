@@ -0,0 +1,77 @@
+# base/timeseries.py
+"""
+Time-bucket aggregation for chart endpoints.
+
+A series is produced by truncating a date/datetime column to day, week,
+month or quarter, grouping on it in a single query, and filling the
+buckets without rows in memory, instead of running one query per day.
+"""
+from datetime import timedelta
+
+from django.db.models import DateField
+from django.db.models.functions import Trunc
+from rest_framework.exceptions import ParseError
+
+INTERVALS = ('day', 'week', 'month', 'quarter')
+
+# Days from a bucket's first day that always land in the next bucket
+BUCKET_STEP_DAYS = {'day': 1, 'week': 7, 'month': 32, 'quarter': 95}
+
+
+def interval_param(params, default='day'):
+    """The ``?interval=`` of a chart request, answered with a 400 when unknown"""
+    interval = params.get('interval', default)
+    if interval not in INTERVALS:
+        raise ParseError({'error': f"interval must be one of: {', '.join(INTERVALS)}"})
+    return interval
+
+
+def bucket_start(day, interval):
+    """First day of the bucket containing ``day`` (weeks start on Monday)"""
+    if interval == 'day':
+        return day
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    if interval == 'quarter':
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    raise ValueError(f'Unknown interval: {interval}')
+
+
+def bucket_starts(start_date, end_date, interval):
+    """Start of every bucket from ``start_date`` to ``end_date`` inclusive"""
+    buckets = []
+    current = bucket_start(start_date, interval)
+    while current <= end_date:
+        buckets.append(current)
+        current = bucket_start(current + timedelta(days=BUCKET_STEP_DAYS[interval]), interval)
+    return buckets
+
+
+def time_series(queryset, field, start_date, end_date, interval='day', **aggregates):
+    """
+    Aggregate ``queryset`` per time bucket of ``field`` in one grouped query.
+
+    ``aggregates`` are named aggregate expressions (give ``Sum`` a
+    ``default`` so they are never None). The queryset should already be
+    limited to the requested range. Returns one ``{'date': bucket start,
+    **aggregates}`` dict per bucket from ``start_date`` to ``end_date``, with
+    empty buckets filled with zeros.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f'Unknown interval: {interval}')
+
+    rows = (
+        queryset.order_by()
+        .annotate(bucket=Trunc(field, interval, output_field=DateField()))
+        .values('bucket')
+        .annotate(**aggregates)
+    )
+    found = {row.pop('bucket'): row for row in rows}
+    empty = dict.fromkeys(aggregates, 0)
+
+    return [
+        {'date': bucket, **found.get(bucket, empty)}
+        for bucket in bucket_starts(start_date, end_date, interval)
+    ]
@@ -9,7 +9,8 @@ from .views import (
     CustomerViewSet,
     ReviewViewSet,
     NotificationViewSet,
-    BusinessHoursViewSet
+    BusinessHoursViewSet,
+    SlotHoldViewSet
 )
 
 app_name = 'base'
@@ -25,6 +26,7 @@ router.register(r'customers', CustomerViewSet, basename='customer')
 router.register(r'reviews', ReviewViewSet, basename='review')
 router.register(r'notifications', NotificationViewSet, basename='notification')
 router.register(r'business-hours', BusinessHoursViewSet, basename='businesshours')
+router.register(r'holds', SlotHoldViewSet, basename='slothold')
 
 # Nested routers for related resources
 businesses_router = nested_routers.NestedDefaultRouter(router, r'businesses', lookup='business')
@@ -67,6 +69,10 @@ urlpatterns = [
          BookingViewSet.as_view({'get': 'history'}), 
          name='booking-history'),
     
+    path('bookings/confirm-hold/', 
+         BookingViewSet.as_view({'post': 'confirm_hold'}), 
+         name='booking-confirm-hold'),
+    
     path('bookings/<uuid:pk>/confirm/', 
          BookingViewSet.as_view({'post': 'confirm'}), 
          name='booking-confirm'),
@@ -96,6 +102,14 @@ urlpatterns = [
          BusinessViewSet.as_view({'get': 'my'}), 
          name='business-my'),
     
+    path('businesses/availability/', 
+         BusinessViewSet.as_view({'get': 'batch_availability'}), 
+         name='business-batch-availability'),
+    
+    path('businesses/availability-cache-stats/', 
+         BusinessViewSet.as_view({'get': 'availability_cache_stats'}), 
+         name='business-availability-cache-stats'),
+    
     path('businesses/<slug:slug>/dashboard/', 
          BusinessViewSet.as_view({'get': 'dashboard'}), 
          name='business-dashboard'),
@@ -120,6 +134,10 @@ urlpatterns = [
          BusinessViewSet.as_view({'get': 'revenue_report'}), 
          name='business-revenue-report'),
     
+    path('businesses/<slug:slug>/cohorts/', 
+         BusinessViewSet.as_view({'get': 'cohorts'}), 
+         name='business-cohorts'),
+    
     path('businesses/<slug:slug>/stats/', 
          BusinessViewSet.as_view({'get': 'stats'}), 
          name='business-stats'),
@@ -204,7 +222,8 @@ from .views import (
     CustomerViewSet,
     ReviewViewSet,
     NotificationViewSet,
-    BusinessHoursViewSet
+    BusinessHoursViewSet,
+    SlotHoldViewSet
 )
 
 app_name = 'base'
@@ -2,51 +2,67 @@
 from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.exceptions import PermissionDenied  # FIX: Added missing import
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Sum, Avg, Q, F, Min, Max
+from django.db.models import Count, Sum, Q, F, Min, Max
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.conf import settings
 from datetime import datetime, timedelta, date
-
-# Make pandas optional for now
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-
-# Make plotly imports optional to avoid dependency issues
-try:
-    import plotly.graph_objs as go
-    import plotly.io as pio
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+from time import perf_counter
 
 from .models import (
     Business, BusinessHours, Service, Customer,
-    Booking, Review, Notification
+    Booking, Review, Notification, SlotHold
 )
 from .serializers import (
     BusinessSerializer, BusinessHoursSerializer,
     ServiceSerializer, CustomerSerializer,
-    BookingSerializer, ReviewSerializer,
-    NotificationSerializer, DashboardSerializer
+    BookingSerializer, BookingListSerializer, ReviewSerializer,
+    NotificationSerializer,
+    SlotHoldSerializer
 )
 from accounts.permissions import (
     IsBusinessOwner, HasActiveSubscription,
     CanCreateBooking
 )
 from .utils import calculate_available_slots, send_booking_reminder, get_available_dates
+from .availability import get_range_availability, MAX_BATCH_DAYS, MAX_BATCH_SERVICES
+from .analytics import AnalyticsError, get_analytics
+from .cache import availability_cache_stats
+from .exports import EXPORT_FORMATS, export_lines
+from .pagination import KeysetPagination
+from .ratings import AVERAGE_RATING
+from .timeseries import interval_param, time_series
+from .holds import (
+    HOLD_TTL, active_holds, lock_business, lock_business_of_service,
+    reap_expired_holds, invalidate_hold_availability
+)
+
+
+class EagerLoadingMixin:
+    """
+    Apply the serializer's ``eager_load`` plan to the querysets of actions
+    that serialize them, so nested objects never load one row at a time
+    """
+    eager_actions = ('list', 'retrieve')
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.eager_actions:
+            queryset = self.get_serializer_class().eager_load(queryset)
+        return queryset
 
 
-class BusinessViewSet(viewsets.ModelViewSet):
+class BusinessViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for Business model with dashboard analytics and charts
     """
-    queryset = Business.objects.filter(is_active=True)
+    queryset = Business.objects.filter(is_active=True).select_related('rating_stats')
     serializer_class = BusinessSerializer
     lookup_field = 'slug'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -54,22 +70,62 @@ class BusinessViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description', 'category', 'city']
     ordering_fields = ['created_at', 'name']
     ordering = ['-created_at']
+    eager_actions = ('list', 'retrieve', 'search', 'featured')
     
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions required
         """
-        if self.action in ['list', 'retrieve', 'available_slots', 'search', 'featured']:
+        if self.action in ['list', 'retrieve', 'available_slots', 'search', 'featured',
+                           'batch_availability']:
             permission_classes = [AllowAny]
         elif self.action == 'create':
             permission_classes = [IsAuthenticated, IsBusinessOwner, HasActiveSubscription]
         elif self.action in ['update', 'partial_update', 'destroy', 'dashboard', 
-                           'analytics_chart', 'revenue_report', 'update_hours']:
+                           'analytics_chart', 'revenue_report', 'update_hours', 'cohorts']:
             permission_classes = [IsAuthenticated, IsBusinessOwner]
+        elif self.action == 'availability_cache_stats':
+            permission_classes = [IsAuthenticated, IsAdminUser]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
     
+    def get_object(self):
+        """Look up (and permission-check) the business once per request"""
+        if not hasattr(self, '_business'):
+            self._business = super().get_object()
+        return self._business
+    
+    def _analytics_response(self, business, name, request):
+        """
+        Respond with the cached analytics snapshot of a business.
+        
+        Outdated snapshots are served as they are while a background refresh
+        recomputes them; ``X-Computed-At`` tells when the data was computed.
+        With DEBUG on, ``Server-Timing`` reports how long each part took when
+        the payload was computed in this request, or the cache lookup otherwise.
+        """
+        start = perf_counter()
+        try:
+            snapshot, state = get_analytics(business, name, request.query_params.dict())
+        except AnalyticsError as e:
+            return Response({'error': str(e)}, status=e.status_code)
+        
+        response = Response(snapshot['payload'])
+        response['X-Computed-At'] = snapshot['computed_at'].isoformat()
+        response['X-Analytics-Cache'] = state
+        if settings.DEBUG:
+            # Stored section timings belong to the request that computed them
+            if state == 'miss':
+                timings = snapshot.get('timings') or {}
+            else:
+                timings = {'cache': round((perf_counter() - start) * 1000, 1)}
+            if timings:
+                response['Server-Timing'] = ', '.join(
+                    f'{part};dur={duration}' for part, duration in timings.items()
+                )
+        return response
+    
     def perform_create(self, serializer):
         """Set the owner to the current user when creating a business"""
         serializer.save(owner=self.request.user)
@@ -82,527 +138,44 @@ class BusinessViewSet(viewsets.ModelViewSet):
         business = self.get_object()
         
         # Verify ownership or admin access
-        if business.owner != request.user and not request.user.is_staff:
+        if business.owner_id != request.user.id and not request.user.is_staff:
             return Response(
                 {'error': 'You do not have permission to view this dashboard'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Date ranges
-        today = timezone.now().date()
-        last_30_days = today - timedelta(days=30)
-        last_90_days = today - timedelta(days=90)
-        last_year = today - timedelta(days=365)
-        
-        # Get bookings for different periods
-        bookings_30 = Booking.objects.filter(
-            business=business,
-            booking_date__gte=last_30_days
-        )
-        bookings_90 = Booking.objects.filter(
-            business=business,
-            booking_date__gte=last_90_days
-        )
-        
-        # Calculate metrics
-        dashboard_data = {
-            # Overview metrics
-            'total_bookings': bookings_30.count(),
-            'total_revenue': float(
-                bookings_30.filter(is_paid=True).aggregate(
-                    total=Sum('total_price')
-                )['total'] or 0
-            ),
-            'total_customers': Customer.objects.filter(
-                bookings__business=business,
-                bookings__booking_date__gte=last_30_days
-            ).distinct().count(),
-            'average_rating': float(
-                business.reviews.aggregate(avg=Avg('rating'))['avg'] or 0
-            ),
-            
-            # Comparison with previous period
-            'bookings_growth': self._calculate_growth(business, 'bookings'),
-            'revenue_growth': self._calculate_growth(business, 'revenue'),
-            
-            # Time series data
-            'bookings_by_date': self._get_bookings_by_date(bookings_30),
-            'revenue_by_month': self._get_revenue_by_month(business),
-            'bookings_by_hour': self._get_bookings_by_hour(bookings_90),
-            'bookings_by_weekday': self._get_bookings_by_weekday(bookings_90),
-            
-            # Service analytics
-            'popular_services': self._get_popular_services(business, last_30_days),
-            'service_revenue': self._get_service_revenue(business, last_30_days),
-            
-            # Customer analytics
-            'customer_demographics': self._get_customer_demographics(business),
-            'top_customers': self._get_top_customers(business, last_90_days),
-            'customer_retention': self._calculate_retention_rate(business),
-            
-            # Recent activity
-            'recent_bookings': BookingSerializer(
-                bookings_30.order_by('-created_at')[:10],
-                many=True
-            ).data,
-            'recent_reviews': ReviewSerializer(
-                business.reviews.order_by('-created_at')[:5],
-                many=True
-            ).data,
-            
-            # Status breakdown
-            'booking_status_breakdown': self._get_booking_status_breakdown(bookings_30),
-            
-            # Forecast
-            'next_week_bookings': self._get_upcoming_bookings(business),
-        }
-        
-        serializer = DashboardSerializer(dashboard_data)
-        return Response(serializer.data)
-    
-    def _calculate_growth(self, business, metric_type):
-        """Calculate growth percentage compared to previous period"""
-        today = timezone.now().date()
-        current_start = today - timedelta(days=30)
-        current_end = today
-        previous_start = today - timedelta(days=60)
-        previous_end = today - timedelta(days=30)
-        
-        if metric_type == 'bookings':
-            current = Booking.objects.filter(
-                business=business,
-                booking_date__range=[current_start, current_end]
-            ).count()
-            previous = Booking.objects.filter(
-                business=business,
-                booking_date__range=[previous_start, previous_end]
-            ).count()
-        else:  # revenue
-            current = Booking.objects.filter(
-                business=business,
-                booking_date__range=[current_start, current_end],
-                is_paid=True
-            ).aggregate(Sum('total_price'))['total_price__sum'] or 0
-            previous = Booking.objects.filter(
-                business=business,
-                booking_date__range=[previous_start, previous_end],
-                is_paid=True
-            ).aggregate(Sum('total_price'))['total_price__sum'] or 0
-        
-        if previous == 0:
-            return 100 if current > 0 else 0
-        return round(((current - previous) / previous) * 100, 2)
-    
-    def _get_bookings_by_date(self, bookings):
-        """Get bookings grouped by date"""
-        data = bookings.values('booking_date').annotate(
-            count=Count('id'),
-            revenue=Sum('total_price', filter=Q(is_paid=True, status__in=['confirmed', 'completed']))
-        ).order_by('booking_date')
-        
-        return [
-            {
-                'date': item['booking_date'].isoformat(),
-                'bookings': item['count'],
-                'revenue': float(item['revenue'] or 0)
-            }
-            for item in data
-        ]
-    
-    def _get_revenue_by_month(self, business):
-        """Get revenue for last 12 months"""
-        today = timezone.now().date()
-        months_data = []
-        
-        for i in range(12):
-            month_end = today.replace(day=1) - timedelta(days=i * 30)
-            month_start = month_end - timedelta(days=30)
-            
-            revenue = Booking.objects.filter(
-                business=business,
-                booking_date__range=[month_start, month_end],
-                is_paid=True,
-                status__in=['confirmed', 'completed']
-            ).aggregate(Sum('total_price'))['total_price__sum'] or 0
-            
-            months_data.append({
-                'month': month_end.strftime('%B %Y'),
-                'revenue': float(revenue)
-            })
-        
-        return list(reversed(months_data))
-    
-    def _get_bookings_by_hour(self, bookings):
-        """Analyze booking patterns by hour of day"""
-        hour_data = {}
-        for booking in bookings:
-            hour = booking.start_time.hour
-            if hour not in hour_data:
-                hour_data[hour] = 0
-            hour_data[hour] += 1
-        
-        return [
-            {'hour': hour, 'count': count}
-            for hour, count in sorted(hour_data.items())
-        ]
-    
-    def _get_bookings_by_weekday(self, bookings):
-        """Analyze booking patterns by day of week"""
-        weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                        'Friday', 'Saturday', 'Sunday']
-        weekday_data = {i: 0 for i in range(7)}
-        
-        for booking in bookings:
-            weekday = booking.booking_date.weekday()
-            weekday_data[weekday] += 1
-        
-        return [
-            {'weekday': weekday_names[day], 'count': count}
-            for day, count in weekday_data.items()
-        ]
-    
-    def _get_popular_services(self, business, start_date):
-        """Get most popular services by booking count"""
-        services = Service.objects.filter(business=business).annotate(
-            booking_count=Count(
-                'bookings',
-                filter=Q(bookings__booking_date__gte=start_date)
-            ),
-            total_revenue=Sum(
-                'bookings__total_price',
-                filter=Q(
-                    bookings__booking_date__gte=start_date,
-                    bookings__is_paid=True
-                )
-            )
-        ).order_by('-booking_count')[:5]
-        
-        return [
-            {
-                'id': str(service.id),
-                'name': service.name,
-                'bookings': service.booking_count,
-                'revenue': float(service.total_revenue or 0),
-                'average_price': float(service.price)
-            }
-            for service in services
-        ]
-    
-    def _get_service_revenue(self, business, start_date):
-        """Get revenue breakdown by service"""
-        services = Service.objects.filter(business=business).annotate(
-            revenue=Sum(
-                'bookings__total_price',
-                filter=Q(
-                    bookings__booking_date__gte=start_date,
-                    bookings__is_paid=True
-                )
-            )
-        ).exclude(revenue=None).order_by('-revenue')
-        
-        return [
-            {
-                'service': service.name,
-                'revenue': float(service.revenue),
-                'percentage': 0  # Calculate after getting total
-            }
-            for service in services
-        ]
-    
-    def _get_customer_demographics(self, business):
-        """Analyze customer demographics"""
-        customers = Customer.objects.filter(
-            bookings__business=business
-        ).distinct()
-        
-        new_customers = customers.filter(
-            created_at__gte=timezone.now() - timedelta(days=30)
-        ).count()
-        
-        returning_customers = customers.annotate(
-            booking_count=Count('bookings')
-        ).filter(booking_count__gt=1).count()
-        
-        return {
-            'total': customers.count(),
-            'new_this_month': new_customers,
-            'returning': returning_customers,
-            'retention_rate': round(
-                (returning_customers / customers.count() * 100) if customers.count() > 0 else 0,
-                2
-            )
-        }
-    
-    def _get_top_customers(self, business, start_date):
-        """Get top customers by booking frequency and spending"""
-        customers = Customer.objects.filter(
-            bookings__business=business,
-            bookings__booking_date__gte=start_date
-        ).annotate(
-            booking_count=Count('bookings'),
-            calculated_spent=Sum(
-                'bookings__total_price',
-                filter=Q(bookings__is_paid=True)
-            )
-        ).order_by('-calculated_spent')[:10]
-        
-        return [
-            {
-                'id': str(customer.id),
-                'name': customer.user.full_name,
-                'email': customer.user.email,
-                'bookings': customer.booking_count,
-                'total_spent': float(customer.calculated_spent or 0)
-            }
-            for customer in customers
-        ]
-    
-    def _calculate_retention_rate(self, business):
-        """Calculate customer retention rate"""
-        today = timezone.now().date()
-        
-        # Customers from 60-90 days ago
-        old_customers = Customer.objects.filter(
-            bookings__business=business,
-            bookings__booking_date__range=[today - timedelta(days=90), today - timedelta(days=60)]
-        ).distinct()
-        
-        # How many of them booked again in last 30 days
-        retained = old_customers.filter(
-            bookings__business=business,
-            bookings__booking_date__gte=today - timedelta(days=30)
-        ).distinct().count()
-        
-        total = old_customers.count()
-        
-        return {
-            'rate': round((retained / total * 100) if total > 0 else 0, 2),
-            'retained': retained,
-            'total': total
-        }
-    
-    def _get_booking_status_breakdown(self, bookings):
-        """Get breakdown of bookings by status"""
-        status_data = bookings.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
-        
-        return [
-            {
-                'status': item['status'],
-                'count': item['count']
-            }
-            for item in status_data
-        ]
-    
-    def _get_upcoming_bookings(self, business):
-        """Get upcoming bookings for next 7 days"""
-        today = timezone.now().date()
-        next_week = today + timedelta(days=7)
-        
-        upcoming = Booking.objects.filter(
-            business=business,
-            booking_date__range=[today, next_week],
-            status__in=['confirmed', 'pending']
-        ).count()
-        
-        return upcoming
+        return self._analytics_response(business, 'dashboard', request)
     
     @action(detail=True, methods=['get'])
     def analytics_chart(self, request, slug=None):
         """
         Generate interactive Plotly charts for business analytics
         """
-        if not PLOTLY_AVAILABLE:
-            return Response(
-                {'error': 'Plotly is not installed. Please install plotly to use charts.'},
-                status=status.HTTP_501_NOT_IMPLEMENTED
-            )
-            
         business = self.get_object()
-        chart_type = request.query_params.get('type', 'bookings')
-        period = request.query_params.get('period', '30')
         
-        try:
-            period_days = int(period)
-        except ValueError:
-            period_days = 30
-        
-        end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=period_days)
-        
-        if chart_type == 'bookings':
-            chart_html = self._generate_bookings_chart(business, start_date, end_date)
-        elif chart_type == 'revenue':
-            chart_html = self._generate_revenue_chart(business, start_date, end_date)
-        elif chart_type == 'services':
-            chart_html = self._generate_services_chart(business, start_date, end_date)
-        elif chart_type == 'customers':
-            chart_html = self._generate_customers_chart(business, start_date, end_date)
-        elif chart_type == 'heatmap':
-            chart_html = self._generate_booking_heatmap(business, start_date, end_date)
-        else:
+        # Check if user owns this business
+        if business.owner_id != request.user.id and not request.user.is_staff:
             return Response(
-                {'error': 'Invalid chart type'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
             )
         
-        return Response({'chart': chart_html})
-    
-    def _generate_bookings_chart(self, business, start_date, end_date):
-        """Generate bookings over time chart"""
-        bookings = Booking.objects.filter(
-            business=business,
-            booking_date__range=[start_date, end_date]
-        ).values('booking_date').annotate(
-            count=Count('id')
-        ).order_by('booking_date')
-        
-        df = pd.DataFrame(bookings)
-        if df.empty:
-            df = pd.DataFrame({'booking_date': [start_date], 'count': [0]})
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['booking_date'],
-            y=df['count'],
-            mode='lines+markers',
-            name='Bookings',
-            line=dict(color='#4CAF50', width=2),
-            marker=dict(size=8)
-        ))
-        
-        fig.update_layout(
-            title='Bookings Over Time',
-            xaxis_title='Date',
-            yaxis_title='Number of Bookings',
-            hovermode='x unified',
-            showlegend=False,
-            template='plotly_white'
-        )
-        
-        return pio.to_html(fig, include_plotlyjs='cdn', div_id="bookings-chart")
+        return self._analytics_response(business, 'analytics_chart', request)
     
-    def _generate_revenue_chart(self, business, start_date, end_date):
-        """Generate revenue over time chart"""
-        revenue_data = Booking.objects.filter(
-            business=business,
-            booking_date__range=[start_date, end_date],
-            is_paid=True
-        ).values('booking_date').annotate(
-            revenue=Sum('total_price')
-        ).order_by('booking_date')
-        
-        df = pd.DataFrame(revenue_data)
-        if df.empty:
-            df = pd.DataFrame({'booking_date': [start_date], 'revenue': [0]})
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=df['booking_date'],
-            y=df['revenue'],
-            name='Revenue',
-            marker_color='#2196F3'
-        ))
-        
-        fig.update_layout(
-            title='Revenue Over Time',
-            xaxis_title='Date',
-            yaxis_title='Revenue ($)',
-            hovermode='x unified',
-            showlegend=False,
-            template='plotly_white'
-        )
+    @action(detail=True, methods=['get'])
+    def cohorts(self, request, slug=None):
+        """
+        Monthly customer cohorts and their retention
+        """
+        business = self.get_object()
         
-        return pio.to_html(fig, include_plotlyjs='cdn', div_id="revenue-chart")
-    
-    def _generate_services_chart(self, business, start_date, end_date):
-        """Generate service popularity pie chart"""
-        services = Service.objects.filter(business=business).annotate(
-            booking_count=Count(
-                'bookings',
-                filter=Q(
-                    bookings__booking_date__range=[start_date, end_date]
-                )
+        if business.owner_id != request.user.id and not request.user.is_staff:
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
             )
-        ).exclude(booking_count=0)
-        
-        labels = [s.name for s in services]
-        values = [s.booking_count for s in services]
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=0.3
-        )])
-        
-        fig.update_layout(
-            title='Service Distribution',
-            template='plotly_white'
-        )
-        
-        return pio.to_html(fig, include_plotlyjs='cdn', div_id="services-chart")
-    
-    def _generate_customers_chart(self, business, start_date, end_date):
-        """Generate new vs returning customers chart"""
-        customers = Customer.objects.filter(
-            bookings__business=business,
-            bookings__booking_date__range=[start_date, end_date]
-        ).distinct()
-        
-        new_customers = customers.filter(
-            created_at__gte=start_date
-        ).count()
-        
-        returning_customers = customers.filter(
-            created_at__lt=start_date
-        ).count()
-        
-        fig = go.Figure(data=[
-            go.Bar(name='New', x=['Customers'], y=[new_customers]),
-            go.Bar(name='Returning', x=['Customers'], y=[returning_customers])
-        ])
-        
-        fig.update_layout(
-            title='New vs Returning Customers',
-            barmode='stack',
-            template='plotly_white'
-        )
         
-        return pio.to_html(fig, include_plotlyjs='cdn', div_id="customers-chart")
-    
-    def _generate_booking_heatmap(self, business, start_date, end_date):
-        """Generate booking heatmap by day and hour"""
-        bookings = Booking.objects.filter(
-            business=business,
-            booking_date__range=[start_date, end_date]
-        )
-        
-        # Create matrix for heatmap
-        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        hours = list(range(24))
-        matrix = [[0 for _ in hours] for _ in days]
-        
-        for booking in bookings:
-            day_idx = booking.booking_date.weekday()
-            hour = booking.start_time.hour
-            matrix[day_idx][hour] += 1
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=matrix,
-            x=[f"{h:02d}:00" for h in hours],
-            y=days,
-            colorscale='Viridis'
-        ))
-        
-        fig.update_layout(
-            title='Booking Heatmap',
-            xaxis_title='Hour of Day',
-            yaxis_title='Day of Week',
-            template='plotly_white'
-        )
-        
-        return pio.to_html(fig, include_plotlyjs='cdn', div_id="heatmap-chart")
+        return self._analytics_response(business, 'cohorts', request)
     
     @action(detail=True, methods=['get'])
     def available_slots(self, request, slug=None):
@@ -675,74 +248,93 @@ class BusinessViewSet(viewsets.ModelViewSet):
             'total_dates': len(available_dates)
         })
     
+    @action(detail=False, methods=['get'])
+    def batch_availability(self, request):
+        """
+        Get slot grids for several services (across businesses) over a date range
+        """
+        service_ids = [
+            service_id.strip()
+            for value in request.query_params.getlist('services')
+            for service_id in value.split(',')
+            if service_id.strip()
+        ]
+        start_str = request.query_params.get('start_date')
+        end_str = request.query_params.get('end_date', start_str)
+        
+        if not service_ids or not start_str:
+            return Response(
+                {'error': 'services and start_date parameters are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(service_ids) > MAX_BATCH_SERVICES:
+            return Response(
+                {'error': f'At most {MAX_BATCH_SERVICES} services can be requested at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
+            services = list(Service.objects.filter(
+                id__in=service_ids,
+                is_active=True,
+                business__is_active=True
+            ).select_related('business'))
+        except (ValueError, DjangoValidationError):
+            return Response(
+                {'error': 'Invalid service or date'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if end_date < start_date or (end_date - start_date).days >= MAX_BATCH_DAYS:
+            return Response(
+                {'error': f'Date range must cover between 1 and {MAX_BATCH_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # One bulk load of hours and bookings for every requested service
+        availability = get_range_availability(services, start_date, end_date)
+        
+        return Response({
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'services': [
+                {
+                    'service_id': str(service.id),
+                    'service': service.name,
+                    'business': service.business.slug,
+                    'slots': {
+                        day.isoformat(): slots
+                        for day, slots in availability[service.id].items()
+                    }
+                }
+                for service in services
+            ]
+        })
+    
+    @action(detail=False, methods=['get'])
+    def availability_cache_stats(self, request):
+        """
+        Get hit/miss counters of the availability cache (staff only)
+        """
+        return Response(availability_cache_stats())
+    
     # FIX: Removed duplicate stats method - keeping only one
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def stats(self, request, slug=None):
         """Get business statistics"""
         business = self.get_object()
-        period = request.query_params.get('period', 'month')
         
         # Check if user owns this business
-        if business.owner != request.user and not request.user.is_staff:
+        if business.owner_id != request.user.id and not request.user.is_staff:
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Calculate date range
-        now = timezone.now()
-        if period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        elif period == 'quarter':
-            start_date = now - timedelta(days=90)
-        elif period == 'year':
-            start_date = now - timedelta(days=365)
-        else:
-            start_date = now - timedelta(days=30)
-        
-        # Get stats
-        bookings = Booking.objects.filter(business=business, created_at__gte=start_date)
-        total_revenue = bookings.filter(status__in=['confirmed', 'completed'], is_paid=True).aggregate(Sum('total_price'))['total_price__sum'] or 0
-        total_bookings = bookings.count()
-        confirmed_bookings = bookings.filter(status__in=['confirmed', 'completed']).count()
-        customers = Customer.objects.filter(bookings__business=business).distinct().count()
-        reviews = Review.objects.filter(business=business)
-        avg_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
-        
-        # Calculate changes from previous period
-        prev_start = start_date - (now - start_date)
-        prev_bookings = Booking.objects.filter(
-            business=business,
-            created_at__gte=prev_start,
-            created_at__lt=start_date
-        )
-        
-        prev_revenue = prev_bookings.filter(status__in=['confirmed', 'completed'], is_paid=True).aggregate(Sum('total_price'))['total_price__sum'] or 0
-        prev_bookings_count = prev_bookings.count()
-        prev_customers = Customer.objects.filter(
-            bookings__business=business,
-            bookings__created_at__gte=prev_start,
-            bookings__created_at__lt=start_date
-        ).distinct().count()
-        
-        # Calculate percentage changes
-        revenue_change = ((float(total_revenue) - float(prev_revenue)) / max(float(prev_revenue), 1)) * 100 if prev_revenue else 0
-        bookings_change = ((total_bookings - prev_bookings_count) / max(prev_bookings_count, 1)) * 100 if prev_bookings_count else 0
-        customers_change = ((customers - prev_customers) / max(prev_customers, 1)) * 100 if prev_customers else 0
-        
-        return Response({
-            'revenue': float(total_revenue),
-            'bookings': total_bookings,
-            'confirmed_bookings': confirmed_bookings,
-            'customers': customers,
-            'rating': round(avg_rating, 1),
-            'revenueChange': round(revenue_change, 1),
-            'bookingsChange': round(bookings_change, 1),
-            'customersChange': round(customers_change, 1),
-            'ratingChange': 0  # Would need historical rating data
-        })
+        return self._analytics_response(business, 'stats', request)
     
     # FIX: Removed duplicate revenue_data method - keeping the one with better implementation
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
@@ -752,7 +344,7 @@ class BusinessViewSet(viewsets.ModelViewSet):
         period = request.query_params.get('period', 'month')
         
         # Check if user owns this business
-        if business.owner != request.user and not request.user.is_staff:
+        if business.owner_id != request.user.id and not request.user.is_staff:
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
@@ -767,24 +359,27 @@ class BusinessViewSet(viewsets.ModelViewSet):
         else:
             start_date = now - timedelta(days=30)
         
-        # Get daily revenue data
-        revenue_data = []
-        current_date = start_date.date()
-        end_date = now.date()
+        interval = interval_param(request.query_params)
         
-        while current_date <= end_date:
-            daily_revenue = Booking.objects.filter(
+        # Revenue per day (or week/month/quarter) from one grouped query
+        series = time_series(
+            Booking.objects.filter(
                 business=business,
-                booking_date=current_date,
+                booking_date__range=[start_date.date(), now.date()],
                 status__in=['confirmed', 'completed'],
                 is_paid=True
-            ).aggregate(Sum('total_price'))['total_price__sum'] or 0
-            
-            revenue_data.append({
-                'date': current_date.isoformat(),
-                'revenue': float(daily_revenue)
-            })
-            current_date += timedelta(days=1)
+            ),
+            'booking_date', start_date.date(), now.date(), interval,
+            revenue=Sum('total_price', default=0)
+        )
+        
+        revenue_data = [
+            {
+                'date': bucket['date'].isoformat(),
+                'revenue': float(bucket['revenue'])
+            }
+            for bucket in series
+        ]
         
         return Response(revenue_data)
     
@@ -801,12 +396,7 @@ class BusinessViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        services_data = Service.objects.filter(business=business).annotate(
-            booking_count=Count('bookings'),
-            total_revenue=Sum('bookings__total_price', filter=Q(bookings__status__in=['confirmed', 'completed'], bookings__is_paid=True))
-        ).values('name', 'booking_count', 'total_revenue', 'price')
-        
-        return Response(list(services_data))
+        return self._analytics_response(business, 'service_stats', request)
     
     # FIX: Removed duplicate recent_activity method - keeping one implementation
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
@@ -821,42 +411,7 @@ class BusinessViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get recent bookings
-        recent_bookings = Booking.objects.filter(business=business).order_by('-created_at')[:10]
-        activities = []
-        
-        for booking in recent_bookings:
-            activities.append({
-                'type': 'booking',
-                'title': f'New booking for {booking.service.name}',
-                'description': f'Customer: {booking.customer.user.full_name}',
-                'date': booking.created_at.isoformat(),
-                'status': booking.status
-            })
-        
-        # Get recent reviews
-        recent_reviews = Review.objects.filter(
-            business=business
-        ).select_related('customer__user').order_by('-created_at')[:5]
-        
-        for review in recent_reviews:
-            customer_name = f"{review.customer.user.first_name} {review.customer.user.last_name}".strip()
-            if not customer_name:
-                customer_name = review.customer.user.email or "Unknown Customer"
-            
-            activities.append({
-                'id': str(review.id),
-                'type': 'review',
-                'title': f'New {review.rating}-star review',
-                'description': f'{customer_name} left a review',
-                'date': review.created_at.isoformat(),
-                'rating': review.rating
-            })
-        
-        # Sort by date
-        activities.sort(key=lambda x: x['date'], reverse=True)
-        
-        return Response(activities[:15])
+        return self._analytics_response(business, 'recent_activity', request)
     
     @action(detail=True, methods=['post'])
     def update_hours(self, request, slug=None):
@@ -937,7 +492,7 @@ class BusinessViewSet(viewsets.ModelViewSet):
             try:
                 min_rating = float(rating)
                 queryset = queryset.annotate(
-                    avg_rating=Avg('reviews__rating')
+                    avg_rating=AVERAGE_RATING
                 ).filter(avg_rating__gte=min_rating)
             except ValueError:
                 pass
@@ -964,9 +519,11 @@ class BusinessViewSet(viewsets.ModelViewSet):
         # Sorting
         sort_by = request.query_params.get('sort_by', 'relevance')
         if sort_by == 'rating':
-            queryset = queryset.annotate(avg_rating=Avg('reviews__rating')).order_by('-avg_rating')
+            queryset = queryset.annotate(avg_rating=AVERAGE_RATING).order_by(
+                F('avg_rating').desc(nulls_last=True)
+            )
         elif sort_by == 'reviews':
-            queryset = queryset.annotate(review_count=Count('reviews')).order_by('-review_count')
+            queryset = queryset.order_by(F('rating_stats__rating_count').desc(nulls_last=True))
         elif sort_by == 'distance':
             # For now, just order by name since we don't have user location
             queryset = queryset.order_by('name')
@@ -1000,12 +557,11 @@ class BusinessViewSet(viewsets.ModelViewSet):
         Get featured businesses
         """
         queryset = self.get_queryset().annotate(
-            avg_rating=Avg('reviews__rating'),
-            review_count=Count('reviews')
+            avg_rating=AVERAGE_RATING
         ).filter(
             avg_rating__gte=4.0,
-            review_count__gte=5
-        ).order_by('-avg_rating', '-review_count')[:10]
+            rating_stats__rating_count__gte=5
+        ).order_by('-avg_rating', '-rating_stats__rating_count')[:10]
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -1017,76 +573,23 @@ class BusinessViewSet(viewsets.ModelViewSet):
         """
         business = self.get_object()
         
-        if business.owner != request.user and not request.user.is_staff:
+        if business.owner_id != request.user.id and not request.user.is_staff:
             return Response(
                 {'error': 'You do not have permission to view revenue reports'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        period = request.query_params.get('period', 'month')
-        
-        if period == 'week':
-            start_date = timezone.now().date() - timedelta(days=7)
-        elif period == 'month':
-            start_date = timezone.now().date() - timedelta(days=30)
-        elif period == 'quarter':
-            start_date = timezone.now().date() - timedelta(days=90)
-        elif period == 'year':
-            start_date = timezone.now().date() - timedelta(days=365)
-        else:
-            start_date = timezone.now().date() - timedelta(days=30)
-        
-        bookings = Booking.objects.filter(
-            business=business,
-            booking_date__gte=start_date,
-            is_paid=True
-        )
-        
-        report = {
-            'period': period,
-            'start_date': start_date,
-            'end_date': timezone.now().date(),
-            'total_revenue': float(
-                bookings.aggregate(Sum('total_price'))['total_price__sum'] or 0
-            ),
-            'total_bookings': bookings.count(),
-            'average_booking_value': float(
-                bookings.aggregate(Avg('total_price'))['total_price__avg'] or 0
-            ),
-            'revenue_by_service': self._get_service_revenue(business, start_date),
-            'revenue_by_day': self._get_revenue_by_day(bookings),
-            'payment_methods': self._get_payment_method_breakdown(bookings),
-            'top_revenue_customers': self._get_top_customers(business, start_date)[:5]
-        }
-        
-        return Response(report)
-    
-    def _get_revenue_by_day(self, bookings):
-        """Get daily revenue breakdown"""
-        return list(
-            bookings.values('booking_date').annotate(
-                revenue=Sum('total_price')
-            ).order_by('booking_date').values('booking_date', 'revenue')
-        )
-    
-    def _get_payment_method_breakdown(self, bookings):
-        """Get payment method breakdown"""
-        return list(
-            bookings.values('payment_method').annotate(
-                count=Count('id'),
-                total=Sum('total_price')
-            ).order_by('-total')
-        )
+        return self._analytics_response(business, 'revenue_report', request)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my(self, request):
         """
         Get businesses owned by the authenticated user
         """
-        businesses = Business.objects.filter(
+        businesses = BusinessSerializer.eager_load(Business.objects.filter(
             owner=request.user,
             is_active=True
-        ).order_by('-created_at')
+        )).order_by('-created_at')
         
         serializer = self.get_serializer(businesses, many=True)
         return Response(serializer.data)
@@ -1224,18 +727,47 @@ class ServiceViewSet(viewsets.ModelViewSet):
         })
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for Booking model with status management
     """
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status', 'service', 'booking_date']
     ordering_fields = ['booking_date', 'start_time', 'created_at']
     ordering = ['-booking_date', '-start_time']
     
+    # Actions returning booking lists, compact unless ``?view=full``
+    LIST_ACTIONS = ('list', 'upcoming', 'history')
+    eager_actions = LIST_ACTIONS + ('retrieve',)
+    
+    def get_representation(self):
+        """
+        ``compact`` or ``full``, from ``?view=`` (or ``?fields=``, which
+        implies compact) and defaulting to compact for list actions
+        """
+        params = self.request.query_params
+        view = params.get('view')
+        if view is None:
+            return 'compact' if 'fields' in params or self.action in self.LIST_ACTIONS else 'full'
+        if view not in ('compact', 'full'):
+            raise serializers.ValidationError({'view': 'view must be one of: compact, full'})
+        return view
+    
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.get_representation() == 'compact':
+            return BookingListSerializer
+        return super().get_serializer_class()
+    
+    def get_serializer(self, *args, **kwargs):
+        fields = self.request.query_params.get('fields')
+        if fields and self.get_serializer_class() is BookingListSerializer:
+            kwargs['fields'] = [name.strip() for name in fields.split(',') if name.strip()]
+        return super().get_serializer(*args, **kwargs)
+    
     def get_queryset(self):
         """Filter bookings based on user type"""
         user = self.request.user
@@ -1261,10 +793,30 @@ class BookingViewSet(viewsets.ModelViewSet):
         return queryset
     
     def get_permissions(self):
-        if self.action == 'create':
+        if self.action in ['create', 'confirm_hold']:
             return [IsAuthenticated(), CanCreateBooking()]
+        if self.action == 'export':
+            return [IsAuthenticated(), IsBusinessOwner()]
         return super().get_permissions()
     
+    def create(self, request, *args, **kwargs):
+        """
+        Validate and save under the business lock so concurrent requests
+        for the same slot can't both pass validation
+        """
+        with transaction.atomic():
+            try:
+                lock_business(request.data.get('business_id'))
+            except DjangoValidationError:
+                pass  # Invalid UUID - reported by the serializer
+            return super().create(request, *args, **kwargs)
+    
+    def update(self, request, *args, **kwargs):
+        """Re-validate time changes under the business lock"""
+        with transaction.atomic():
+            lock_business(self.get_object().business_id)
+            return super().update(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         """Create booking with customer profile"""
         customer, created = Customer.objects.get_or_create(
@@ -1287,8 +839,12 @@ class BookingViewSet(viewsets.ModelViewSet):
             total_price=total_price
         )
         
+        self._finalize_new_booking(booking, customer)
+    
+    def _finalize_new_booking(self, booking, customer):
+        """Auto-confirm, notify and update customer stats for a new booking"""
         # Auto-confirm if business setting allows
-        if business.auto_confirm_bookings:
+        if booking.business.auto_confirm_bookings:
             booking.status = 'confirmed'
             booking.save()
         
@@ -1300,6 +856,62 @@ class BookingViewSet(viewsets.ModelViewSet):
             total_bookings=F('total_bookings') + 1
         )
     
+    @action(detail=False, methods=['post'])
+    def confirm_hold(self, request):
+        """
+        Turn a slot hold into a booking atomically
+        """
+        hold_id = request.data.get('hold_id')
+        if not hold_id:
+            return Response(
+                {'error': 'hold_id is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        with transaction.atomic():
+            try:
+                hold = SlotHold.objects.select_related('business', 'service').get(
+                    id=hold_id,
+                    user=request.user
+                )
+            except (SlotHold.DoesNotExist, DjangoValidationError):
+                return Response(
+                    {'error': 'Hold not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            lock_business(hold.business_id)
+            
+            # Re-check under the lock: the hold may have been confirmed or reaped meanwhile
+            if not active_holds().filter(id=hold.id).exists():
+                return Response(
+                    {'error': 'Hold has expired'},
+                    status=status.HTTP_410_GONE
+                )
+            
+            customer, created = Customer.objects.get_or_create(
+                user=request.user,
+                defaults={'phone': ''}
+            )
+            
+            booking = Booking.objects.create(
+                business=hold.business,
+                customer=customer,
+                service=hold.service,
+                booking_date=hold.booking_date,
+                start_time=hold.start_time,
+                end_time=hold.end_time,
+                notes=request.data.get('notes', ''),
+                total_price=hold.service.price
+            )
+            hold.delete()
+            invalidate_hold_availability(hold)
+            
+            self._finalize_new_booking(booking, customer)
+        
+        serializer = self.get_serializer(booking)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def chart_data(self, request):
         """
@@ -1375,35 +987,30 @@ class BookingViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        # Filter by date range
-        bookings = queryset.filter(
-            created_at__gte=start_date
-        ).values('booking_date', 'status').annotate(
-            count=Count('id')
-        ).order_by('booking_date')
+        interval = interval_param(request.query_params)
         
-        # Prepare chart data
-        chart_data = []
-        current_date = start_date.date()
-        end_date = now.date()
+        # Bookings per status and bucket from one grouped query
+        series = time_series(
+            queryset.filter(
+                created_at__gte=start_date,
+                booking_date__range=[start_date.date(), now.date()]
+            ),
+            'booking_date', start_date.date(), now.date(), interval,
+            confirmed=Count('id', filter=Q(status='confirmed')),
+            pending=Count('id', filter=Q(status='pending')),
+            cancelled=Count('id', filter=Q(status='cancelled'))
+        )
         
-        while current_date <= end_date:
-            day_bookings = bookings.filter(booking_date=current_date)
-            
-            confirmed = sum(b['count'] for b in day_bookings if b['status'] == 'confirmed')
-            pending = sum(b['count'] for b in day_bookings if b['status'] == 'pending')
-            cancelled = sum(b['count'] for b in day_bookings if b['status'] == 'cancelled')
-            total = confirmed + pending + cancelled
-            
-            chart_data.append({
-                'date': current_date.isoformat(),
-                'confirmed': confirmed,
-                'pending': pending,
-                'cancelled': cancelled,
-                'total': total
-            })
-            
-            current_date += timedelta(days=1)
+        chart_data = [
+            {
+                'date': bucket['date'].isoformat(),
+                'confirmed': bucket['confirmed'],
+                'pending': bucket['pending'],
+                'cancelled': bucket['cancelled'],
+                'total': bucket['confirmed'] + bucket['pending'] + bucket['cancelled']
+            }
+            for bucket in series
+        ]
         
         return Response({
             'period': period,
@@ -1599,9 +1206,72 @@ class BookingViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the owner's bookings as ``?output=csv`` (default) or ``ndjson``,
+        with the same filters and ordering as the booking list
+        """
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export_lines(queryset, output), content_type=EXPORT_FORMATS[output]
+        )
+        filename = f"bookings-{timezone.now().date().isoformat()}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class SlotHoldViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for short-lived slot holds of the authenticated user
+    """
+    queryset = SlotHold.objects.all()
+    serializer_class = SlotHoldSerializer
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+    
+    def get_queryset(self):
+        """Only the user's own holds that have not expired"""
+        return SlotHoldSerializer.eager_load(active_holds().filter(user=self.request.user))
+    
+    def get_permissions(self):
+        if self.action == 'create':
+            return [IsAuthenticated(), CanCreateBooking()]
+        return super().get_permissions()
+    
+    def create(self, request, *args, **kwargs):
+        """Place a hold under the business lock so capacity can't be oversold"""
+        with transaction.atomic():
+            try:
+                lock_business_of_service(request.data.get('service_id'))
+            except DjangoValidationError:
+                pass  # Invalid UUID - reported by the serializer
+            
+            reap_expired_holds()
+            return super().create(request, *args, **kwargs)
+    
+    def perform_create(self, serializer):
+        hold = serializer.save(
+            user=self.request.user,
+            expires_at=timezone.now() + HOLD_TTL
+        )
+        invalidate_hold_availability(hold)
+    
+    def perform_destroy(self, instance):
+        """Release a hold before it expires"""
+        instance.delete()
+        invalidate_hold_availability(instance)
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for Customer model
     """
@@ -1616,19 +1286,20 @@ class CustomerViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter customers based on user type"""
         user = self.request.user
+        queryset = super().get_queryset()
         
         if user.user_type == 'business_owner':
             # Show only customers who have booked with the business
-            return Customer.objects.filter(
+            return queryset.filter(
                 bookings__business__owner=user
             ).distinct()
         elif user.user_type == 'customer':
             # Customers can only see their own profile
-            return Customer.objects.filter(user=user)
+            return queryset.filter(user=user)
         elif user.user_type == 'admin':
-            return Customer.objects.all()
+            return queryset
         
-        return Customer.objects.none()
+        return queryset.none()
     
     @action(detail=False, methods=['get'])
     def me(self, request):
@@ -1637,6 +1308,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
             user=request.user,
             defaults={'phone': ''}
         )
+        customer = CustomerSerializer.eager_load(Customer.objects.filter(pk=customer.pk)).get()
         serializer = self.get_serializer(customer)
         return Response(serializer.data)
     
@@ -1724,22 +1396,17 @@ class CustomerViewSet(viewsets.ModelViewSet):
         new_customers = customers_in_period.count()
         repeat_customers = queryset.filter(total_bookings__gt=1).count()
         
-        # Customer acquisition over time
-        daily_customers = []
-        current_date = start_date.date()
-        end_date = now.date()
+        interval = interval_param(request.query_params)
         
-        while current_date <= end_date:
-            daily_count = queryset.filter(
-                created_at__date=current_date
-            ).count()
-            
-            daily_customers.append({
-                'date': current_date.isoformat(),
-                'count': daily_count
-            })
-            
-            current_date += timedelta(days=1)
+        # Customer acquisition over time from one grouped query
+        daily_customers = [
+            {'date': bucket['date'].isoformat(), 'count': bucket['count']}
+            for bucket in time_series(
+                queryset.filter(created_at__date__gte=start_date.date()),
+                'created_at', start_date.date(), now.date(), interval,
+                count=Count('id', distinct=True)
+            )
+        ]
         
         # Top customers by spending
         top_customers = queryset.order_by('-total_spent')[:10].values(
@@ -1792,7 +1459,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        bookings = customer.bookings.all().order_by('-created_at')
+        bookings = BookingSerializer.eager_load(customer.bookings.all()).order_by('-created_at')
         
         # Apply filters
         status_filter = request.query_params.get('status')
@@ -1806,11 +1473,9 @@ class CustomerViewSet(viewsets.ModelViewSet):
         # Pagination
         page = self.paginate_queryset(bookings)
         if page is not None:
-            from .serializers import BookingSerializer
             serializer = BookingSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        from .serializers import BookingSerializer
         serializer = BookingSerializer(bookings, many=True)
         return Response(serializer.data)
     
@@ -1851,13 +1516,14 @@ class CustomerViewSet(viewsets.ModelViewSet):
         })
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for Review model
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['business', 'rating', 'is_verified']
     ordering_fields = ['created_at', 'rating']
@@ -1955,20 +1621,21 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return Response({'status': 'Review marked as featured'})
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for Notification model
     """
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['type', 'is_read']
     ordering = ['-created_at']
     
     def get_queryset(self):
         """Get notifications for authenticated user only"""
-        return Notification.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
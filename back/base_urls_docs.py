@@ -14,9 +14,22 @@ DELETE  /api/businesses/{slug}/               - Delete business
 Business Custom Actions:
 GET     /api/businesses/{slug}/dashboard/     - Get business dashboard data
 GET     /api/businesses/{slug}/analytics-chart/ - Get analytics charts
-        Query params: type (bookings/revenue/services/customers/heatmap), period (days)
+        Query params: type (bookings/revenue/services/customers/heatmap), period (days),
+                      output (html/spec, default html)
+        output=html: {"chart": "<div>...</div>"} rendered on the server with Plotly
+        output=spec: {"type", "period", "spec": {"data": [traces], "layout": {...}}},
+                     Plotly figure JSON for the frontend to render (no server-side Plotly)
+GET     /api/businesses/{slug}/cohorts/       - Monthly customer cohorts and their retention
+        Query params: months (1-36, default 12)
+        Returns {"cohorts": [{"cohort": "YYYY-MM", "customers", "active", "retention"}],
+                 "retention_curve": [% still booking n months after the first]}
 GET     /api/businesses/{slug}/available-slots/ - Get available booking slots
         Query params: service (UUID), date (YYYY-MM-DD)
+GET     /api/businesses/{slug}/available-dates/ - Get dates with free slots
+        Query params: service (UUID), days_ahead (max 365)
+GET     /api/businesses/availability/     - Get slot grids for many services in one call
+        Query params: services (comma separated UUIDs, max 50), start_date, end_date (max 31 days)
+GET     /api/businesses/availability-cache-stats/ - Availability cache hit/miss counters (staff only)
 POST    /api/businesses/{slug}/update-hours/  - Update business hours
 GET     /api/businesses/{slug}/revenue-report/ - Get revenue report
         Query params: period (week/month/quarter/year)
@@ -48,6 +61,17 @@ POST    /api/bookings/{id}/complete/         - Mark booking as completed
 POST    /api/bookings/{id}/mark-no-show/     - Mark booking as no-show
 GET     /api/bookings/upcoming/              - Get upcoming bookings
 GET     /api/bookings/history/               - Get booking history
+GET     /api/bookings/export/                - Stream the owner's bookings as a file (business owners)
+        Query params: output (csv/ndjson, default csv), plus the booking list filters
+POST    /api/bookings/confirm-hold/          - Turn a slot hold into a booking
+        Body: hold_id, notes
+
+Slot Hold Endpoints:
+====================
+GET     /api/holds/                           - List the user's active holds
+POST    /api/holds/                           - Hold a slot for a few minutes
+        Body: service_id, booking_date, start_time
+DELETE  /api/holds/{id}/                      - Release a hold
 
 Customer Endpoints:
 ===================
@@ -120,6 +144,7 @@ Public Endpoints (No authentication required):
 - GET /api/businesses/
 - GET /api/businesses/{slug}/
 - GET /api/businesses/{slug}/available-slots/
+- GET /api/businesses/availability/
 - GET /api/services/
 - GET /api/services/{id}/
 - GET /api/reviews/
@@ -50,6 +50,11 @@ export const bookingAPI = {
     return apiClient.get('/bookings/history/');
   },
 
+  // CSV or NDJSON text of the owner's bookings; takes the list filters too
+  async export(output = 'csv', params = {}) {
+    return apiClient.get('/bookings/export/', { ...params, output });
+  },
+
   async getByBusiness(businessId, params = {}) {
     return apiClient.get('/bookings/', { ...params, business: businessId });
   },
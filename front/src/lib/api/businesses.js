@@ -47,6 +47,11 @@ export const businessAPI = {
     return this.analyticsChart(slug, type, period);
   },
 
+  // Plotly figure JSON ({ data, layout }) to render client-side
+  async analyticsChartSpec(slug, type = 'bookings', period = 30) {
+    return apiClient.get(`/businesses/${slug}/analytics-chart/`, { type, period, output: 'spec' });
+  },
+
   async getAvailableSlots(slug, serviceId, date) {
     return apiClient.get(`/businesses/${slug}/available-slots/`, { 
       service: serviceId, 
@@ -61,6 +66,14 @@ export const businessAPI = {
     });
   },
 
+  async getBatchAvailability(serviceIds, startDate, endDate = startDate) {
+    return apiClient.get('/businesses/availability/', {
+      services: serviceIds.join(','),
+      start_date: startDate,
+      end_date: endDate
+    });
+  },
+
   async updateHours(slug, hoursData) {
     return apiClient.post(`/businesses/${slug}/update-hours/`, { hours: hoursData });
   },